@@ -0,0 +1,116 @@
+"""
+Parallel acquisition of sensor data
+
+Runs the poll() method of several SysInfoBase instances concurrently in a
+bounded thread pool. Each source has its own deadline. A source that doesn't
+finish in time is reported as stale and is not restarted until its pending
+poll() has completed, so a hanging tool or bus cannot pile up threads.
+
+Overruns: poll() updates the source in place, so a run that missed its
+deadline still stores its values when it finally completes. Since runs of one
+source never overlap, this is always the newest data of that source and can't
+overwrite the result of a later run. The late values are read by the next
+cycle, which also starts a new run.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+
+logger = logging.getLogger('nitroc-ui')
+
+
+class AcquisitionSource():
+    def __init__(self, name, source, deadline):
+        super().__init__()
+
+        self.name = name
+        self.source = source
+        self.deadline = deadline
+
+        self.future: Future | None = None
+        self.stale = True
+        self.overruns = 0
+        self.skipped = 0
+        self.errors = 0
+        self.duration = 0.0
+        self.last_update = None
+
+
+class AcquisitionEngine():
+    # Max. number of sources polled at the same time
+    MAX_WORKERS = 4
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        super().__init__()
+
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='acquisition')
+        self._sources = dict()
+
+    def add(self, name: str, source, deadline: float) -> None:
+        """
+        Register a source
+
+        :param name: Name of the source, used in stale reports.
+        :param source: Object with a poll() method.
+        :param deadline: Time in seconds poll() may take.
+        """
+        assert name not in self._sources
+        assert deadline > 0.0
+        self._sources[name] = AcquisitionSource(name, source, deadline)
+
+    def poll(self) -> list[str]:
+        """
+        Poll all sources concurrently and wait until all are done or their
+        deadline has passed.
+
+        :return: Names of sources that didn't deliver fresh data.
+        """
+        start = time.monotonic()
+
+        started = list()
+        for src in self._sources.values():
+            if src.future is not None and not src.future.done():
+                # Still busy with previous poll
+                src.skipped += 1
+                src.stale = True
+                logger.debug(f'{src.name} still busy, skipping')
+            else:
+                src.future = self._executor.submit(self._run, src)
+                started.append(src)
+
+        for src in started:
+            remaining = start + src.deadline - time.monotonic()
+            assert src.future
+            done, _ = wait([src.future], timeout=max(0.0, remaining))
+            if done:
+                src.stale = not src.future.result()
+            else:
+                logger.info(f'{src.name} missed deadline of {src.deadline} s')
+                src.overruns += 1
+                src.stale = True
+
+        return [src.name for src in self._sources.values() if src.stale]
+
+    def stats(self) -> dict:
+        return {src.name: {'overruns': src.overruns,
+                           'skipped': src.skipped,
+                           'errors': src.errors,
+                           'duration': round(src.duration, 3)}
+                for src in self._sources.values()}
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _run(src: AcquisitionSource) -> bool:
+        start = time.monotonic()
+        try:
+            src.source.poll()
+            src.last_update = time.monotonic()
+            return True
+        except Exception as e:
+            src.errors += 1
+            logger.warning(f'polling {src.name} failed: {e}')
+            return False
+        finally:
+            src.duration = time.monotonic() - start
@@ -0,0 +1,104 @@
+"""
+History of cumulative counters, e.g. interface byte counters
+
+Samples are stored in fixed size ring buffers (one for the timestamps,
+one array('Q') per counter), so keeping an hour at 1 s resolution needs
+no per-sample objects. Rates and percentiles are computed on demand.
+"""
+import math
+
+from .ring_buffer import RingBuffer
+
+
+class CounterHistory():
+    def __init__(self, names: list[str], size: int = 3600):
+        """
+        :param names: Names of counters.
+        :param size: Number of samples to keep.
+        """
+        super().__init__()
+
+        self.names = names
+        self.timestamps = RingBuffer(size)
+        self.counters = {name: RingBuffer(size, 'Q') for name in names}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def add(self, timestamp: float, values: tuple[int, ...]) -> None:
+        """
+        Add sample, values in order of names
+        """
+        if len(self.timestamps) > 0:
+            if any(v < c[-1] for v, c in zip(values, self.counters.values())):
+                # Counters reset, e.g. interface re-created
+                self.clear()
+
+        self.timestamps.append(timestamp)
+        for value, buf in zip(values, self.counters.values()):
+            buf.append(value)
+
+    def clear(self) -> None:
+        self.timestamps.clear()
+        for buf in self.counters.values():
+            buf.clear()
+
+    def rates(self, window: float) -> dict[str, float] | None:
+        """
+        Get average rate per second of each counter
+
+        :param window: Time in seconds to look back. If less history is
+                       available, the available history is used.
+        :return: Dictionary counter name -> rate, None if less than two samples.
+        """
+        start = self._start(window)
+        if start is None:
+            return None
+
+        dt = self.timestamps[-1] - self.timestamps[start]
+        if dt <= 0.0:
+            return None
+        return {name: (buf[-1] - buf[start]) / dt for name, buf in self.counters.items()}
+
+    def percentiles(self, name: str, window: float, pcts: tuple[float, ...] = (50.0, 95.0)) -> list[float] | None:
+        """
+        Get percentiles of the rate between consecutive samples
+
+        :param name: Counter name.
+        :param window: Time in seconds to look back.
+        :param pcts: Percentiles to compute, 0..100.
+        :return: Rate per second for each percentile, None if less than two samples.
+        """
+        start = self._start(window)
+        if start is None:
+            return None
+
+        n = len(self.timestamps) - start
+        times = self.timestamps.last(n)
+        values = self.counters[name].last(n)
+        rates = sorted((values[i + 1] - values[i]) / (times[i + 1] - times[i])
+                       for i in range(n - 1) if times[i + 1] > times[i])
+        if not rates:
+            return None
+
+        # Nearest rank method
+        return [rates[max(0, math.ceil(p / 100.0 * len(rates)) - 1)] for p in pcts]
+
+    def _start(self, window: float) -> int | None:
+        """
+        Index of oldest sample within window
+        """
+        count = len(self.timestamps)
+        if count < 2:
+            return None
+
+        # Timestamps are increasing, binary search for first one within window
+        limit = self.timestamps[-1] - window
+        lo, hi = 0, count - 2
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamps[mid] >= limit:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
@@ -1,32 +1,71 @@
+import logging
 import re
 import subprocess
+import time
 from os import path
 
+from .hwmon import Hwmon
 from .sysinfo_base import SysInfoBase
 
+logger = logging.getLogger('nitroc-ui')
+
 
 class CrosEcSensors(SysInfoBase):
     """
-    System Info implementation using 'ectool' tool to retrieve values
+    System Info implementation for embedded controller (EC) values
+
+    Uses the cros_ec hwmon sysfs nodes if the kernel provides the voltages.
+    Otherwise uses 'ectool' tool to retrieve values. As voltages change slowly
+    the tool is only run every refresh_period seconds.
     """
     BIN = '/usr/bin/ectool'
 
-    @staticmethod
-    def sensors_present() -> bool:
-        return path.exists(CrosEcSensors.BIN)
+    # Default time in seconds between 'ectool' runs
+    REFRESH_PERIOD = 30.0
+
+    # EC sensor names
+    SENSOR_INPUT = 'psu input voltage'
+    SENSOR_RTC = 'backup voltage'
 
-    def __init__(self):
+    def __init__(self, refresh_period=REFRESH_PERIOD):
         super().__init__()
 
+        self.refresh_period = refresh_period
+        self.last_refresh = None
+        self.version = None
+
         self.volt_in_mv = 0.0
         self.volt_rtc_mv = 0.0
-    
+
+        # Use hwmon if kernel exports EC voltages (values are in mV)
+        hwmon = Hwmon()
+        self.input_in = hwmon.open('cros_ec*', CrosEcSensors.SENSOR_INPUT, 1.0)
+        self.input_rtc = hwmon.open('cros_ec*', CrosEcSensors.SENSOR_RTC, 1.0)
+        if self.input_in or self.input_rtc:
+            logger.info('using hwmon for EC voltages')
+
+    def sensors_present(self) -> bool:
+        """
+        Check if voltages can be read, either from hwmon or with 'ectool'
+        """
+        return bool(self.input_in or self.input_rtc) or path.exists(CrosEcSensors.BIN)
+
     def poll(self) -> None:
+        if self.input_in or self.input_rtc:
+            self.volt_in_mv = self._read_input(self.input_in)
+            self.volt_rtc_mv = self._read_input(self.input_rtc)
+            return
+
+        now = time.monotonic()
+        if self.last_refresh is not None and now - self.last_refresh < self.refresh_period:
+            return
+
+        self.last_refresh = now
         try:
             cp = subprocess.run([CrosEcSensors.BIN, "sensor", "all"], stdout=subprocess.PIPE)
             res = cp.stdout.decode().strip()
-            self.volt_in_mv = self._extract_voltage(res, 'psu input voltage')
-            self.volt_rtc_mv = self._extract_voltage(res, 'backup voltage')
+            self.volt_in_mv = self._extract_voltage(res, CrosEcSensors.SENSOR_INPUT)
+            self.volt_rtc_mv = self._extract_voltage(res, CrosEcSensors.SENSOR_RTC)
         except FileNotFoundError:
             self.volt_in_mv = 0.0
             self.volt_rtc_mv = 0.0
@@ -38,6 +77,12 @@ class CrosEcSensors(SysInfoBase):
         return self.volt_rtc_mv / 1000.0
 
     def bootloader_version(self) -> str:
+        # Doesn't change at runtime, query only once
+        if self.version is None:
+            self.version = self._bootloader_version()
+        return self.version
+
+    def _bootloader_version(self) -> str:
         version = "unknown"
         try:
             cp = subprocess.run([CrosEcSensors.BIN, "version"], stdout=subprocess.PIPE)
@@ -50,6 +95,12 @@ class CrosEcSensors(SysInfoBase):
             pass
         return version
 
+    @staticmethod
+    def _read_input(inp) -> float:
+        if inp and (value := inp.read()) is not None:
+            return value
+        return 0.0
+
     def _extract_voltage(self, res, sensor) -> float:
         pattern = rf"Name: {re.escape(sensor)}\n\s*Value: ([-+]?\d+.\d+)"
         match = re.search(pattern, res, re.MULTILINE)
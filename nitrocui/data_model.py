@@ -10,24 +10,74 @@ file /etc/nitrocui.conf
 [OBD2]
 Port = CAN port to use, e.g. can0
 Speed = Bitrate to use. Either 250000 or 500000
+
+The polling period of each data source can be changed in the same file.
+Values are in seconds. The optional jitter adds a random delay to each run.
+
+[Schedule]
+Sysinfo = 1.0
+Network = 4.0
+Modem = 4.0
+Disc = 120.0
+Traffic = 20.0
+Stats = 10.0
+ModemJitter = 0.5
+
+Stats publishes job, acquisition and sensor statistics as 'sys-stats'.
+If python3-gi is installed, modem changes are received as D-Bus signals and
+the Modem period only sets the full consistency check (default 30.0).
+
+Input and RTC voltage change slowly. If they have to be queried with 'ectool'
+the tool is only run every RefreshPeriod seconds.
+
+[EC]
+RefreshPeriod = 30.0
+
+For power measurements the power sensors can be sampled at a higher rate in
+a dedicated thread. Min/max/mean and energy of each Window (in seconds) are
+published as 'sys-power' and uploaded to Thingsboard. SampleRate is in Hz,
+0 disables the sampler.
+
+[Power]
+SampleRate = 20
+Window = 10.0
+
+All modems known to ModemManager are published as 'modem/<imei>'. The first
+modem whose IMEI matches the IMEI regex is the primary modem, it is also
+published as 'modem' and used for the WWAN interface.
+
+While the WWAN bearer is up, the link latency is probed with ICMP echo
+requests to each of the comma separated PingTargets every PingPeriod seconds.
+RTT, jitter and loss statistics are published as 'link'.
+
+[WWAN]
+IMEI = .*
+Interface = wwan0
+PingTargets = 46.231.204.136, 1.1.1.1
+PingPeriod = 5.0
 """
 
 import configparser
 import logging
 import platform
 import threading
-import time
 from typing import TypeVar, cast
 
+from .acquisition import AcquisitionEngine
 from .led import LED_RGB
-from .mm import MM
+from .modem_monitor import ModemMonitor
 from .sysinfo_thermal import SysInfoThermal
 from .sysinfo_tc import SysInfoTC
 from .sysinfo_sensors import SysInfoSensors
 from .sysinfo_power import SysInfoPower
 from .crosec_sensors import CrosEcSensors
 from .vnstat import VnStat
+from .netlink import LinkMonitor
 from .network_utils import network_check
+from .power_sampler import PowerSampler
+from .proc_stats import ProcStats
+from .scheduler import Scheduler
+from .snapshot_store import SnapshotStore, QueueSubscription, LoopSubscription, Subscription
 
 
 CONF_FILE = '/etc/nitrocui.conf'
@@ -39,9 +89,10 @@ logger = logging.getLogger('nitroc-ui')
 T = TypeVar("T")
 
 class ModelData():
-    def __init__(self, data):
+    def __init__(self, data, generation=None):
         super().__init__()
         self._data = data
+        self.generation = generation
 
     def __contains__(self, key):
         return key in self._data  # Enables `key in obj`
@@ -77,6 +128,16 @@ class ModelData():
         except KeyError:
             return False
 
+    def section(self, key) -> ('ModelData | None'):
+        """
+        Get a sub-section of this data as ModelData
+
+        :param key: The key of the sub-section.
+        :return: The sub-section or None if not present.
+        """
+        if key in self._data:
+            return ModelData(self._data[key], self.generation)
+
     def _navigate_dict(self, *keys) -> dict:
         """
         Navigate through a nested dictionary using keys.
@@ -115,8 +176,8 @@ class Model(object):
 
         self.worker = ModelWorker(self)
         self.lock = threading.Lock()
-        self.data = dict()
-        self.data['watermark'] = dict()
+        self.store = SnapshotStore()
+        self.store.publish('watermark', dict())
 
         self.led_color = "green"
         self.system_led = LED_RGB()
@@ -141,25 +202,38 @@ class Model(object):
 
         self.worker.setup()
 
+    @property
+    def generation(self) -> int:
+        return self.store.generation
+
     def get_all(self) -> ModelData:
-        with self.lock:
-            return ModelData(self.data)
+        """
+        Get a consistent, read-only snapshot of all sections
+
+        Does not lock nor copy. The returned data never changes, later
+        publishes create a new snapshot.
+        """
+        snapshot = self.store.snapshot()
+        return ModelData(snapshot.sections, snapshot.generation)
 
     def get_section(self, origin) -> (ModelData | None):
-        with self.lock:
-            if origin in self.data:
-                return ModelData(self.data[origin])
+        snapshot = self.store.snapshot()
+        if origin in snapshot.sections:
+            return ModelData(snapshot.sections[origin], snapshot.generation)
 
     def publish(self, origin, value):
         """
         Report event (with data) to data model
 
+        The value is stored as frozen copy, the caller is free to modify
+        or reuse it afterwards.
+
         Safe to be called from any thread
         """
         # logger.debug(f'get data from {origin}')
         # logger.debug(f'values {value}')
         with self.lock:
-            self.data[origin] = value
+            self.store.publish(origin, value)
 
             if origin == 'things':
                 if value['state'] == 'sending':
@@ -172,20 +246,59 @@ class Model(object):
                 if 'bearer-uptime' in value:
                     self._watermark('bearer-uptime', value['bearer-uptime'])
 
+    def update(self, origin, changes: dict, removed=()):
+        """
+        Report changed values of a section, other values are kept
+
+        Safe to be called from any thread
+        """
+        with self.lock:
+            self.store.update(origin, changes, removed)
+
+            if origin == 'modem':
+                if 'bearer-uptime' in changes:
+                    self._watermark('bearer-uptime', changes['bearer-uptime'])
+
     def remove(self, origin):
         with self.lock:
-            self.data.pop(origin, None)
+            self.store.remove(origin)
+
+    def subscribe(self, origin, keys=None, events=None) -> QueueSubscription:
+        """
+        Get notified about changes of a section
+
+        :param origin: The section to watch.
+        :param keys: Optional list of keys. If given, only changes of these keys are reported.
+        :param events: Optional queue to deliver events to. Allows to wait for multiple sections.
+        :return: The subscription. Use its wait() method to get the events.
+        """
+        return cast(QueueSubscription, self.store.subscribe(QueueSubscription(origin, keys, events)))
+
+    def subscribe_loop(self, origin, loop, callback, keys=None) -> LoopSubscription:
+        """
+        Get notified about changes of a section inside an event loop
+
+        :param origin: The section to watch.
+        :param loop: The event loop (i.e. Tornado IOLoop) to run callback in.
+        :param callback: Called with the ChangeEvent as argument.
+        :param keys: Optional list of keys. If given, only changes of these keys are reported.
+        :return: The subscription.
+        """
+        return cast(LoopSubscription, self.store.subscribe(LoopSubscription(origin, loop, callback, keys)))
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.store.unsubscribe(subscription)
 
     def _watermark(self, topic, value):
-        if topic not in self.data['watermark']:
+        watermark = self.store.section('watermark')
+        if topic not in watermark:
             logger.info(f'creating watermark topic {topic}')
-            self.data['watermark'][topic] = None
 
-        curr = self.data['watermark'][topic]
+        curr = watermark.get(topic)
         # logger.debug(f'checking watermark {topic}, current = {curr}, new = {value}')
 
         if curr is None or value > curr:
-            self.data['watermark'][topic] = value
+            self.store.publish('watermark', {**watermark, topic: value})
             logger.debug(f'new watermark for {topic} = {value}')
 
     def indicator(self, color: str) -> None:
@@ -194,56 +307,155 @@ class Model(object):
 
 
 class ModelWorker(threading.Thread):
+    # Time in seconds each sensor subsystem may take to acquire its data
+    POLL_DEADLINES = {
+        'sensors': 0.8,
+        'ec': 0.8,
+        'thermal': 0.2,
+        'power': 0.5,
+        'tc': 0.8,
+        'proc': 0.2,
+    }
+
+    # Default period and jitter in seconds per job, see [Schedule] in config file
+    SCHEDULE = {
+        'sysinfo': (1.0, 0.0),
+        'network': (4.0, 0.0),
+        'modem': (4.0, 0.0),
+        'disc': (120.0, 0.0),
+        'traffic': (20.0, 0.0),
+        'stats': (10.0, 0.0),
+    }
+
+    # Default modem period if property changes are signaled
+    MODEM_CHECK_SCHEDULE = (30.0, 0.0)
+
     def __init__(self, model):
         super().__init__()
 
         self.model = model
-        self.modem_setup_done = False
+        self.scheduler = Scheduler()
 
     def setup(self):
         self.lock = threading.Lock()
         self.daemon = True
         self.name = 'model-worker'
 
-        # Check presence of required tools
-        if not SysInfoSensors.sensors_present():
-            logger.warn('System sensors not present, is the "sensors" tool available?')
-        if not CrosEcSensors.sensors_present():
-            logger.warn('EC sensors not present, is the "ectool" available?')
-
         self.si = SysInfoSensors()
-        self.crosi = CrosEcSensors()
+        self.crosi = CrosEcSensors(self._ec_refresh_config())
+        if not self.crosi.sensors_present():
+            logger.warning('EC sensors not present, neither hwmon nor "ectool" available')
         self.sit = SysInfoThermal()
         self.sip = SysInfoPower()
         self.tc = SysInfoTC()
+        self.proc = ProcStats()
+
+        rate, window = self._power_config()
+        if rate > 0.0:
+            self.power_sampler = PowerSampler(self.model, self.sip, rate, window)
+            self.power_sampler.start()
+
+        sources = {
+            'sensors': self.si,
+            'ec': self.crosi,
+            'thermal': self.sit,
+            'power': self.sip,
+            'tc': self.tc,
+            'proc': self.proc,
+        }
+        self.acquisition = AcquisitionEngine(max_workers=len(sources))
+        for name, source in sources.items():
+            self.acquisition.add(name, source, self.POLL_DEADLINES[name])
 
         self._traffic_mon_setup()
 
+        # Interface counters and link state, falls back to polling /proc/net/dev
+        sections = {
+            self.model.wwan_interface: 'net-wwan0',
+            self.model.wlan_interface: 'net-wlan0',
+        }
+        try:
+            self.link_monitor = LinkMonitor(self.model, sections)
+            self.link_monitor.start()
+        except OSError as e:
+            logger.warning('netlink not available, polling interface counters')
+            logger.info(e)
+            self.link_monitor = None
+
+        # Modem changes are signaled if possible, polling is a consistency check then
+        self.modem_monitor = ModemMonitor(self.model)
+        self.schedule = dict(self.SCHEDULE)
+        if self.modem_monitor.signals:
+            self.schedule['modem'] = self.MODEM_CHECK_SCHEDULE
+
+        jobs = {
+            'sysinfo': self._sysinfo,
+            'network': self._network,
+            'modem': self.modem_monitor.poll,
+            'disc': self._disc,
+            'traffic': self._traffic,
+            'stats': self._stats,
+        }
+        for name, fn in jobs.items():
+            period, jitter = self._schedule_config(name)
+            logger.info(f'scheduling {name} every {period} s')
+            self.scheduler.add(name, fn, period, jitter=jitter)
+
         self.start()
 
     def run(self):
-        cnt = 0
-        while True:
-            self._sysinfo()
+        # Each job runs in its own thread, so slow sources don't delay the others
+        self.scheduler.run()
+
+    def _schedule_config(self, name) -> tuple[float, float]:
+        period, jitter = self.schedule[name]
+        config = self.model.config
+        key = name.capitalize()
+        try:
+            period = config.getfloat('Schedule', key, fallback=period)
+            jitter = config.getfloat('Schedule', f'{key}Jitter', fallback=jitter)
+        except ValueError as e:
+            logger.warning(f'invalid schedule for {name}, using defaults')
+            logger.info(e)
+            period, jitter = self.schedule[name]
 
-            if cnt == 0 or cnt % 4 == 2:
-                self._network()
+        if period <= 0.0 or jitter < 0.0:
+            logger.warning(f'invalid schedule for {name}, using defaults')
+            period, jitter = self.schedule[name]
 
-            if cnt == 0 or cnt % 4 == 2:
-                self._modem()
+        return period, jitter
 
-            if cnt == 0 or cnt % 120 == 15:
-                self._disc()
+    def _ec_refresh_config(self) -> float:
+        try:
+            period = self.model.config.getfloat('EC', 'RefreshPeriod', fallback=CrosEcSensors.REFRESH_PERIOD)
+        except ValueError as e:
+            logger.warning('invalid EC refresh period, using default')
+            logger.info(e)
+            period = CrosEcSensors.REFRESH_PERIOD
+        return period
 
-            # if self.model.obd2_port:
-            #     # if cnt == 0 or cnt % 2 == 1:
-            #     self._obd2_poll()
+    def _power_config(self) -> tuple[float, float]:
+        try:
+            rate = self.model.config.getfloat('Power', 'SampleRate', fallback=0.0)
+            window = self.model.config.getfloat('Power', 'Window', fallback=10.0)
+        except ValueError as e:
+            logger.warning('invalid power sampler config, disabling sampler')
+            logger.info(e)
+            return 0.0, 0.0
 
-            if cnt == 0 or cnt % 20 == 12:
-                self._traffic()
+        if rate < 0.0 or window <= 0.0:
+            logger.warning('invalid power sampler config, disabling sampler')
+            return 0.0, 0.0
 
-            cnt += 1
-            time.sleep(1.0)
+        return rate, window
+
+    def _stats(self):
+        stats = dict()
+        stats['jobs'] = self.scheduler.stats()
+        stats['acquisition'] = self.acquisition.stats()
+        stats['tc'] = self.tc.stats()
+        stats['power'] = self.sip.stats()
+        self.model.publish('sys-stats', stats)
 
     def _sysinfo(self):
         si = self.si
@@ -251,13 +463,12 @@ class ModelWorker(threading.Thread):
         sit = self.sit
         sip = self.sip
         tc = self.tc
+        proc = self.proc
 
-        # Give each sensor subsystem a chance to efficiently get all required data at once
-        si.poll()
-        crosi.poll()
-        sit.poll()
-        sip.poll()
-        tc.poll()
+        # Give each sensor subsystem a chance to efficiently get all required data at once.
+        # Subsystems are polled in parallel, slow ones keep their previous values and are
+        # reported as stale.
+        stale = self.acquisition.poll()
 
         ver = dict()
         ver['serial'] = si.serial()
@@ -272,12 +483,14 @@ class ModelWorker(threading.Thread):
 
         dt = dict()
         dt['date'] = si.date()
-        dt['uptime'] = si.uptime()
+        dt['uptime'] = proc.uptime()
         self.model.publish('sys-datetime', dt)
 
         info = dict()
-        info['mem'] = si.meminfo()
-        info['load'] = si.load()
+        info['mem'] = proc.meminfo()
+        info['mem_available'] = proc.mem_available()
+        info['load'] = proc.load()
+        info['cpu_util'] = proc.cpu_util()
         info['cpu1_freq'] = si.cpufreq(0)
         info['cpu2_freq'] = si.cpufreq(1)
         info['cpu3_freq'] = si.cpufreq(2)
@@ -325,6 +538,8 @@ class ModelWorker(threading.Thread):
         info['v_in'] = crosi.input_voltage()
         info['v_rtc'] = crosi.rtc_voltage()
 
+        info['stale'] = stale
+
         self.model.publish('sys-misc', info)
 
     def _disc(self):
@@ -332,101 +547,25 @@ class ModelWorker(threading.Thread):
 
         disc = dict()
         disc['wear'] = si.emmc_wear()
+        disc['emmc'] = si.emmc_info()
         disc['part_sysroot'] = si.part_size('/')
         # disc['part_data'] = si.part_size('/data')
         self.model.publish('sys-disc', disc)
 
     def _network(self):
-        si = self.si
-
         info_net = dict()
         conn_state = network_check()
         info_net['inet-conn'] = conn_state
         self.model.publish('network', info_net)
 
-        info_wwan = dict()
-        info_wwan['bytes'] = si.ifinfo(self.model.wwan_interface)
-        self.model.publish('net-wwan0', info_wwan)
-
-        info_wlan = dict()
-        info_wlan['bytes'] = si.ifinfo(self.model.wlan_interface)
-        self.model.publish('net-wlan0', info_wlan)
-
-    def _modem_setup(self, m):
-        logger.info("enabling signal query")
-        if m:
-            self.modem_setup_done = True
-        else:
-            logger.info("modem not yet ready")
-
-    def _modem(self):
-        info = dict()
-        m = MM.modem(self.model.wwan_imei)
-        if m:
-            if not self.modem_setup_done:
-                self._modem_setup(m)
-
-            info['modem-id'] = str(m.id)
-
-            info['vendor'] = m.vendor()
-            info['model'] = m.model()
-            info['revision'] = m.revision()
-            info['imei'] = m.imei()
-
-            state = m.state()
-            access_tech = m.access_tech()
-            access_tech2 = m.access_tech2()
-
-            info['state'] = state
-            info['access-tech'] = access_tech
-            if access_tech2:    # Optional 2nd access tech, i.e. lte and 5gnr
-                info['access-tech2'] = access_tech2
-
-            loc_info = m.location()
-            if loc_info is not None and loc_info['mcc']:
-                info['location'] = loc_info
-
-            sq = m.signal_quality()
-            info['signal-quality'] = sq
-
-            # FN990 reports LTE and 5G as 2nd technology
-            if access_tech == '5gnr' or access_tech2 == '5gnr':
-                sig = m.signal_5g()
-                if sig is not None:
-                    # Only add if signal is available
-                    info['signal-5g'] = sig
-
-            if access_tech == 'lte':
-                sig = m.signal_lte()
-                info['signal-lte'] = sig
-
-            if access_tech == 'umts':
-                sig = m.signal_umts()
-                info['signal-umts'] = sig
-
-            b = m.bearer()
-            if b:
-                info['bearer-id'] = str(b.id)
-                ut = b.uptime()
-                if ut:
-                    info['bearer-uptime'] = ut
-                ip = b.ip()
-                if ip:
-                    info['bearer-ip'] = ip
-
-            s = m.sim()
-            if s:
-                info['sim-id'] = str(s.id)
-
-                imsi = s.imsi()
-                info['sim-imsi'] = imsi
-                iccid = s.iccid()
-                info['sim-iccid'] = iccid
-        else:
-            self.modem_setup_done = False
+        if self.link_monitor is None:
+            info_wwan = dict()
+            info_wwan['bytes'] = self.proc.net_bytes(self.model.wwan_interface)
+            self.model.publish('net-wwan0', info_wwan)
 
-        self.model.publish('modem', info)
-        # print(f'*** {info}')
+            info_wlan = dict()
+            info_wlan['bytes'] = self.proc.net_bytes(self.model.wlan_interface)
+            self.model.publish('net-wlan0', info_wlan)
 
     def _traffic_mon_setup(self):
         logger.warning('setting up traffic monitoring')
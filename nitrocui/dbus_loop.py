@@ -0,0 +1,49 @@
+"""
+Optional GLib main loop for D-Bus signals
+
+dbus-python only delivers signals when a main loop is attached to the
+connection. If GLib (python3-gi) is installed, a loop is run in a daemon
+thread. Without it, callers have to fall back to polling.
+"""
+import logging
+import threading
+
+try:
+    from gi.repository import GLib
+    from dbus.mainloop.glib import DBusGMainLoop, threads_init
+except ImportError:
+    GLib = None
+
+logger = logging.getLogger('nitroc-ui')
+
+
+class DBusLoop():
+    _started = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def start() -> bool:
+        """
+        Start main loop once, must be called before the first bus is opened
+
+        :return: True if signals can be received.
+        """
+        with DBusLoop._lock:
+            if DBusLoop._started:
+                return True
+            if GLib is None:
+                logger.info('GLib not available, D-Bus signals disabled')
+                return False
+
+            threads_init()
+            DBusGMainLoop(set_as_default=True)
+            loop = GLib.MainLoop()
+            thread = threading.Thread(target=loop.run, name='dbus-loop', daemon=True)
+            thread.start()
+            DBusLoop._started = True
+            logger.info('D-Bus main loop started')
+            return True
+
+    @staticmethod
+    def available() -> bool:
+        return DBusLoop._started
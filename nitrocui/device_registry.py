@@ -0,0 +1,141 @@
+"""
+Registry of optional I2C devices
+
+Keeps the state of each device (present, absent or failed) keyed by
+(bus, address). Devices that are missing or stopped responding are probed
+again on an exponentially growing schedule, so modules plugged in later
+are picked up without restart, while known-dead devices cause no I/O on
+the hot path.
+"""
+import logging
+import time
+
+logger = logging.getLogger('nitroc-ui')
+
+
+class Device():
+    def __init__(self, key, probe):
+        super().__init__()
+
+        self.key = key
+        self.probe = probe
+        self.state = DeviceRegistry.ABSENT
+        self.errors = 0         # Consecutive I/O errors while present
+        self.attempts = 0       # Failed probes since last present
+        self.probes = 0
+        self.next_probe = 0.0
+
+
+class DeviceRegistry():
+    PRESENT = 'present'
+    ABSENT = 'absent'
+    FAILED = 'failed'
+
+    # Consecutive I/O errors after which a present device is considered failed
+    ERROR_LIMIT = 3
+
+    # Time in seconds between probes of missing devices, doubled on each failed probe
+    PROBE_MIN = 5.0
+    PROBE_MAX = 300.0
+
+    def __init__(self, clock=time.monotonic):
+        super().__init__()
+
+        self.clock = clock
+        self._devices = dict()
+
+    def add(self, key, probe) -> bool:
+        """
+        Register and probe a device
+
+        :param key: (bus, address) of device.
+        :param probe: Callable checking and initializing the device, raises
+                      OSError if the device doesn't respond.
+        :return: True if device is present.
+        """
+        assert key not in self._devices
+        dev = Device(key, probe)
+        self._devices[key] = dev
+        self._probe(dev, self.clock())
+        return dev.state == DeviceRegistry.PRESENT
+
+    def present(self, key) -> bool:
+        return self._devices[key].state == DeviceRegistry.PRESENT
+
+    def state(self, key) -> str:
+        return self._devices[key].state
+
+    def retry_in(self, key) -> float:
+        """
+        Time in seconds until device is probed again, 0 if present
+        """
+        dev = self._devices[key]
+        if dev.state == DeviceRegistry.PRESENT:
+            return 0.0
+        return max(0.0, dev.next_probe - self.clock())
+
+    def ok(self, key) -> None:
+        """
+        Report successful I/O with device
+        """
+        self._devices[key].errors = 0
+
+    def error(self, key) -> None:
+        """
+        Report failed I/O with device, marks it failed after ERROR_LIMIT errors
+        """
+        dev = self._devices[key]
+        dev.errors += 1
+        if dev.state == DeviceRegistry.PRESENT and dev.errors >= self.ERROR_LIMIT:
+            self.failed(key)
+
+    def failed(self, key) -> None:
+        """
+        Mark device as failed, it is no longer used until a probe succeeds
+        """
+        dev = self._devices[key]
+        if dev.state == DeviceRegistry.PRESENT:
+            logger.info(f'device {DeviceRegistry._name(key)} failed')
+        dev.state = DeviceRegistry.FAILED
+        dev.attempts = 0
+        dev.next_probe = self.clock() + self.PROBE_MIN
+
+    def reprobe(self) -> list:
+        """
+        Probe missing devices that are due, call this regularly
+
+        :return: Keys of devices that became present.
+        """
+        now = self.clock()
+        found = []
+        for dev in self._devices.values():
+            if dev.state != DeviceRegistry.PRESENT and now >= dev.next_probe:
+                if self._probe(dev, now):
+                    found.append(dev.key)
+        return found
+
+    def stats(self) -> dict:
+        return {DeviceRegistry._name(dev.key): {'state': dev.state, 'probes': dev.probes}
+                for dev in self._devices.values()}
+
+    def _probe(self, dev: Device, now: float) -> bool:
+        dev.probes += 1
+        try:
+            dev.probe()
+        except OSError:
+            dev.attempts += 1
+            backoff = min(self.PROBE_MAX, self.PROBE_MIN * 2 ** (dev.attempts - 1))
+            dev.next_probe = now + backoff
+            return False
+
+        if dev.probes > 1:
+            logger.info(f'device {DeviceRegistry._name(dev.key)} detected')
+        dev.state = DeviceRegistry.PRESENT
+        dev.errors = 0
+        dev.attempts = 0
+        return True
+
+    @staticmethod
+    def _name(key) -> str:
+        bus, addr = key
+        return f'{bus}-{addr:02x}'
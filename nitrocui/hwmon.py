@@ -0,0 +1,173 @@
+"""
+Direct access to hwmon sensors in sysfs
+
+Locates hwmon chips by the same names the 'sensors' tool prints, e.g.
+tmp1075-i2c-0-48 or nvme-pci-40100. Input files are opened once and
+re-read with pread, which avoids running the 'sensors' tool.
+
+Chips of drivers loaded later or of re-probed devices are picked up by
+scanning /sys/class/hwmon again when a lookup misses, at most once per
+RESCAN_PERIOD.
+"""
+import errno
+import glob
+import logging
+import os
+import time
+from fnmatch import fnmatchcase
+
+logger = logging.getLogger('nitroc-ui')
+
+
+class HwmonInput():
+    """
+    One hwmon input file (e.g. temp1_input), kept open
+    """
+    def __init__(self, path: str, scale: float = 1000.0):
+        self.path = path
+        self.scale = scale
+        self.fd = os.open(path, os.O_RDONLY)
+        self.gone = False       # Set if the chip was removed, e.g. driver unloaded
+
+    def read(self) -> float | None:
+        """
+        :return: Scaled value, None on error.
+        """
+        try:
+            raw = os.pread(self.fd, 32, 0)
+            return int(raw) / self.scale
+        except OSError as e:
+            if e.errno in (errno.ENODEV, errno.ENOENT):
+                self.gone = True
+            return None
+        except ValueError:
+            return None
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class Hwmon():
+    ROOT = '/sys/class/hwmon'
+
+    # Min. time in seconds between scans triggered by a missed lookup
+    RESCAN_PERIOD = 60.0
+
+    def __init__(self, root: str = ROOT, rescan_period: float = RESCAN_PERIOD, clock=time.monotonic):
+        super().__init__()
+
+        self.root = root
+        self.rescan_period = rescan_period
+        self.clock = clock
+        self.chips = dict()     # chip name -> hwmon folder
+        self.last_scan = 0.0
+        self.scan()
+
+    def rescan(self) -> bool:
+        """
+        Scan again if the last scan is older than rescan_period
+
+        :return: True if scanned.
+        """
+        if self.clock() - self.last_scan < self.rescan_period:
+            return False
+        self.scan()
+        return True
+
+    def scan(self) -> None:
+        self.last_scan = self.clock()
+        chips = dict()
+        for folder in sorted(glob.glob(os.path.join(self.root, 'hwmon*'))):
+            name = Hwmon.chip_name(folder)
+            if name:
+                chips[name] = folder
+        self.chips = chips
+        logger.debug(f'found hwmon chips {list(chips)}')
+
+    def find(self, pattern: str) -> list[str]:
+        """
+        Get names of all chips matching a shell style pattern, scans again
+        if none is found
+        """
+        names = [name for name in self.chips if fnmatchcase(name, pattern)]
+        if not names and self.rescan():
+            names = [name for name in self.chips if fnmatchcase(name, pattern)]
+        return names
+
+    def open(self, pattern: str, feature: str, scale: float = 1000.0) -> HwmonInput | None:
+        """
+        Open input of first chip matching pattern
+
+        :param pattern: Chip name as shown by 'sensors', may contain wildcards.
+        :param feature: Feature name (e.g. temp1) or label (e.g. Composite).
+        :param scale: Divider to convert raw value, i.e. milli-units to units.
+        :return: The opened input or None if not found.
+        """
+        for name in self.find(pattern):
+            path = Hwmon.input_path(self.chips[name], feature)
+            if path:
+                try:
+                    return HwmonInput(path, scale)
+                except OSError as e:
+                    logger.info(f'cannot open {path}: {e}')
+        return None
+
+    @staticmethod
+    def input_path(folder: str, feature: str) -> str | None:
+        path = os.path.join(folder, f'{feature}_input')
+        if os.path.exists(path):
+            return path
+
+        # Look for feature with matching label
+        for label_path in glob.glob(os.path.join(folder, '*_label')):
+            if Hwmon._read_str(label_path) == feature:
+                path = label_path[:-len('_label')] + '_input'
+                if os.path.exists(path):
+                    return path
+        return None
+
+    @staticmethod
+    def chip_name(folder: str) -> str | None:
+        """
+        Build libsensors compatible chip name for a hwmon folder
+        """
+        prefix = Hwmon._read_str(os.path.join(folder, 'name'))
+        if not prefix:
+            return None
+
+        device = os.path.join(folder, 'device')
+        if not os.path.exists(device):
+            return f'{prefix}-virtual-0'
+
+        dev_name = os.path.basename(os.path.realpath(device))
+        subsystem = os.path.basename(os.path.realpath(os.path.join(device, 'subsystem')))
+        try:
+            if subsystem == 'i2c':
+                # 0-0048
+                bus, addr = dev_name.split('-')
+                return f'{prefix}-i2c-{int(bus)}-{int(addr, 16):02x}'
+            elif subsystem == 'pci':
+                # 0004:01:00.0
+                domain, bus, slot_fn = dev_name.split(':')
+                slot, fn = slot_fn.split('.')
+                addr = (int(domain, 16) << 16) + (int(bus, 16) << 8) + (int(slot, 16) << 3) + int(fn, 16)
+                return f'{prefix}-pci-{addr:04x}'
+            elif subsystem == 'mdio_bus':
+                # f212a600.mdio-mii:11 -> mdio-b
+                # libsensors reads the address as decimal, but prints it as hex
+                addr = int(dev_name.rsplit(':', 1)[1], 10)
+                return f'{prefix}-mdio-{addr:x}'
+            elif subsystem in ('platform', 'of_platform'):
+                return f'{prefix}-isa-0000'
+        except (ValueError, IndexError):
+            logger.info(f'cannot decode hwmon device {dev_name}')
+
+        return None
+
+    @staticmethod
+    def _read_str(path: str) -> str | None:
+        try:
+            with open(path) as f:
+                return f.readline().strip()
+        except OSError:
+            return None
@@ -1,10 +1,69 @@
 """
 This module provides a class for I2C communication. It uses the /dev/i2c-n devices to operate
+
+Register accesses use the I2C_RDWR ioctl. The register address write and the
+data read are sent as one combined transaction with a repeated start, so
+no slave address has to be set up front and no other master can slip in
+between. Several devices on the same bus can be read with a single ioctl.
 """
+import ctypes
 import os
 import fcntl
 
 IOCTL_I2C_SLAVE_ADDR = 0x0703
+IOCTL_I2C_RDWR = 0x0707
+
+I2C_M_RD = 0x0001
+
+# Kernel limit of messages per I2C_RDWR call (I2C_RDWR_IOCTL_MAX_MSGS)
+I2C_RDWR_MAX_MSGS = 42
+
+
+class I2CMsg(ctypes.Structure):
+    """
+    One message of an I2C_RDWR transfer, struct i2c_msg of the kernel
+    """
+    _fields_ = [
+        ('addr', ctypes.c_uint16),
+        ('flags', ctypes.c_uint16),
+        ('len', ctypes.c_uint16),
+        ('buf', ctypes.POINTER(ctypes.c_uint8)),
+    ]
+
+    @classmethod
+    def write(cls, addr: int, data) -> 'I2CMsg':
+        """
+        Create message writing data to device
+        """
+        data = bytes(data)
+        buf = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
+        msg = cls(addr=addr, flags=0, len=len(data), buf=buf)
+        msg._data = buf     # Keep buffer alive as long as message
+        return msg
+
+    @classmethod
+    def read(cls, addr: int, length: int) -> 'I2CMsg':
+        """
+        Create message reading length bytes from device
+        """
+        buf = (ctypes.c_uint8 * length)()
+        msg = cls(addr=addr, flags=I2C_M_RD, len=length, buf=buf)
+        msg._data = buf
+        return msg
+
+    def __bytes__(self) -> bytes:
+        return bytes(self._data)
+
+
+class I2CRdwrData(ctypes.Structure):
+    """
+    Argument of I2C_RDWR ioctl, struct i2c_rdwr_ioctl_data of the kernel
+    """
+    _fields_ = [
+        ('msgs', ctypes.POINTER(I2CMsg)),
+        ('nmsgs', ctypes.c_uint32),
+    ]
+
 
 class I2C:
     """
@@ -61,3 +120,63 @@ class I2C:
         Write to a 8 bit addressable register
         """
         self.write([reg, data])
+
+    def transfer(self, *msgs: I2CMsg) -> None:
+        """
+        Run messages as one combined transaction (repeated start between messages)
+
+        Data of read messages is available with bytes(msg) afterwards.
+        Raises OSError if any of the messages fails, e.g. device doesn't ack.
+        """
+        assert self.fd is not None, 'I2C device not opened'
+        assert 0 < len(msgs) <= I2C_RDWR_MAX_MSGS
+        array = (I2CMsg * len(msgs))(*msgs)
+        data = I2CRdwrData(msgs=array, nmsgs=len(msgs))
+        fcntl.ioctl(self.fd, IOCTL_I2C_RDWR, data)
+
+    def read_reg(self, addr: int, reg: int, length: int) -> bytes:
+        """
+        Read from a 8 bit addressable register of device addr
+        """
+        msg = I2CMsg.read(addr, length)
+        self.transfer(I2CMsg.write(addr, [reg]), msg)
+        return bytes(msg)
+
+    def write_reg(self, addr: int, reg: int, value: int) -> None:
+        """
+        Write to a 8 bit addressable register of device addr
+        """
+        self.transfer(I2CMsg.write(addr, [reg, value]))
+
+    def read_regs(self, requests: list[tuple[int, int, int]]) -> list[bytes | None]:
+        """
+        Read registers of several devices with as few ioctls as possible
+
+        A device that fails makes the whole transfer fail. In that case the
+        requests are repeated one by one, so the other devices still report.
+
+        :param requests: List of (addr, reg, length) tuples.
+        :return: Data per request, None if request failed.
+        """
+        results = []
+        chunk_size = I2C_RDWR_MAX_MSGS // 2
+        for start in range(0, len(requests), chunk_size):
+            chunk = requests[start:start + chunk_size]
+            msgs = []
+            reads = []
+            for addr, reg, length in chunk:
+                read = I2CMsg.read(addr, length)
+                msgs.extend((I2CMsg.write(addr, [reg]), read))
+                reads.append(read)
+
+            try:
+                self.transfer(*msgs)
+                results.extend(bytes(read) for read in reads)
+            except OSError:
+                for addr, reg, length in chunk:
+                    try:
+                        results.append(self.read_reg(addr, reg, length))
+                    except OSError:
+                        results.append(None)
+
+        return results
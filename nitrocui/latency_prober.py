@@ -0,0 +1,326 @@
+"""
+ICMP latency prober
+
+Keeps one ICMP socket open and sends echo requests to several targets on a
+fixed schedule. Replies are matched by sequence number, so a slow or lost
+reply never delays the next probe. RTT min/avg/max, jitter and loss are
+computed over sliding windows and published as 'link'.
+
+Unprivileged ICMP sockets (net.ipv4.ping_group_range) are used if allowed,
+otherwise a raw socket, which requires root or CAP_NET_RAW.
+"""
+import logging
+import math
+import os
+import select
+import socket
+import struct
+import threading
+import time
+
+from .ring_buffer import RingBuffer
+
+logger = logging.getLogger('nitroc-ui')
+
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+
+ICMP_HDR = struct.Struct('!BBHHH')      # type, code, checksum, identifier, sequence
+
+PAYLOAD = b'nitroc-ui latency'
+
+
+def checksum(data: bytes) -> int:
+    """
+    Internet checksum (RFC 1071)
+    """
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def build_echo_request(ident: int, seq: int, payload: bytes = PAYLOAD) -> bytes:
+    header = ICMP_HDR.pack(ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    csum = checksum(header + payload)
+    return ICMP_HDR.pack(ICMP_ECHO_REQUEST, 0, csum, ident, seq) + payload
+
+
+def parse_echo_reply(data: bytes, raw: bool) -> tuple[int, int] | None:
+    """
+    Decode echo reply
+
+    :param data: Received packet.
+    :param raw: True if received on a raw socket, i.e. data starts with the IP header.
+    :return: (identifier, sequence) or None if not an echo reply.
+    """
+    if raw:
+        if len(data) < 20:
+            return None
+        data = data[(data[0] & 0x0f) * 4:]
+
+    if len(data) < ICMP_HDR.size:
+        return None
+    msg_type, code, _, ident, seq = ICMP_HDR.unpack_from(data, 0)
+    if msg_type != ICMP_ECHO_REPLY or code != 0:
+        return None
+    return ident, seq
+
+
+def summarize(rtts) -> dict | None:
+    """
+    Compute statistics of probe results
+
+    :param rtts: Round trip times in seconds, NaN for lost probes.
+    :return: Dictionary with min, avg, max, jitter (mean difference of
+             consecutive RTTs) in seconds, loss in percent and number of
+             probes. None if there are no probes.
+    """
+    if len(rtts) == 0:
+        return None
+
+    ok = [rtt for rtt in rtts if not math.isnan(rtt)]
+    res = {
+        'min': None,
+        'avg': None,
+        'max': None,
+        'jitter': None,
+        'loss': round((len(rtts) - len(ok)) * 100.0 / len(rtts), 1),
+        'count': len(rtts),
+    }
+    if ok:
+        res['min'] = round(min(ok), 4)
+        res['avg'] = round(sum(ok) / len(ok), 4)
+        res['max'] = round(max(ok), 4)
+        diffs = [abs(b - a) for a, b in zip(ok, ok[1:])]
+        res['jitter'] = round(sum(diffs) / len(diffs), 4) if diffs else 0.0
+    return res
+
+
+class LatencyHistory():
+    """
+    Probe results of one target, NaN marks a lost probe
+    """
+    def __init__(self, size: int):
+        super().__init__()
+
+        self.timestamps = RingBuffer(size)
+        self.rtts = RingBuffer(size)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def add(self, timestamp: float, rtt: float | None) -> None:
+        self.timestamps.append(timestamp)
+        self.rtts.append(rtt if rtt is not None else math.nan)
+
+    def clear(self) -> None:
+        self.timestamps.clear()
+        self.rtts.clear()
+
+    def window(self, secs: float):
+        """
+        Get results of the last secs seconds, relative to the newest probe
+        """
+        count = len(self.timestamps)
+        if count == 0:
+            return []
+
+        limit = self.timestamps[-1] - secs
+        n = 0
+        while n < count and self.timestamps[count - 1 - n] > limit:
+            n += 1
+        return self.rtts.last(n)
+
+
+class LatencyProber(threading.Thread):
+    """
+    Probes targets while enabled and publishes latency statistics
+    """
+    PERIOD = 5.0
+
+    # Probes without reply within this time are counted as lost
+    TIMEOUT = 1.0
+
+    # Windows for statistics in seconds
+    WINDOWS = {
+        '1min': 60.0,
+        '15min': 900.0,
+    }
+
+    def __init__(self, model, targets: list[str], period: float = PERIOD, timeout: float = TIMEOUT):
+        """
+        :param model: Model to publish 'link' to.
+        :param targets: Host names or addresses to probe, the first one is reported as 'delay'.
+        :param period: Time between probes in seconds.
+        :param timeout: Max. time to wait for a reply in seconds, less than period
+                        so that results are recorded in send order.
+        """
+        super().__init__()
+
+        assert targets
+        assert period > timeout
+        self.model = model
+        self.targets = targets
+        self.period = period
+        self.timeout = timeout
+
+        self.sock, self.raw = self._open()
+        self.sock.setblocking(False)
+        self.icmp_id = os.getpid() & 0xffff
+        self.seq = 0
+
+        size = int(max(self.WINDOWS.values()) / period) + 1
+        self.history = {target: LatencyHistory(size) for target in targets}
+        self.last_rtt: dict[str, float | None] = {target: None for target in targets}
+        self.addrs: dict[str, str] = dict()
+        self.pending: dict[int, tuple[str, float]] = dict()    # seq -> (target, send time)
+
+        self._enabled = threading.Event()
+
+        # Set by enable(False), the loop resets state before the next probe
+        self._lock = threading.Lock()
+        self._reset_pending = True
+
+        self.daemon = True
+        self.name = 'latency-prober'
+
+    def enable(self, enabled: bool) -> None:
+        """
+        Start or stop probing, e.g. when the WWAN bearer comes up or goes down
+        """
+        with self._lock:
+            if enabled:
+                self._enabled.set()
+            else:
+                self._enabled.clear()
+                self._reset_pending = True
+
+    def run(self):
+        logger.info(f'probing latency of {self.targets} every {self.period} s')
+
+        next_probe = 0.0
+        while True:
+            # Also catches a disable/enable within one select timeout
+            if self._check_reset():
+                next_probe = time.monotonic()
+            if not self._enabled.is_set():
+                self._enabled.wait()
+                next_probe = time.monotonic()
+
+            now = time.monotonic()
+            if now >= next_probe:
+                self._send_probes(now)
+                next_probe += self.period
+                if next_probe < now:
+                    next_probe = now + self.period
+
+            deadline = next_probe
+            if self.pending:
+                deadline = min(deadline, min(sent for _, sent in self.pending.values()) + self.timeout)
+
+            timeout = max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self.sock], [], [], timeout)
+            if readable:
+                self._receive()
+            self._expire(time.monotonic())
+
+    def _send_probes(self, now: float) -> None:
+        for target in self.targets:
+            self.seq = (self.seq + 1) & 0xffff
+            try:
+                if (addr := self.addrs.get(target)) is None:
+                    addr = socket.gethostbyname(target)
+                    self.addrs[target] = addr
+                self.sock.sendto(build_echo_request(self.icmp_id, self.seq), (addr, 0))
+                self.pending[self.seq] = (target, now)
+            except OSError as e:
+                # Includes resolver errors, counts as lost probe
+                logger.debug(f'cannot probe {target}: {e}')
+                self._record(target, now, None)
+
+    def _receive(self) -> None:
+        while True:
+            try:
+                data, (addr, _) = self.sock.recvfrom(1024)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug(f'cannot receive probe reply: {e}')
+                return
+
+            now = time.monotonic()
+            if (reply := parse_echo_reply(data, self.raw)) is None:
+                continue
+            ident, seq = reply
+            # Unprivileged sockets get their identifier assigned by the kernel
+            if self.raw and ident != self.icmp_id:
+                continue
+            if (entry := self.pending.get(seq)) is None:
+                continue
+            target, sent = entry
+            if self.addrs.get(target) != addr:
+                continue
+
+            del self.pending[seq]
+            self._record(target, sent, now - sent)
+
+    def _expire(self, now: float) -> None:
+        for seq, (target, sent) in list(self.pending.items()):
+            if now - sent >= self.timeout:
+                del self.pending[seq]
+                self._record(target, sent, None)
+
+    def _record(self, target: str, sent: float, rtt: float | None) -> None:
+        self.history[target].add(sent, rtt)
+        self.last_rtt[target] = rtt
+        self._publish()
+
+    def _publish(self) -> None:
+        targets = dict()
+        for target, history in self.history.items():
+            info = {'rtt': self.last_rtt[target]}
+            for key, secs in self.WINDOWS.items():
+                info[key] = summarize(history.window(secs))
+            targets[target] = info
+
+        # 'delay' of first target for existing consumers, 0.0 if lost
+        delay = self.last_rtt[self.targets[0]]
+        self.model.publish('link', {
+            'delay': round(delay, 3) if delay is not None else 0.0,
+            'targets': targets,
+        })
+
+    def _check_reset(self) -> bool:
+        """
+        Reset state if requested by enable(False)
+
+        :return: True if reset.
+        """
+        with self._lock:
+            reset = self._reset_pending
+            self._reset_pending = False
+        if reset:
+            self._reset()
+        return reset
+
+    def _reset(self) -> None:
+        self.pending.clear()
+        self.addrs.clear()
+        for target in self.targets:
+            self.history[target].clear()
+            self.last_rtt[target] = None
+        self.model.publish('link', {'delay': 0.0})
+
+    @staticmethod
+    def _open() -> tuple[socket.socket, bool]:
+        """
+        :return: Socket and True if it's a raw socket.
+        """
+        try:
+            return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP), False
+        except PermissionError:
+            return socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP), True
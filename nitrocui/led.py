@@ -1,5 +1,7 @@
 import os
 
+from . import sysfs
+
 class LED_RGB():
     COLORS = {
         "off": "0 0 0",
@@ -48,8 +50,6 @@ class LED_RGB():
             rgb_color = LED_RGB.COLORS[color]
 
             if self.rgb_path:
-                with open(self.rgb_path, 'w') as f:
-                    f.write(rgb_color)
+                sysfs.attr(self.rgb_path, writable=True).write(rgb_color)
             if self.brightness_path:
-                with open(self.brightness_path, 'w') as f:
-                    f.write("100")
+                sysfs.attr(self.brightness_path, writable=True).write("100")
@@ -1,4 +1,3 @@
-import time
 import struct
 
 # Inspired by https://github.com/CurlyTaleGamesLLC/Adafruit_MicroPython_MCP9600/blob/main/adafruit_mcp9600.py
@@ -14,7 +13,7 @@ _REGISTER_VERSION = 0x20
 
 class MCP9600:
     # Sensor uses clock stretching to pause I2C master while getting temperature value
-    # Seemingly this doesn't work properly with CN9130 I2C system. Allow some retries
+    # Seemingly this doesn't always work properly with CN9130 I2C system. Allow some retries
     RETRIES = 3
 
     # Shutdown mode options
@@ -49,10 +48,11 @@ class MCP9600:
         self._tcfilter = min(7, max(0, tcfilter))
         self._ttype = MCP9600.types.index(tctype)
 
-    def init(self):
+    def init(self, mode=NORMAL, burst_samples=BURST_SAMPLES_1):
         # Device config
-        # - All defaults: 0.0625, 18 Bit resolution, 1 sample, normal mode
-        self.__setreg8(_REGISTER_DEVICE_CFG, 0x00)
+        # - 0.0625, 18 Bit resolution
+        # - Normal mode converts continuously, burst mode converts burst_samples once
+        self.__setreg8(_REGISTER_DEVICE_CFG, (burst_samples << 2) | mode)
 
         # Sensor config
         self.__setreg8(_REGISTER_THERM_CFG, self._tcfilter | (self._ttype << 4))
@@ -81,6 +81,10 @@ class MCP9600:
         else:
             return 0
 
+    def temperature_request(self):
+        """ Read request (addr, reg, length) for hot junction, see I2C.read_regs() """
+        return (self.ADDR, _REGISTER_HOT_JUNCTION, 2)
+
     def temp_c(self, byteData):
         # data = 16 bit signed, 2's complement
         # byte 0 = MSB, byte 1 = LSB
@@ -92,13 +96,7 @@ class MCP9600:
         # print(f'__getreg16 0x{self.ADDR:02x} 0x{reg:02x}')
         for _ in range(MCP9600.RETRIES):
             try:
-                self.i2c_device.set_addr(self.ADDR)
-                self.i2c_device.write([reg])
-                self.__i2c_wait()
-                res = self.i2c_device.read(1)
-                self.__i2c_wait()
-                # print(res)
-                return res
+                return self.i2c_device.read_reg(self.ADDR, reg, 1)
             except OSError:
                 # print("read error -> retry")
                 pass
@@ -107,20 +105,13 @@ class MCP9600:
         # print(f'__getreg16 0x{self.ADDR:02x} 0x{reg:02x}')
         for _ in range(MCP9600.RETRIES):
             try:
-                self.i2c_device.set_addr(self.ADDR)
-                self.i2c_device.write([reg])
-                self.__i2c_wait()
-                res = self.i2c_device.read(2)
-                # print(res)
-                return res
+                # Register write and read are one combined transfer, the bus
+                # driver waits for the clock stretching of the sensor
+                return self.i2c_device.read_reg(self.ADDR, reg, 2)
             except OSError:
-                print("*** read error -> retry")
+                # print("read error -> retry")
                 pass
 
     def __setreg8(self, reg: int, value: int) -> None:
         # print(f'Set reg {reg:02x} to {value:02x}')
-        self.i2c_device.set_addr(self.ADDR)
-        self.i2c_device.write_reg8(reg, value)
-
-    def __i2c_wait(self):
-        time.sleep(60/1_000_000)    # 60 us max. clock stretching time
+        self.i2c_device.write_reg(self.ADDR, reg, value)
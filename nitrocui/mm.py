@@ -1,8 +1,12 @@
 import dbus
 import logging
 import re  # Import regular expression module
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from .cellular_signal_quality import CellularSignalQuality
+from .dbus_loop import DBusLoop
 
 logger = logging.getLogger('nitroc-ui')
 
@@ -16,18 +20,150 @@ MM_BEARER_IF = "org.freedesktop.ModemManager1.Bearer"
 MM_SIM_IF = "org.freedesktop.ModemManager1.Sim"
 MM_OBJECT_MANAGER_IF = "org.freedesktop.DBus.ObjectManager"
 
+MM_PATH = "/org/freedesktop/ModemManager1"
+
 SIG_QUALITY_CHECK_IN_SECS = 5
 
+# Guards creation of the shared ModemManagerClient
+_client_lock = threading.Lock()
 
-class MM():
-    @staticmethod
-    def modem(imei: str):
-        id = MM._id_dbus(imei)
-        if id is not None:
-            return Modem(id)    # else None
+
+class ModemManagerClient():
+    """
+    Long-lived connection to ModemManager
+
+    Keeps one bus connection and caches object proxies and interfaces per
+    object path. The list of managed objects is cached as well. It is
+    invalidated by InterfacesAdded/InterfacesRemoved signals if a D-Bus main
+    loop is available, otherwise it expires after MANAGED_OBJECTS_TTL.
+    """
+    # Singleton accessor
+    instance = None
+
+    # Max. age of managed objects list in seconds, if signals are not available
+    MANAGED_OBJECTS_TTL = 10.0
+
+    def __init__(self):
+        super().__init__()
+
+        self.signals = DBusLoop.start()
+        self.bus = dbus.SystemBus()
+
+        self._lock = threading.Lock()
+        self._proxies = dict()      # path -> proxy object
+        self._interfaces = dict()   # (path, interface) -> dbus.Interface
+        self._objects = None        # Result of GetManagedObjects
+        self._modems = dict()       # id -> Modem
+        self._objects_time = 0.0
+
+        self._manager = self.bus.get_object(MM_DBUS_IF, MM_PATH)
+        if self.signals:
+            self.bus.add_signal_receiver(self._on_interfaces_changed, 'InterfacesAdded',
+                                         MM_OBJECT_MANAGER_IF, MM_DBUS_IF, MM_PATH)
+            self.bus.add_signal_receiver(self._on_interfaces_changed, 'InterfacesRemoved',
+                                         MM_OBJECT_MANAGER_IF, MM_DBUS_IF, MM_PATH)
 
     @staticmethod
-    def _id_dbus(imei_regex: str) -> int | None:
+    def get() -> 'ModemManagerClient':
+        """
+        Get shared client, created on first use
+
+        Called from the MM executor, the D-Bus loop and the web server, so
+        creation is locked to avoid duplicate signal subscriptions.
+        """
+        if ModemManagerClient.instance is None:
+            with _client_lock:
+                if ModemManagerClient.instance is None:
+                    ModemManagerClient.instance = ModemManagerClient()
+        return ModemManagerClient.instance
+
+    def proxy(self, path: str):
+        with self._lock:
+            obj = self._proxies.get(path)
+            if obj is None:
+                obj = self.bus.get_object(MM_DBUS_IF, path)
+                self._proxies[path] = obj
+            return obj
+
+    def interface(self, path: str, interface: str) -> dbus.Interface:
+        obj = self.proxy(path)
+        with self._lock:
+            intf = self._interfaces.get((path, interface))
+            if intf is None:
+                intf = dbus.Interface(obj, interface)
+                self._interfaces[(path, interface)] = intf
+            return intf
+
+    def managed_objects(self) -> dict:
+        """
+        Get all ModemManager objects with their interfaces and properties
+
+        Identity properties like the IMEI never change for an object path.
+        Other properties may be outdated, query the object for current values.
+        """
+        with self._lock:
+            objects = self._objects
+            expired = not self.signals and time.monotonic() - self._objects_time > self.MANAGED_OBJECTS_TTL
+        if objects is None or expired:
+            objects = self._manager.GetManagedObjects(dbus_interface=MM_OBJECT_MANAGER_IF)
+            with self._lock:
+                self._objects = objects
+                self._objects_time = time.monotonic()
+        return objects
+
+    def invalidate(self, path: str | None = None) -> None:
+        """
+        Drop cached data, e.g. after an object disappeared
+
+        :param path: Object path to drop proxies for, all if None.
+        """
+        with self._lock:
+            self._objects = None
+            if path is None:
+                self._proxies.clear()
+                self._interfaces.clear()
+                self._modems.clear()
+            else:
+                self._proxies.pop(path, None)
+                self._modems = {id: m for id, m in self._modems.items() if m.path != path}
+                for key in [key for key in self._interfaces if key[0] == path]:
+                    del self._interfaces[key]
+
+    def subscribe_properties(self, callback) -> bool:
+        """
+        Get notified about property changes of all ModemManager objects
+
+        The callback is invoked in the D-Bus main loop thread with
+        (interface, changed, invalidated, path=object path).
+
+        Returns:
+        bool: True if subscribed, False if no main loop is available.
+        """
+        if not self.signals:
+            return False
+        self.bus.add_signal_receiver(callback, 'PropertiesChanged', DBUS_PROPERTIES_IF, MM_DBUS_IF,
+                                     path_keyword='path')
+        return True
+
+    def modem(self, id: int, imei: str | None = None) -> 'Modem':
+        """
+        Get modem object for ID, kept until the modem disappears
+
+        Args:
+        id (int): The modem ID.
+        imei (str): IMEI if already known, e.g. from modems().
+        """
+        with self._lock:
+            m = self._modems.get(id)
+        if m is None:
+            m = Modem(id, self)
+            if imei:
+                m.static["EquipmentIdentifier"] = imei
+            with self._lock:
+                self._modems[id] = m
+        return m
+
+    def modem_id(self, imei_regex: str) -> int | None:
         """
         Find a modem ID by matching its IMEI against a given regex.
 
@@ -35,67 +171,164 @@ class MM():
         imei_regex (str): A regular expression to match the modem's IMEI.
 
         Returns:
-        int: The modem ID (D-Bus object path) if a match is found, None otherwise.
+        int: The modem ID (number of D-Bus object path) if a match is found, None otherwise.
         """
-        try:
-            # Connect to the system bus
-            bus = dbus.SystemBus()
+        for id, imei in self.modems():
+            # Compare the IMEI with the provided regex
+            if re.fullmatch(imei_regex, imei):
+                return id
+
+        logger.info('no modem(s) matched the provided IMEI')
+        return None
 
-            # Get the ModemManager object
-            modem_manager = bus.get_object(MM_DBUS_IF, "/org/freedesktop/ModemManager1")
+    def modems(self) -> list[tuple[int, str]]:
+        """
+        Get all modems known to ModemManager.
 
-            # Get the list of modems
-            modems = modem_manager.GetManagedObjects(dbus_interface=MM_OBJECT_MANAGER_IF)
-            assert modems is not None, "No modems found"
+        Returns:
+        list[tuple[int, str]]: Modem ID (number of D-Bus object path) and IMEI, sorted by ID.
+        """
+        res = []
+        initializing = False
+        for path, interfaces in self.managed_objects().items():
+            if MM_MODEM_IF in interfaces:
+                imei = interfaces[MM_MODEM_IF].get('EquipmentIdentifier')
+                if imei:
+                    res.append((int(path.split('/')[-1]), str(imei)))
+                else:
+                    initializing = True
+
+        if initializing:
+            # IMEI is set once the modem is initialized, no signal tells us, so query again next time
+            with self._lock:
+                self._objects = None
+        return sorted(res)
+
+    def _on_interfaces_changed(self, path, *args):
+        logger.info(f'ModemManager object {path} changed')
+        self.invalidate(path)
 
-            # Iterate over all modems
-            for path, interfaces in modems.items():
-                if MM_MODEM_IF in interfaces:
-                    # Get the modem object
-                    modem = bus.get_object(MM_DBUS_IF, path)
 
-                    # Get the IMEI of the modem
-                    imei = modem.Get(MM_MODEM_IF, "EquipmentIdentifier", dbus_interface=DBUS_PROPERTIES_IF)
+class MM():
+    # Max. number of modems queried concurrently
+    MAX_WORKERS = 4
 
-                    # Compare the IMEI with the provided regex
-                    if imei and re.fullmatch(imei_regex, imei):
-                        # Extract and return the modem ID (number) from the path
-                        modem_id = int(path.split('/')[-1])
-                        return modem_id
+    # ModemManager calls are run in these threads by the model worker and the
+    # web server, so a slow modem never blocks the Tornado IOLoop. Different
+    # modems are handled concurrently, calls for the same modem are serialized
+    # by Modem.lock (e.g. a reset never runs during a poll of that modem).
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='mm')
 
-            logger.info('no modem(s) matched the provided IMEI')
-            return None
+    @staticmethod
+    def submit(fn, *args) -> Future:
+        """
+        Run a function using ModemManager in the MM executor.
+
+        Returns:
+        Future: Result of fn, await with IOLoop.run_in_executor() or use result().
+        """
+        return MM.executor.submit(fn, *args)
+
+    @staticmethod
+    def reset(imei: str) -> bool:
+        """
+        Reset the modem matching an IMEI regex.
+
+        Returns:
+        bool: True if a modem was found.
+        """
+        m = MM.modem(imei)
+        if m:
+            # Don't reset while the modem is polled in another MM worker
+            with m.lock:
+                m.reset()
+            return True
+        return False
+
+    @staticmethod
+    def modems() -> list['Modem']:
+        """
+        Get all modems, sorted by ID.
+        """
+        try:
+            client = ModemManagerClient.get()
+            return [client.modem(id, imei) for id, imei in client.modems()]
+        except dbus.DBusException as e:
+            logger.warning(f"failed to retrieve modem information: {e}")
+            if ModemManagerClient.instance:
+                ModemManagerClient.instance.invalidate()
+            return []
+
+    @staticmethod
+    def modem(imei: str):
+        try:
+            client = ModemManagerClient.get()
+            id = client.modem_id(imei)
+            if id is not None:
+                return client.modem(id)     # else None
         except dbus.DBusException as e:
             logger.warning(f"failed to retrieve modem information: {e}")
+            if ModemManagerClient.instance:
+                ModemManagerClient.instance.invalidate()
             return None
 
 
 class Modem():
-    def __init__(self, id):
+    def __init__(self, id, client: ModemManagerClient | None = None):
         self.id = id
+        self.client = client or ModemManagerClient.get()
+        self.path = f'{MM_PATH}/Modem/{self.id}'
 
-        self.dbus = dbus.SystemBus()
+        self.modem_if = self.client.interface(self.path, MM_MODEM_IF)
+        self.signal_if = self.client.interface(self.path, MM_MODEM_SIGNAL_IF)
+        self.loc_if = self.client.interface(self.path, MM_MODEM_LOCATION_IF)
 
-        self.modem_if = self._get_modem_by_id()
-        assert self.modem_if is not None, "Modem object is not initialized"
+        # Serializes users of this modem, e.g. poll and reset
+        self.lock = threading.Lock()
 
-        self.signal_if = dbus.Interface(self.modem_if, MM_MODEM_SIGNAL_IF)
-        assert self.signal_if is not None, "Signal interface is None"
+        # Property snapshots, updated by refresh()
+        self.props = None
+        self.signal_props = None
 
-        self.loc_if = dbus.Interface(self.modem_if, MM_MODEM_LOCATION_IF)
-        assert self.loc_if is not None, "Location interface is None"
+        # Identity properties, don't change for the lifetime of the object path
+        self.static = dict()
+
+        self._bearer = None
+        self._sim = None
+
+        # Signal and location setup applied, verified again after a state change
+        self.signal_setup_done = False
+        self.location_setup_done = False
+
+    def refresh(self) -> bool:
+        """
+        Get all properties of the Modem and Modem.Signal interfaces
+
+        One GetAll call per interface. The accessors return values of this
+        snapshot, call once per update cycle.
+
+        Returns:
+        bool: True if properties were read, False if the modem is gone.
+        """
+        try:
+            old_state = self.props.get("State") if self.props is not None else None
+            self.props = self.modem_if.GetAll(MM_MODEM_IF, dbus_interface=DBUS_PROPERTIES_IF)
+            if old_state is not None and self.props.get("State") != old_state:
+                self._reset_setup()
+            self.signal_props = self.signal_if.GetAll(MM_MODEM_SIGNAL_IF, dbus_interface=DBUS_PROPERTIES_IF)
+            self._update_links(refresh=True)
+            return True
+        except dbus.DBusException as e:
+            logger.warning(f"failed to read properties of modem {self.id}: {e}")
+            self.client.invalidate(self.path)
+            return False
 
     def reset(self):
         """
         Reset the modem using the D-Bus interface.
         """
         try:
-            # Ensure the modem object is initialized
-            assert self.modem_if is not None, "Modem object is not initialized"
-
-            # Create an interface pointer for the Modem interface
-            modem_interface = dbus.Interface(self.modem_if, MM_MODEM_IF)
-            modem_interface.Reset()
+            self.modem_if.Reset()
             logger.info(f"modem {self.id} has been reset successfully.")
         except dbus.DBusException as e:
             logger.warning(f"failed to reset modem {self.id}: {e}")
@@ -106,15 +339,14 @@ class Modem():
     def model(self) -> str:
         return self._get_modem_property_as_string("Model")
 
-    def revision(self) -> str:
-        return self._get_modem_property_as_string("Revision")
+    def revision(self) -> str | None:
+        return self._get_static_property("Revision")
 
-    def imei(self) -> str:
-        return self._get_modem_property_as_string("EquipmentIdentifier")
+    def imei(self) -> str | None:
+        return self._get_static_property("EquipmentIdentifier")
 
     def state(self) -> str:
-        assert self.modem_if is not None, "Modem object is not initialized"
-        state_code = self.modem_if.Get(MM_MODEM_IF, "State", dbus_interface=DBUS_PROPERTIES_IF)
+        state_code = self._get_modem_property("State")
         assert state_code is not None
         return Modem.state_to_string(int(state_code))
 
@@ -125,13 +357,13 @@ class Modem():
         return self._get_access_tech_by_index(1)
 
     def signal_quality(self) -> int:
-        assert self.modem_if is not None, "Modem object is not initialized"
-        sigq = self.modem_if.Get(MM_MODEM_IF, "SignalQuality", dbus_interface=DBUS_PROPERTIES_IF)
+        sigq = self._get_modem_property("SignalQuality")
         return int(sigq[0]) if sigq is not None else 0
 
     def signal_5g(self):
         quality = self.get_signal_quality("Nr5g")
-        assert quality is not None, "Signal quality is None"
+        if quality is None:
+            return None
 
         rsrp = quality['rsrp']
         rsrq = quality['rsrq']
@@ -159,15 +391,20 @@ class Modem():
         Retrieve and process LTE signal quality metrics.
 
         Returns:
-        dict: A dictionary containing processed LTE signal quality metrics.
+        dict: A dictionary containing processed LTE signal quality metrics,
+        None if not available.
         """
         quality = self.get_signal_quality("Lte")
-        assert quality is not None, "Signal quality is None"
+        if quality is None:
+            return None
 
         rsrp = quality['rsrp']
         rsrq = quality['rsrq']
         snr = quality['snr']
         rssi = quality['rssi']
+        if rsrp is None or rsrq is None or snr is None:
+            logger.warning("LTE signal quality metrics are not available")
+            return None
 
         # Clamp values to valid ranges
         rsrp = CellularSignalQuality.limit_signal(rsrp)
@@ -214,44 +451,55 @@ class Modem():
         return res
 
     def bearer(self):
-        assert self.modem_if is not None, "Modem object is not initialized"
-        bearers = self.modem_if.Get(MM_MODEM_IF, "Bearers", dbus_interface=DBUS_PROPERTIES_IF)
-        if bearers is not None and len(bearers) >= 1:
-            bearer_id = int(bearers[0].split('/')[-1])
-            assert 0 <= bearer_id <= 10000
-            return Bearer(bearer_id)
+        """
+        Get first bearer, None if there is none. Properties are read by refresh().
+        """
+        if self.props is None:
+            self.refresh()
+        return self._bearer
 
     def sim(self):
-        assert self.modem_if is not None, "Modem object is not initialized"
-        sim = self.modem_if.Get(MM_MODEM_IF, "Sim", dbus_interface=DBUS_PROPERTIES_IF)
-        if sim is not None and sim != '/':
-            sim_id = int(sim.split('/')[-1])
-            assert 0 <= sim_id <= 1000
-            return SIM(sim_id)
+        """
+        Get SIM, None if there is none. Properties are read by refresh().
+        """
+        if self.props is None:
+            self.refresh()
+        return self._sim
 
-    def _get_modem_by_id(self):
+    def properties_changed(self, path: str, interface: str, changed: dict) -> bool:
         """
-        Retrieve a Modem object by its ID.
+        Apply a PropertiesChanged signal to the snapshots
+
+        Args:
+        path (str): Object path of the signal.
+        interface (str): Interface whose properties changed.
+        changed (dict): Changed properties with new values.
 
         Returns:
-        Modem: A Modem object if the modem exists, None otherwise.
+        bool: True if the signal concerns this modem, its bearer or SIM.
         """
-        try:
-            # Construct the D-Bus object path for the modem
-            modem_path = f"/org/freedesktop/ModemManager1/Modem/{self.id}"
-
-            # Check if the modem exists
-            modem = self.dbus.get_object(MM_DBUS_IF, modem_path)
-            if modem:
-                modem_interface = dbus.Interface(modem, MM_MODEM_IF)
-                assert modem_interface is not None, "Modem interface is None"
-                return modem_interface
-            else:
-                logger.info(f"no modem found with ID {self.id}")
-                return None
-        except dbus.DBusException as e:
-            logger.error(f"failed to retrieve modem by ID {self.id}: {e}")
-            return None
+        if self.props is None:
+            return False
+
+        # Snapshots are replaced, not modified, readers may use them concurrently
+        if path == self.path:
+            if interface == MM_MODEM_IF:
+                if "State" in changed and changed["State"] != self.props.get("State"):
+                    self._reset_setup()
+                self.props = {**self.props, **changed}
+                if "Bearers" in changed or "Sim" in changed:
+                    self._update_links(refresh=False)
+                return True
+            if interface == MM_MODEM_SIGNAL_IF and self.signal_props is not None:
+                self.signal_props = {**self.signal_props, **changed}
+                return True
+        elif self._bearer and self._bearer.props is not None and path == self._bearer.path and interface == MM_BEARER_IF:
+            self._bearer.props = {**self._bearer.props, **changed}
+            return True
+        elif self._sim and self._sim.props is not None and path == self._sim.path and interface == MM_SIM_IF:
+            self._sim.props = {**self._sim.props, **changed}
+            return True
+        return False
 
     def get_signal_quality(self, accesstech: str) -> dict | None:
         """
@@ -264,19 +512,20 @@ class Modem():
         dict: A dictionary containing signal quality metrics (e.g., rsrp, rsrq, snr).
         """
         try:
-            # signal_interface = dbus.Interface(self.modem_if, MM_MODEM_SIGNAL_IF)
-            # assert signal_interface is not None, "Signal interface is None"
-
             # Enable signal monitoring (if not already enabled)
-            rate: int = self.signal_if.Get(MM_MODEM_SIGNAL_IF, "Rate", dbus_interface=DBUS_PROPERTIES_IF)
-            assert rate is not None
-            if rate != SIG_QUALITY_CHECK_IN_SECS:
-                logger.info(f"setting signal quality check interval to {SIG_QUALITY_CHECK_IN_SECS} seconds")
-                self.signal_if.Setup(SIG_QUALITY_CHECK_IN_SECS)  # Set up signal monitoring
+            if not self.signal_setup_done:
+                rate: int = self._get_signal_property("Rate")
+                if rate is None:
+                    return None
+                if rate != SIG_QUALITY_CHECK_IN_SECS:
+                    logger.info(f"setting signal quality check interval to {SIG_QUALITY_CHECK_IN_SECS} seconds")
+                    self.signal_if.Setup(SIG_QUALITY_CHECK_IN_SECS)  # Set up signal monitoring
+                self.signal_setup_done = True
 
             # Retrieve the signal quality properties
-            signal_properties = self.signal_if.Get(MM_MODEM_SIGNAL_IF, accesstech, dbus_interface=DBUS_PROPERTIES_IF)
-            assert signal_properties is not None, "Signal properties are None"
+            signal_properties = self._get_signal_property(accesstech)
+            if signal_properties is None:
+                return None
 
             def to_float(value):
                 """Convert a value to float, round to 1 digit, or return None if the value is None."""
@@ -305,14 +554,14 @@ class Modem():
         try:
             MM_MODEM_LOCATION_SOURCE_3GPP_LAC_CI = 1 << 0
 
-            # loc_interface = dbus.Interface(self.modem_if, MM_MODEM_LOCATION_IF)
-
             # Enable location monitoring (if not already enabled)
-            enabled_locs = self.loc_if.Get(MM_MODEM_LOCATION_IF, "Enabled", dbus_interface=DBUS_PROPERTIES_IF)
-            assert enabled_locs is not None
-            if enabled_locs & MM_MODEM_LOCATION_SOURCE_3GPP_LAC_CI == 0:
-                logger.info("enabling 3GPP location query")
-                self.loc_if.Setup(MM_MODEM_LOCATION_SOURCE_3GPP_LAC_CI, False)
+            if not self.location_setup_done:
+                enabled_locs = self.loc_if.Get(MM_MODEM_LOCATION_IF, "Enabled", dbus_interface=DBUS_PROPERTIES_IF)
+                assert enabled_locs is not None
+                if enabled_locs & MM_MODEM_LOCATION_SOURCE_3GPP_LAC_CI == 0:
+                    logger.info("enabling 3GPP location query")
+                    self.loc_if.Setup(MM_MODEM_LOCATION_SOURCE_3GPP_LAC_CI, False)
+                self.location_setup_done = True
 
             # Get location information
             locations = self.loc_if.GetLocation()
@@ -421,6 +670,26 @@ class Modem():
 
         return technologies
 
+    def _get_modem_property(self, property_name: str):
+        """
+        Helper method to retrieve a modem property from the snapshot.
+
+        Args:
+        property_name (str): The name of the property to retrieve.
+
+        Returns:
+        The property value, None if not available.
+        """
+        if self.props is None:
+            self.refresh()
+        # Still None if refresh failed
+        return self.props.get(property_name) if self.props is not None else None
+
+    def _get_signal_property(self, property_name: str):
+        if self.signal_props is None:
+            self.refresh()
+        return self.signal_props.get(property_name) if self.signal_props is not None else None
+
     def _get_modem_property_as_string(self, property_name: str) -> str:
         """
         Helper method to retrieve a modem property as a string.
@@ -431,9 +700,58 @@ class Modem():
         Returns:
         str: The property value as a string.
         """
-        assert self.modem_if is not None, "Modem object is not initialized"
-        value = self.modem_if.Get(MM_MODEM_IF, property_name, dbus_interface=DBUS_PROPERTIES_IF)
-        return str(value)
+        return str(self._get_modem_property(property_name))
+
+    def _reset_setup(self):
+        """
+        Helper method to verify signal and location setup again, e.g. after the modem was re-enabled.
+        """
+        self.signal_setup_done = False
+        self.location_setup_done = False
+
+    def _update_links(self, refresh: bool):
+        """
+        Helper method to follow the Bearers and Sim properties.
+
+        Args:
+        refresh (bool): Read properties of known bearer and SIM too, new objects are always read.
+        """
+        bearers = self.props.get("Bearers")
+        if bearers is not None and len(bearers) >= 1:
+            bearer_id = int(bearers[0].split('/')[-1])
+            assert 0 <= bearer_id <= 10000
+            if self._bearer is None or self._bearer.id != bearer_id:
+                self._bearer = Bearer(bearer_id, self.client)
+                self._bearer.refresh()
+            elif refresh:
+                self._bearer.refresh()
+        else:
+            self._bearer = None
+
+        sim = self.props.get("Sim")
+        if sim is not None and sim != '/':
+            sim_id = int(sim.split('/')[-1])
+            assert 0 <= sim_id <= 1000
+            if self._sim is None or self._sim.id != sim_id:
+                self._sim = SIM(sim_id, self.client)
+                self._sim.refresh()
+            elif refresh:
+                self._sim.refresh()
+        else:
+            self._sim = None
+
+    def _get_static_property(self, property_name: str) -> str | None:
+        """
+        Helper method to retrieve an identity property, cached once available.
+        """
+        value = self.static.get(property_name)
+        if value is None:
+            raw = self._get_modem_property(property_name)
+            if raw is None:
+                return None
+            value = str(raw)
+            self.static[property_name] = value
+        return value
 
     def _get_access_tech_by_index(self, index: int) -> str | None:
         """
@@ -445,8 +763,7 @@ class Modem():
         Returns:
         str | None: The access technology string if available, otherwise None.
         """
-        assert self.modem_if is not None, "Modem object is not initialized"
-        bitmask = self.modem_if.Get(MM_MODEM_IF, "AccessTechnologies", dbus_interface=DBUS_PROPERTIES_IF)
+        bitmask = self._get_modem_property("AccessTechnologies")
         assert bitmask is not None, "AccessTechnologies bitmask is None"
         techs_strs = Modem.access_tech_to_strings(int(bitmask))
         if len(techs_strs) > index:
@@ -455,56 +772,66 @@ class Modem():
 
 
 class Bearer():
-    def __init__(self, id):
+    def __init__(self, id, client: ModemManagerClient | None = None):
         self.id = id
-        self.bearer_if = self._get_bearer_by_id()
+        self.client = client or ModemManagerClient.get()
+        self.path = f'{MM_PATH}/Bearer/{self.id}'
+        self.bearer_if = self.client.interface(self.path, MM_BEARER_IF)
+        self.props = None
+
+    def refresh(self):
+        """
+        Get all bearer properties with one GetAll call
+        """
+        self.props = self.bearer_if.GetAll(MM_BEARER_IF, dbus_interface=DBUS_PROPERTIES_IF)
 
     def uptime(self):
-        assert self.bearer_if is not None, "Bearer interface is not initialized"
-        stats_properties = self.bearer_if.Get(MM_BEARER_IF, "Stats", dbus_interface=DBUS_PROPERTIES_IF)
+        stats_properties = self._get_property("Stats")
         assert stats_properties is not None
         uptime = int(stats_properties.get("duration"))
         return uptime
 
     def ip(self):
-        assert self.bearer_if is not None, "Bearer interface is not initialized"
-        ipv4_properties = self.bearer_if.Get(MM_BEARER_IF, "Ip4Config", dbus_interface=DBUS_PROPERTIES_IF)
+        ipv4_properties = self._get_property("Ip4Config")
         assert ipv4_properties is not None
         ipv4_addr = str(ipv4_properties.get("address"))
         return ipv4_addr
 
-    def _get_bearer_by_id(self):
-        try:
-            bearer_path = f'/org/freedesktop/ModemManager1/Bearer/{self.id}'
-            bearer_obj = dbus.SystemBus().get_object(MM_DBUS_IF, bearer_path)
-            bearer_interface = dbus.Interface(bearer_obj, MM_BEARER_IF)
-            return bearer_interface
-        except dbus.DBusException as e:
-            logger.error(f"failed to get bearers interface: {e}")
-            return None
+    def _get_property(self, property_name: str):
+        if self.props is None:
+            self.refresh()
+        return self.props.get(property_name) if self.props is not None else None
 
 
 class SIM():
-    def __init__(self, id):
+    def __init__(self, id, client: ModemManagerClient | None = None):
         self.id = id
-        self.sim_if = self._get_sim_by_id()
+        self.client = client or ModemManagerClient.get()
+        self.path = f'{MM_PATH}/SIM/{self.id}'
+        self.sim_if = self.client.interface(self.path, MM_SIM_IF)
+        self.props = None
+
+        # ICCID is fixed for a SIM object path
+        self._iccid = None
+
+    def refresh(self):
+        """
+        Get all SIM properties with one GetAll call
+        """
+        self.props = self.sim_if.GetAll(MM_SIM_IF, dbus_interface=DBUS_PROPERTIES_IF)
 
     def imsi(self):
-        assert self.sim_if is not None, "SIM interface is not initialized"
-        imsi = self.sim_if.Get(MM_SIM_IF, "Imsi", dbus_interface=DBUS_PROPERTIES_IF)
+        imsi = self._get_property("Imsi")
         return str(imsi)
 
     def iccid(self):
-        assert self.sim_if is not None, "SIM interface is not initialized"
-        iccid = self.sim_if.Get(MM_SIM_IF, "SimIdentifier", dbus_interface=DBUS_PROPERTIES_IF)
-        return str(iccid)
+        if self._iccid is None:
+            if (iccid := self._get_property("SimIdentifier")) is None:
+                return None
+            self._iccid = str(iccid)
+        return self._iccid
 
-    def _get_sim_by_id(self):
-        try:
-            sim_path = f'/org/freedesktop/ModemManager1/SIM/{self.id}'
-            sim_obj = dbus.SystemBus().get_object(MM_DBUS_IF, sim_path)
-            sim_interface = dbus.Interface(sim_obj, MM_SIM_IF)
-            return sim_interface
-        except dbus.DBusException as e:
-            logger.error(f"failed to get SIM interface: {e}")
-            return None
+    def _get_property(self, property_name: str):
+        if self.props is None:
+            self.refresh()
+        return self.props.get(property_name) if self.props is not None else None
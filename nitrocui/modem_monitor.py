@@ -0,0 +1,204 @@
+"""
+ModemManager state monitor
+
+Keeps one 'modem/<imei>' section per modem known to ModemManager up to
+date. The first modem matching WWAN/IMEI is the primary modem, it is also
+published as 'modem'. The 'modems' section lists the IMEIs of all modems.
+
+If a D-Bus main loop is available, PropertiesChanged signals of a modem,
+its bearer and SIM are applied to the property snapshots and only the
+changed fields are published. poll() reads all properties and serves as
+slow consistency check. Without main loop poll() is the only source of
+updates. Modems are polled concurrently in the MM executor.
+"""
+import logging
+import re
+import threading
+
+import dbus
+
+from .dbus_loop import DBusLoop
+from .mm import MM, Modem
+
+logger = logging.getLogger('nitroc-ui')
+
+
+class ModemContext():
+    """
+    State of one modem
+    """
+    def __init__(self, modem: Modem, imei: str):
+        super().__init__()
+
+        self.modem = modem
+        self.imei = imei
+        self.section = f'modem/{imei}'
+        self.info = dict()
+
+        # Serializes poll, signal updates and reset of this modem
+        self.lock = modem.lock
+
+
+class ModemMonitor():
+    def __init__(self, model):
+        super().__init__()
+
+        self.model = model
+        self.lock = threading.Lock()
+        self.contexts: dict[str, ModemContext] = dict()     # IMEI -> context
+        self.primary: str | None = None
+        self.subscribed = False
+
+        # True if property changes are signaled, polling can be slow then
+        self.signals = DBusLoop.start()
+
+    def poll(self) -> None:
+        """
+        Read all properties of all modems and publish complete sections
+        """
+        # Run in MM executor, one task per modem so that the poll time doesn't
+        # grow with the number of modems
+        contexts = MM.submit(self._enumerate).result()
+        futures = [MM.submit(self._poll, ctx) for ctx in contexts]
+        for future in futures:
+            future.result()
+
+        if self.primary is None:
+            self.model.publish('modem', dict())
+
+    def _enumerate(self) -> list[ModemContext]:
+        # Modems without IMEI are still initializing, wait for the next poll
+        modems = {imei: m for m in MM.modems() if (imei := m.imei())}
+        with self.lock:
+            for imei, ctx in list(self.contexts.items()):
+                if modems.get(imei) is not ctx.modem:
+                    # Removed or re-enumerated with new object path
+                    logger.info(f'modem {imei} removed')
+                    del self.contexts[imei]
+                    if imei not in modems:
+                        self.model.remove(ctx.section)
+
+            for imei, m in modems.items():
+                if imei not in self.contexts:
+                    logger.info(f'modem {imei} found, id {m.id}')
+                    self.contexts[imei] = ModemContext(m, imei)
+
+            self.primary = next((imei for imei in modems if re.fullmatch(self.model.wwan_imei, imei)), None)
+            self.model.publish('modems', {'imeis': list(modems), 'primary': self.primary})
+
+            if modems and not self.subscribed:
+                m = next(iter(modems.values()))
+                self.subscribed = m.client.subscribe_properties(self._properties_changed)
+
+            return list(self.contexts.values())
+
+    def _poll(self, ctx: ModemContext) -> None:
+        with ctx.lock:
+            # One GetAll per interface, accessors use this snapshot
+            if ctx.modem.refresh():
+                ctx.info = self._info(ctx.modem, with_location=True)
+            else:
+                ctx.info = dict()
+
+            self.model.publish(ctx.section, ctx.info)
+            if ctx.imei == self.primary:
+                self.model.publish('modem', ctx.info)
+
+    def _properties_changed(self, interface, changed, invalidated, path=None):
+        # Runs in D-Bus main loop thread, exceptions must not escape into it
+        try:
+            self._apply_changes(str(path), str(interface), changed)
+        except dbus.DBusException as e:
+            logger.warning(f'cannot update modem state: {e}')
+        except Exception as e:
+            logger.warning(f'cannot handle modem property change: {e!r}')
+
+    def _apply_changes(self, path: str, interface: str, changed) -> None:
+        with self.lock:
+            contexts = list(self.contexts.values())
+
+        for ctx in contexts:
+            with ctx.lock:
+                if not ctx.modem.properties_changed(path, interface, changed):
+                    continue
+                info = self._info(ctx.modem, with_location=False)
+
+                # Location is a method call, it's only updated by poll()
+                if 'location' in ctx.info:
+                    info['location'] = ctx.info['location']
+
+                changes = {k: v for k, v in info.items() if ctx.info.get(k) != v}
+                removed = [k for k in ctx.info if k not in info]
+                if changes or removed:
+                    ctx.info = info
+                    self.model.update(ctx.section, changes, removed)
+                    if ctx.imei == self.primary:
+                        self.model.update('modem', changes, removed)
+            return
+
+    @staticmethod
+    def _info(m: Modem, with_location: bool) -> dict:
+        """
+        Build modem section from property snapshots of modem
+        """
+        info = dict()
+        info['modem-id'] = str(m.id)
+
+        info['vendor'] = m.vendor()
+        info['model'] = m.model()
+        info['revision'] = m.revision()
+        info['imei'] = m.imei()
+
+        state = m.state()
+        access_tech = m.access_tech()
+        access_tech2 = m.access_tech2()
+
+        info['state'] = state
+        info['access-tech'] = access_tech
+        if access_tech2:    # Optional 2nd access tech, i.e. lte and 5gnr
+            info['access-tech2'] = access_tech2
+
+        if with_location:
+            loc_info = m.location()
+            if loc_info is not None and loc_info['mcc']:
+                info['location'] = loc_info
+
+        sq = m.signal_quality()
+        info['signal-quality'] = sq
+
+        # FN990 reports LTE and 5G as 2nd technology
+        if access_tech == '5gnr' or access_tech2 == '5gnr':
+            sig = m.signal_5g()
+            if sig is not None:
+                # Only add if signal is available
+                info['signal-5g'] = sig
+
+        if access_tech == 'lte':
+            sig = m.signal_lte()
+            if sig is not None:
+                info['signal-lte'] = sig
+
+        if access_tech == 'umts':
+            sig = m.signal_umts()
+            info['signal-umts'] = sig
+
+        b = m.bearer()
+        if b:
+            info['bearer-id'] = str(b.id)
+            ut = b.uptime()
+            if ut:
+                info['bearer-uptime'] = ut
+            ip = b.ip()
+            if ip:
+                info['bearer-ip'] = ip
+
+        s = m.sim()
+        if s:
+            info['sim-id'] = str(s.id)
+
+            imsi = s.imsi()
+            info['sim-imsi'] = imsi
+            iccid = s.iccid()
+            info['sim-iccid'] = iccid
+
+        return info
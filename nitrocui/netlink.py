@@ -0,0 +1,268 @@
+"""
+Network interface monitor using rtnetlink
+
+Gets counters of all interfaces with one RTM_GETLINK dump per period and
+listens to link events (RTMGRP_LINK), so link up/down changes reach the
+model immediately. An hour of counter history is kept per interface to
+report current, 1 minute and 15 minute rates.
+"""
+import logging
+import os
+import select
+import socket
+import struct
+import threading
+import time
+
+from .counter_history import CounterHistory
+
+logger = logging.getLogger('nitroc-ui')
+
+
+# linux/netlink.h
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x01
+NLM_F_MULTI = 0x02
+NLM_F_DUMP = 0x300
+
+# linux/rtnetlink.h
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_GETLINK = 18
+RTMGRP_LINK = 0x1
+
+# linux/if_link.h
+IFLA_IFNAME = 3
+IFLA_OPERSTATE = 16
+IFLA_STATS64 = 23
+
+# linux/if.h
+IFF_UP = 0x1
+IFF_LOWER_UP = 0x10000
+
+OPERSTATES = ['unknown', 'notpresent', 'down', 'lowerlayerdown', 'testing', 'dormant', 'up']
+
+NLMSG_HDR = struct.Struct('=IHHII')         # len, type, flags, seq, pid
+IFINFOMSG = struct.Struct('=BxHiII')        # family, type, index, flags, change
+RTATTR_HDR = struct.Struct('=HH')           # len, type
+STATS64 = struct.Struct('=4Q')              # rx_packets, tx_packets, rx_bytes, tx_bytes
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def build_getlink(seq: int) -> bytes:
+    """
+    Build RTM_GETLINK dump request for all interfaces
+    """
+    length = NLMSG_HDR.size + IFINFOMSG.size
+    return (NLMSG_HDR.pack(length, RTM_GETLINK, NLM_F_REQUEST | NLM_F_DUMP, seq, 0) +
+            IFINFOMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0))
+
+
+def parse_messages(data: bytes) -> list[tuple[int, int, int, bytes]]:
+    """
+    Split netlink data into messages
+
+    :return: List of (type, flags, seq, payload)
+    """
+    res = []
+    offset = 0
+    while offset + NLMSG_HDR.size <= len(data):
+        length, msg_type, flags, seq, _ = NLMSG_HDR.unpack_from(data, offset)
+        if length < NLMSG_HDR.size or offset + length > len(data):
+            break
+        res.append((msg_type, flags, seq, data[offset + NLMSG_HDR.size:offset + length]))
+        offset += _align(length)
+    return res
+
+
+def parse_link(payload: bytes) -> dict:
+    """
+    Decode RTM_NEWLINK/RTM_DELLINK payload
+
+    :return: Dictionary with index, name, flags, operstate and counters
+             (rx bytes, tx bytes, rx packets, tx packets), counters are
+             None if not included.
+    """
+    _, _, index, flags, _ = IFINFOMSG.unpack_from(payload, 0)
+    link = {
+        'index': index,
+        'name': None,
+        'flags': flags,
+        'operstate': 'unknown',
+        'counters': None,
+    }
+
+    offset = IFINFOMSG.size
+    while offset + RTATTR_HDR.size <= len(payload):
+        length, attr_type = RTATTR_HDR.unpack_from(payload, offset)
+        if length < RTATTR_HDR.size:
+            break
+        value = payload[offset + RTATTR_HDR.size:offset + length]
+        if attr_type == IFLA_IFNAME:
+            link['name'] = value.rstrip(b'\0').decode()
+        elif attr_type == IFLA_OPERSTATE:
+            state = value[0]
+            link['operstate'] = OPERSTATES[state] if state < len(OPERSTATES) else 'unknown'
+        elif attr_type == IFLA_STATS64 and len(value) >= STATS64.size:
+            rx_packets, tx_packets, rx_bytes, tx_bytes = STATS64.unpack_from(value, 0)
+            link['counters'] = (rx_bytes, tx_bytes, rx_packets, tx_packets)
+        offset += _align(length)
+
+    return link
+
+
+class LinkMonitor(threading.Thread):
+    """
+    Publishes counters, rates and link state of selected interfaces
+    """
+    # Period of counter dumps in seconds
+    PERIOD = 1.0
+
+    # Number of counter samples kept per interface, one hour at PERIOD
+    HISTORY_SIZE = 3600
+
+    # Windows for rate computation in seconds
+    RATE_WINDOWS = {
+        'current': 5.0,
+        '1min': 60.0,
+        '15min': 900.0,
+    }
+
+    # Window for rate percentiles in seconds
+    PERCENTILE_WINDOW = 900.0
+
+    COUNTERS = ['rx-bytes', 'tx-bytes', 'rx-packets', 'tx-packets']
+
+    def __init__(self, model, sections: dict[str, str]):
+        """
+        :param model: Model to publish to.
+        :param sections: Dictionary interface name -> model section, e.g. {'wwan0': 'net-wwan0'}
+        """
+        super().__init__()
+
+        self.model = model
+        self.sections = sections
+        self.seq = 0
+        self.links = {name: self._absent() for name in sections}
+        self.history = {name: CounterHistory(self.COUNTERS, self.HISTORY_SIZE) for name in sections}
+
+        # Separate sockets, so that events don't mix with dump responses
+        self.events = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        self.events.bind((0, RTMGRP_LINK))
+        self.requests = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        self.requests.bind((0, 0))
+
+        self.daemon = True
+        self.name = 'link-monitor'
+
+    def run(self):
+        logger.info(f'monitoring interfaces {list(self.sections)}')
+
+        next_dump = time.monotonic()
+        while True:
+            timeout = max(0.0, next_dump - time.monotonic())
+            readable, _, _ = select.select([self.events], [], [], timeout)
+            try:
+                if readable:
+                    self._handle_events()
+
+                now = time.monotonic()
+                if now >= next_dump:
+                    self._dump(now)
+                    next_dump += self.PERIOD
+                    if next_dump < now:
+                        next_dump = now + self.PERIOD
+            except OSError as e:
+                logger.warning(f'netlink error {e}')
+                time.sleep(self.PERIOD)
+
+    def _handle_events(self) -> None:
+        data = self.events.recv(65536)
+        for msg_type, _, _, payload in parse_messages(data):
+            if msg_type not in (RTM_NEWLINK, RTM_DELLINK):
+                continue
+            link = parse_link(payload)
+            name = link['name']
+            if name not in self.sections:
+                continue
+
+            old_state = self.links[name]['state']
+            if msg_type == RTM_DELLINK:
+                self.links[name] = self._absent()
+                self.history[name].clear()
+            else:
+                # Only state, counters are sampled by the periodic dump at regular intervals
+                link['counters'] = None
+                self._update(name, link, time.monotonic())
+
+            if self.links[name]['state'] != old_state:
+                logger.info(f'link {name} {self.links[name]["state"]}')
+                self._publish(name)
+
+    def _dump(self, now: float) -> None:
+        self.seq += 1
+        self.requests.send(build_getlink(self.seq))
+
+        seen = set()
+        done = False
+        while not done:
+            data = self.requests.recv(65536)
+            for msg_type, _, seq, payload in parse_messages(data):
+                if seq != self.seq:
+                    continue
+                if msg_type == NLMSG_DONE:
+                    done = True
+                elif msg_type == NLMSG_ERROR:
+                    errno, = struct.unpack_from('=i', payload, 0)
+                    raise OSError(-errno, os.strerror(-errno))
+                elif msg_type == RTM_NEWLINK:
+                    link = parse_link(payload)
+                    if link['name'] in self.sections:
+                        self._update(link['name'], link, now)
+                        seen.add(link['name'])
+
+        for name in self.sections:
+            if name not in seen and self.links[name]['state'] != 'notpresent':
+                self.links[name] = self._absent()
+                self.history[name].clear()
+            self._publish(name)
+
+    def _update(self, name: str, link: dict, now: float) -> None:
+        info = dict(self.links[name])
+        info['state'] = link['operstate']
+        info['up'] = bool(link['flags'] & IFF_UP)
+        info['carrier'] = bool(link['flags'] & IFF_LOWER_UP)
+
+        if (counters := link['counters']) is not None:
+            rx_bytes, tx_bytes, rx_packets, tx_packets = counters
+            info['bytes'] = (rx_bytes, tx_bytes)
+            info['packets'] = (rx_packets, tx_packets)
+
+            history = self.history[name]
+            history.add(now, counters)
+            info['rate'] = {key: history.rates(window) for key, window in self.RATE_WINDOWS.items()}
+            info['rate-percentiles'] = {
+                'rx-bytes': history.percentiles('rx-bytes', self.PERCENTILE_WINDOW),
+                'tx-bytes': history.percentiles('tx-bytes', self.PERCENTILE_WINDOW),
+            }
+
+        self.links[name] = info
+
+    def _publish(self, name: str) -> None:
+        self.model.publish(self.sections[name], self.links[name])
+
+    @staticmethod
+    def _absent() -> dict:
+        return {
+            'state': 'notpresent',
+            'up': False,
+            'carrier': False,
+            'bytes': (None, None),
+            'packets': (None, None),
+            'rate': None,
+            'rate-percentiles': None,
+        }
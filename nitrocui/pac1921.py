@@ -1,15 +1,40 @@
 from time import sleep
 
 
-# TODO: Remember last setting, don't change config, avoid sleep if no change
-
 class PAC1921():
+    """
+    PAC1921 power monitor
+
+    The chip is operated in free-run mode. Once a measurement type (voltage,
+    current or power) is selected, it continuously integrates and results
+    can be read without reconfiguration. The selected type is remembered in
+    last_cfg, so registers are only rewritten when the type changes.
+
+    To sample many chips efficiently, call select() on all of them, wait
+    SETTLE_TIME once if any of them was reconfigured, then read result().
+    """
     TEMP_REG = 0x00
 
-    def __init__(self, i2c, addr, shunt_resistance_in_ohms) -> None:
+    # Worst case integration period with 4 samples is 6.79 ms
+    # TODO: why do we see 0 values with 5 ms sleep?
+    SETTLE_TIME = 0.01
+
+    # Measurement type -> (MXSL free-run mode, result register)
+    MODES = {
+        'voltage': (0b10, 0x10),
+        'current': (0b01, 0x12),
+        'power': (0b11, 0x1D),
+    }
+
+    # Number of samples -> SMPL code of integration register
+    SAMPLES = {1: 0b0000, 2: 0b0001, 4: 0b0010, 8: 0b0011, 16: 0b0100, 32: 0b0101, 64: 0b0110, 128: 0b0111}
+
+    def __init__(self, i2c, addr, shunt_resistance_in_ohms, samples=4) -> None:
+        assert samples in PAC1921.SAMPLES
         self.i2c = i2c
         self.addr = addr
         self.rshunt = shunt_resistance_in_ohms
+        self.smpl = PAC1921.SAMPLES[samples]
 
         # Shadow registers
 
@@ -47,6 +72,8 @@ class PAC1921():
     #     print(f'revision    : 0x{revision:02X}')
 
     def start(self) -> None:
+        self.last_cfg = ''
+
         # Set chip in read state to change configuration
         self.__setreg8(0x01, self.integ_cfg_val & 0x01)
 
@@ -66,73 +93,65 @@ class PAC1921():
     #     print(f'ctrl        : 0x{ctrl:02X}')
 
     def voltage(self) -> float:
-        # control byte -> select data type Vbus
-        sel_vbus = 0b10
-        self.__setreg8(0x02, (sel_vbus << 6) | self.ctrl_val)
-
-        # Integration control -> 4 samples
-        smpl_4 = 0b0010
-        self.__setreg8(0x01, (smpl_4 << 4) | self.integ_cfg_val)
-
-        # Worst case integration period = 3.43 ms
-        # TODO: why do we see 0 values with 5 ms sleep?
-        sleep(0.01)
-
-        volt_raw = self.__getreg16(0x10) >> 6
-        volt = volt_raw * 32.0 / 1024
-
-        self.last_cfg = 'voltage'
-
-        return volt
+        return self._measure('voltage')
 
     def current(self) -> float:
-        # control byte -> select data type Vsense (aka current)
-        sel_vsense = 0b01
-        self.__setreg8(0x02, (sel_vsense << 6) | self.ctrl_val)
-
-        # Integration control -> 4 samples
-        smpl_4 = 0b0010
-        self.__setreg8(0x01, (smpl_4 << 4) | self.integ_cfg_val)
-
-        # Worst case integration period = 3.43 ms
-        # TODO: why do we see 0 values with 5 ms sleep?
-        sleep(0.01)
-
-        vsense_raw = self.__getreg16(0x12) >> 6
-        current = vsense_raw * (0.1 / self.rshunt) / 1024
-
-        self.last_cfg = 'current'
-
-        return current
-
-    def power(self):
-        if self.last_cfg != 'power':
-            # control byte -> select data type Vpower
-            sel_vpower = 0b11
-            self.__setreg8(0x02, (sel_vpower << 6) | self.ctrl_val)
-
-            # Integration control -> 4 samples
-            smpl_4 = 0b0010
-            self.__setreg8(0x01, (smpl_4 << 4) | self.integ_cfg_val)
-
-            # Worst case integration period = 6.79 ms
-            sleep(0.01)
-
-        vpower_raw = self.__getreg16(0x1D) >> 6
-        vsense = (vpower_raw * 32 ) * (0.1 / self.rshunt) / 1024
-
-        self.last_cfg = 'power'
-
-        return vsense
+        return self._measure('current')
+
+    def power(self) -> float:
+        return self._measure('power')
+
+    def select(self, kind: str) -> bool:
+        """
+        Configure measurement type, unless already active
+
+        :param kind: 'voltage', 'current' or 'power'
+        :return: True if chip was reconfigured and needs SETTLE_TIME before
+                 a valid result is available.
+        """
+        if self.last_cfg == kind:
+            return False
+
+        mxsl, _ = PAC1921.MODES[kind]
+        try:
+            # control byte -> select data type and free-run mode
+            self.__setreg8(0x02, (mxsl << 6) | self.ctrl_val)
+
+            # Integration control -> number of samples
+            self.__setreg8(0x01, (self.smpl << 4) | self.integ_cfg_val)
+        except OSError:
+            self.last_cfg = ''
+            raise
+
+        self.last_cfg = kind
+        return True
+
+    def result(self, kind: str) -> float:
+        """
+        Read result of current measurement, select() must have been called before
+        """
+        assert self.last_cfg == kind
+        _, reg = PAC1921.MODES[kind]
+        raw = self.__getreg16(reg) >> 6
+
+        if kind == 'voltage':
+            return raw * 32.0 / 1024
+        elif kind == 'current':
+            return raw * (0.1 / self.rshunt) / 1024
+        else:
+            return (raw * 32) * (0.1 / self.rshunt) / 1024
+
+    def _measure(self, kind: str) -> float:
+        if self.select(kind):
+            sleep(PAC1921.SETTLE_TIME)
+        return self.result(kind)
 
     def __getreg16(self, reg: int) -> int:
-        self.i2c.set_addr(self.addr)
-        res = self.i2c.read_reg8(reg, 2)
+        res = self.i2c.read_reg(self.addr, reg, 2)
         # print(res[0], res[1])
         value = (res[0] << 8) | (res[1] << 0)
         return value
 
     def __setreg8(self, reg: int, value: int) -> None:
         # print(f'Set reg {reg:02x} to {value:02x}')
-        self.i2c.set_addr(self.addr)
-        self.i2c.write_reg8(reg, value)
+        self.i2c.write_reg(self.addr, reg, value)
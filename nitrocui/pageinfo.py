@@ -6,7 +6,7 @@ import tornado.web
 
 from ._version import __version__ as version
 from .data_model import Model
-from .tools import secs_to_hhmm, format_size, format_frequency
+from .tools import secs_to_hhmm, format_size, format_frequency, format_uptime
 
 logger = logging.getLogger('nitroc-ui')
 
@@ -77,21 +77,35 @@ class MainHandler(tornado.web.RequestHandler):
 
             tes.append(TE('Date', md.get('N/A', 'sys-datetime', 'date')))
             tes.append(TE('Start Reason', md.get('N/A', 'sys-boot', 'reason')))
-            tes.append(TE('Uptime', md.get('N/A', 'sys-datetime', 'uptime')))
+            uptime = md.get(None, 'sys-datetime', 'uptime')
+            tes.append(TE('Uptime', format_uptime(uptime) if uptime is not None else 'N/A'))
 
             total, free = md.get((0, 0), 'sys-misc', 'mem')
             total = format_size(int(total * 1024))
             free = format_size(int(free * 1024))
-            tes.append(TE('Memory', f'Total: {total}, Free: {free}'))
+            text = f'Total: {total}, Free: {free}'
+            if (available := md.get(None, 'sys-misc', 'mem_available')) is not None:
+                text += f', Available: {format_size(int(available * 1024))}'
+            tes.append(TE('Memory', text))
 
             wear_slc, wear_mlc = md.get((0, 0), 'sys-disc', 'wear')
-            sysroot_info = md.get('N/A', 'sys-disc', 'part_sysroot')
-            tes.append(TE('Disc', f'eMMC Wear Level: SLC: {wear_slc} %, MLC: {wear_mlc} %<br>'
-                                  f'Root: {sysroot_info}'))
+            emmc = md.get(None, 'sys-disc', 'emmc') or {}
+            pre_eol = {1: 'normal', 2: 'warning', 3: 'urgent'}.get(emmc.get('pre-eol'), 'N/A')
+            total, used, free = md.get((0, 0, 0), 'sys-disc', 'part_sysroot')
+            tes.append(TE('Disc', f'eMMC Wear Level: SLC: {wear_slc} %, MLC: {wear_mlc} %, '
+                                  f'Reserved Blocks: {pre_eol}<br>'
+                                  f'Root: {format_size(used)} used of {format_size(total)}, '
+                                  f'{format_size(free)} free'))
 
             a, b, c = md.get((0, 0, 0), 'sys-misc', 'load')
             tes.append(TE('Load', f'{a}, {b}, {c}'))
 
+            # First entry is overall utilization, followed by cores
+            util = md.get([], 'sys-misc', 'cpu_util')
+            if util:
+                cores = ', '.join(f'{u:.0f} %' for u in util[1:])
+                tes.append(TE('CPU Utilization', f'{util[0]:.0f} % ({cores})'))
+
             temp_str = ""
             for i in range(1, 5):
                 freq = md.get(0, 'sys-misc', f'cpu{i}_freq')
@@ -225,24 +239,34 @@ class MainHandler(tornado.web.RequestHandler):
             tes.append(TE('internet', inet_access))
 
             rx, tx = md.get((None, None), 'net-wwan0', 'bytes')
-            if rx and tx:
+            if rx is not None and tx is not None:
                 rx = format_size(int(rx))
                 tx = format_size(int(tx))
                 tes.append(TE('wwan0', f'Rx: {rx}, Tx: {tx}'))
 
             rx, tx = md.get((None, None), 'net-wlan0', 'bytes')
-            if rx and tx:
+            if rx is not None and tx is not None:
                 rx = format_size(int(rx))
                 tx = format_size(int(tx))
                 tes.append(TE('wlan0', f'Rx: {rx}, Tx: {tx}'))
 
-            # Modem Information
-            if (modem_id := md.get(-1, 'modem', 'modem-id')) != -1:
-                mi = m.get_section('modem')
+            # Modem Information, primary modem first
+            primary = md.get(None, 'modems', 'primary')
+            imeis = md.get((), 'modems', 'imeis')
+            imeis = sorted(imeis, key=lambda imei: imei != primary)
+            sections = [md.section(f'modem/{imei}') for imei in imeis]
+            sections = [mi for mi in sections if mi is not None and mi.exists('modem-id')]
+            if not sections and md.exists('modem', 'modem-id'):
+                sections = [md.section('modem')]
+
+            for mi in sections:
                 assert mi
+                modem_id = mi.get('-', 'modem-id')
+                imei = mi.get('-', 'imei')
+                is_primary = imei == primary or len(sections) == 1
 
                 tes.append(TE('', ''))
-                tes.append(TH('Mobile'))
+                tes.append(TH('Mobile' if is_primary else f'Mobile {imei}'))
 
                 tes.append(TE('Modem Id', modem_id))
 
@@ -250,12 +274,12 @@ class MainHandler(tornado.web.RequestHandler):
                 model = mi.get('-', 'model')
                 tes.append(TE('Type', f'{vendor} {model}'))
 
-                imei = md.get('-', 'modem', 'imei')
                 tes.append(TE('IMEI', imei))
-                imei_info = {'imei': imei}
-                data.update(imei_info)
+                if is_primary:
+                    imei_info = {'imei': imei}
+                    data.update(imei_info)
 
-                state = md.get('-', 'modem', 'state')
+                state = mi.get('-', 'state')
 
                 access_tech = mi.get('n/a', 'access-tech')
                 if (access_tech2 := mi.get('', 'access-tech2')) != '':
@@ -273,7 +297,8 @@ class MainHandler(tornado.web.RequestHandler):
                                 ('cid', 'CID', '')],
                                 loc_info)
                     tes.append(TE('Cell', text))
-                    data.update(loc_info)
+                    if is_primary:
+                        data.update(loc_info)
 
                 # Display quality as reported by MM
                 sq = mi.get(0, 'signal-quality')
@@ -327,7 +352,7 @@ class MainHandler(tornado.web.RequestHandler):
                             val = f'{uth}:{utm:02} hh:mm'
 
                             max_ut = md.get(None, 'watermark', 'bearer-uptime')
-                            if max_ut is not None:
+                            if is_primary and max_ut is not None:
                                 max_uth, max_utm = secs_to_hhmm(max_ut)
                                 val += f' (max.: {max_uth}:{max_utm:02} hh:mm)'
 
@@ -336,15 +361,25 @@ class MainHandler(tornado.web.RequestHandler):
                             ip = mi.get('-', 'bearer-ip')
                             tes.append(TE('IP', ip))
 
-                if md.exists('link', 'link'):
-                    delay_in_ms = md.get(0, 'link', 'link') * 1000.0
-                    tes.append(TE('Ping', f'{delay_in_ms:.0f} ms'))
+                if is_primary and md.exists('link', 'delay'):
+                    delay_in_ms = md.get(0, 'link', 'delay') * 1000.0
+                    text = f'{delay_in_ms:.0f} ms'
+
+                    # Statistics of last minute, first target
+                    targets = md.get({}, 'link', 'targets')
+                    stats = next(iter(targets.values()), {}).get('1min')
+                    if stats and stats['avg'] is not None:
+                        text += (f' (avg: {stats["avg"] * 1000.0:.0f} ms, '
+                                 f'jitter: {stats["jitter"] * 1000.0:.0f} ms, '
+                                 f'loss: {stats["loss"]:.0f}%)')
+                    tes.append(TE('Ping', text))
 
                 if (sim_id := mi.get(-1, 'sim-id')) != -1:
                     tes.append(TE('SIM Id', sim_id))
                     tes.append(TE('IMSI', mi.get('-', 'sim-imsi')))
                     tes.append(TE('ICCID', mi.get('-', 'sim-iccid')))
-            else:
+
+            if not sections:
                 tes.append(TE('', ''))
                 tes.append(TE('Modem Id', 'No Modem'))
 
@@ -0,0 +1,127 @@
+"""
+High-rate power telemetry
+
+Samples the PAC1921 power sensors at a configurable rate (typ. 10..50 Hz)
+into ring buffers and publishes min/max/mean/energy aggregates once per
+window. Short spikes are visible in the aggregates without having to
+upload each raw sample.
+"""
+import logging
+import math
+import threading
+import time
+
+from .ring_buffer import RingBuffer
+
+logger = logging.getLogger('nitroc-ui')
+
+
+def aggregate(powers: RingBuffer, dts: RingBuffer) -> dict[str, float | None]:
+    """
+    Compute aggregates of one window
+
+    Failed samples are stored as NaN and are ignored. Energy is computed
+    by holding each sample for the time since the previous sample.
+
+    :param powers: Power samples in W.
+    :param dts: Time in s since previous sample, same length as powers.
+    :return: Dictionary with min, max, mean in W and energy in Wh.
+    """
+    pmin = math.inf
+    pmax = -math.inf
+    psum = 0.0
+    energy = 0.0
+    count = 0
+    for p, dt in zip(powers.values(), dts.values()):
+        if math.isnan(p):
+            continue
+        pmin = min(pmin, p)
+        pmax = max(pmax, p)
+        psum += p
+        energy += p * dt
+        count += 1
+
+    if count == 0:
+        return {'min': None, 'max': None, 'mean': None, 'energy': None}
+
+    return {
+        'min': pmin,
+        'max': pmax,
+        'mean': psum / count,
+        'energy': energy / 3600.0,
+    }
+
+
+class PowerSampler(threading.Thread):
+    """
+    Samples power sensors in own thread and publishes 'sys-power'
+    """
+    CHANNELS = ['mb', 'eth', 'nmcf1', 'nmcf2', 'nmcf3', 'nmcf4']
+
+    def __init__(self, model, sip, rate: float, window: float):
+        """
+        :param model: Model to publish aggregates to.
+        :param sip: SysInfoPower instance, shared with the 1 Hz poll.
+        :param rate: Sample rate in Hz.
+        :param window: Aggregation window in seconds.
+        """
+        super().__init__()
+
+        assert rate > 0.0 and window > 0.0
+        self.model = model
+        self.sip = sip
+        self.rate = rate
+        self.window = window
+        self.overruns = 0
+
+        # Preallocate for one window plus some slack for timing variation
+        size = int(rate * window * 1.25) + 1
+        self.powers = {name: RingBuffer(size) for name in PowerSampler.CHANNELS}
+        self.dts = RingBuffer(size)
+
+        self.daemon = True
+        self.name = 'power-sampler'
+
+    def run(self):
+        logger.info(f'sampling power at {self.rate} Hz, window {self.window} s')
+
+        period = 1.0 / self.rate
+        next_sample = time.monotonic()
+        window_end = next_sample + self.window
+        last = None
+        while True:
+            now = time.monotonic()
+            values = self.sip.measure()
+            for name, buf in self.powers.items():
+                value = values.get(name)
+                buf.append(value if value is not None else math.nan)
+            self.dts.append(now - last if last is not None else 0.0)
+            last = now
+
+            if now >= window_end:
+                self._publish()
+                window_end += self.window
+                if window_end <= now:
+                    window_end = now + self.window
+
+            next_sample += period
+            delay = next_sample - time.monotonic()
+            if delay > 0.0:
+                time.sleep(delay)
+            else:
+                # Sampling took too long, skip missed slots
+                self.overruns += 1
+                next_sample = time.monotonic()
+
+    def _publish(self):
+        info = dict()
+        info['rate'] = self.rate
+        info['window'] = self.window
+        info['samples'] = len(self.dts)
+        info['overruns'] = self.overruns
+        for name, buf in self.powers.items():
+            info[name] = aggregate(buf, self.dts)
+            buf.clear()
+        self.dts.clear()
+
+        self.model.publish('sys-power', info)
@@ -0,0 +1,202 @@
+"""
+System metrics from /proc
+
+Reads /proc/meminfo, /proc/loadavg, /proc/stat, /proc/uptime and
+/proc/net/dev once per poll. Files are kept open and read into
+preallocated buffers, only the required fields are parsed.
+"""
+import logging
+import os
+
+from .sysinfo_base import SysInfoBase
+
+logger = logging.getLogger('nitroc-ui')
+
+
+MEMINFO_KEYS = (b'MemTotal:', b'MemFree:', b'MemAvailable:')
+
+
+def parse_meminfo(data: bytes, keys=MEMINFO_KEYS) -> dict[str, int]:
+    """
+    Get selected values of /proc/meminfo
+
+    :return: Dictionary key (without colon) -> value in kB.
+    """
+    res = dict()
+    for line in data.splitlines():
+        for key in keys:
+            if line.startswith(key):
+                res[key[:-1].decode()] = int(line.split()[1])
+                break
+        if len(res) == len(keys):
+            break
+    return res
+
+
+def parse_loadavg(data: bytes) -> tuple[float, float, float]:
+    fields = data.split(maxsplit=3)
+    return float(fields[0]), float(fields[1]), float(fields[2])
+
+
+def parse_uptime(data: bytes) -> float:
+    return float(data.split(maxsplit=1)[0])
+
+
+def parse_stat(data: bytes) -> list[tuple[int, int]]:
+    """
+    Get CPU times of /proc/stat
+
+    :return: List of (busy, total) jiffies, first entry is the sum of all
+             CPUs, followed by one entry per core.
+    """
+    res = []
+    for line in data.splitlines():
+        if not line.startswith(b'cpu'):
+            break
+        # cpu user nice system idle iowait irq softirq steal guest guest_nice
+        # guest times are already included in user/nice
+        values = [int(v) for v in line.split()[1:9]]
+        idle = values[3] + values[4]
+        total = sum(values)
+        res.append((total - idle, total))
+    return res
+
+
+def cpu_util(prev: list[tuple[int, int]], cur: list[tuple[int, int]]) -> list[float]:
+    """
+    Compute CPU utilization in percent between two parse_stat() results
+    """
+    res = []
+    for (busy0, total0), (busy1, total1) in zip(prev, cur):
+        delta = total1 - total0
+        res.append(round((busy1 - busy0) * 100.0 / delta, 1) if delta > 0 else 0.0)
+    return res
+
+
+def parse_net_dev(data: bytes) -> dict[str, tuple[int, int, int, int]]:
+    """
+    Get interface counters of /proc/net/dev
+
+    :return: Dictionary interface -> (rx bytes, rx packets, tx bytes, tx packets)
+    """
+    res = dict()
+    for line in data.splitlines()[2:]:
+        name, _, counters = line.partition(b':')
+        fields = counters.split()
+        if len(fields) >= 10:
+            res[name.strip().decode()] = (int(fields[0]), int(fields[1]), int(fields[8]), int(fields[9]))
+    return res
+
+
+class ProcFile():
+    """
+    A /proc file, kept open and read into a preallocated buffer
+    """
+    def __init__(self, path: str, size: int = 4096):
+        super().__init__()
+
+        self.path = path
+        self.buf = bytearray(size)
+        self.fd = None
+
+    def read(self) -> bytes | None:
+        """
+        Read whole file
+
+        seq_files (e.g. /proc/net/dev) may return less than requested
+        before the end of file, so reads continue until 0 is returned.
+
+        :return: Content of file, None if it can't be read.
+        """
+        try:
+            if self.fd is None:
+                self.fd = os.open(self.path, os.O_RDONLY)
+            offset = 0
+            while True:
+                if offset == len(self.buf):
+                    # File grew, e.g. more interfaces, continue with larger buffer
+                    buf = bytearray(len(self.buf) * 2)
+                    buf[:offset] = memoryview(self.buf)[:offset]
+                    self.buf = buf
+                n = os.preadv(self.fd, [memoryview(self.buf)[offset:]], offset)
+                if n == 0:
+                    return bytes(memoryview(self.buf)[:offset])
+                offset += n
+        except OSError as e:
+            logger.info(f'cannot read {self.path}: {e}')
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+            return None
+
+
+class ProcStats(SysInfoBase):
+    """
+    System Info implementation using /proc
+    """
+    def __init__(self, root: str = '/proc'):
+        super().__init__()
+
+        self.files = {
+            'meminfo': ProcFile(f'{root}/meminfo'),
+            'loadavg': ProcFile(f'{root}/loadavg', 128),
+            'stat': ProcFile(f'{root}/stat'),
+            'uptime': ProcFile(f'{root}/uptime', 128),
+            'net': ProcFile(f'{root}/net/dev'),
+        }
+
+        self.mem = dict()
+        self.loadavg = None
+        self.cpu = []
+        self.cpu_times = None
+        self.uptime_secs = None
+        self.net = dict()
+
+    def poll(self):
+        # Replace each value at once, readers may run in another thread
+        try:
+            if (data := self.files['meminfo'].read()) is not None:
+                self.mem = parse_meminfo(data)
+
+            if (data := self.files['loadavg'].read()) is not None:
+                self.loadavg = parse_loadavg(data)
+
+            if (data := self.files['stat'].read()) is not None:
+                times = parse_stat(data)
+                if self.cpu_times is not None:
+                    self.cpu = cpu_util(self.cpu_times, times)
+                self.cpu_times = times
+
+            if (data := self.files['uptime'].read()) is not None:
+                self.uptime_secs = parse_uptime(data)
+
+            if (data := self.files['net'].read()) is not None:
+                self.net = parse_net_dev(data)
+        except (ValueError, IndexError) as e:
+            logger.warning(f'cannot parse proc data: {e}')
+
+    def meminfo(self) -> tuple[int, int]:
+        return self.mem.get('MemTotal', 0), self.mem.get('MemFree', 0)
+
+    def mem_available(self) -> int | None:
+        return self.mem.get('MemAvailable')
+
+    def load(self) -> tuple[float, float, float]:
+        return self.loadavg or (0.0, 0.0, 0.0)
+
+    def cpu_util(self) -> list[float]:
+        """
+        Get CPU utilization in percent since last poll
+
+        :return: Total utilization followed by one value per core, empty
+                 until polled twice.
+        """
+        return self.cpu
+
+    def uptime(self) -> float | None:
+        return self.uptime_secs
+
+    def net_bytes(self, name: str) -> tuple[int | None, int | None]:
+        if (counters := self.net.get(name)) is not None:
+            return counters[0], counters[2]
+        return None, None
@@ -5,7 +5,9 @@ Display speed, gnss fix & esf status and mobile link information
 using a websocket
 """
 import logging
+import time
 
+import tornado.ioloop
 import tornado.web
 import tornado.websocket
 
@@ -30,11 +32,28 @@ class RealtimeHandler(tornado.web.RequestHandler):
 
 
 class RealtimeWebSocket(tornado.websocket.WebSocketHandler):
+    # Heartbeat period, used when no data changes are reported
+    TIMER_PERIOD_MS = 900
+
+    # Collect changes reported within this time into a single update
+    COALESCE_DELAY = 0.05
+
+    # Model sections (and keys) that trigger an update
+    SUBSCRIPTIONS = [
+        ('gnss-pos', None),
+        ('link', ['delay']),
+        ('net-wwan0', ['bytes']),
+        ('modem', ['signal-quality', 'access-tech', 'access-tech2']),
+        ('modems', None),
+    ]
+
     instance = None
     connections = set()
     counter = 0
     timer_fn = None
     esf_status = None
+    update_pending = False
+    last_update = 0.0
 
     def __init__(self, application, request, **kwargs):
         logger.info(f'new SimpleWebSocket {self}')
@@ -44,8 +63,15 @@ class RealtimeWebSocket(tornado.websocket.WebSocketHandler):
             RealtimeWebSocket.instance = self
             RealtimeWebSocket.counter = 0
 
+            m = Model.instance
+            assert m
+            loop = tornado.ioloop.IOLoop.current()
+            for origin, keys in RealtimeWebSocket.SUBSCRIPTIONS:
+                m.subscribe_loop(origin, loop, RealtimeWebSocket.on_change, keys)
+
             logger.info('starting websocket timer')
-            RealtimeWebSocket.timer_fn = tornado.ioloop.PeriodicCallback(RealtimeWebSocket.timer, 900)
+            RealtimeWebSocket.timer_fn = tornado.ioloop.PeriodicCallback(RealtimeWebSocket.timer,
+                                                                         RealtimeWebSocket.TIMER_PERIOD_MS)
             RealtimeWebSocket.timer_fn.start()
 
     def open(self):
@@ -56,15 +82,41 @@ class RealtimeWebSocket(tornado.websocket.WebSocketHandler):
         logger.info('closing connection')
         RealtimeWebSocket.connections.remove(self)
 
+    @staticmethod
+    def on_change(_event):
+        # Runs in IOLoop. Schedule one update for a burst of changes
+        if RealtimeWebSocket.update_pending or not RealtimeWebSocket.connections:
+            return
+
+        RealtimeWebSocket.update_pending = True
+        loop = tornado.ioloop.IOLoop.current()
+        loop.call_later(RealtimeWebSocket.COALESCE_DELAY, RealtimeWebSocket.update)
+
     @staticmethod
     def timer():
+        # Heartbeat, only required if no change was reported for a while
+        elapsed = time.monotonic() - RealtimeWebSocket.last_update
+        if elapsed >= RealtimeWebSocket.TIMER_PERIOD_MS / 1000.0:
+            RealtimeWebSocket.update()
+
+    @staticmethod
+    def update():
+        RealtimeWebSocket.update_pending = False
+        RealtimeWebSocket.last_update = time.monotonic()
+
         m = Model.instance
         assert m
         md = m.get_all()
 
         rx, tx = md.get((0, 0), 'net-wwan0', 'bytes')
-        rx = format_size(int(rx))
-        tx = format_size(int(tx))
+        rx = format_size(rx) if rx is not None else '-'
+        tx = format_size(tx) if tx is not None else '-'
+        rate = md.get(None, 'net-wwan0', 'rate', 'current')
+        if rate:
+            rx_rate = f'{format_size(int(rate["rx-bytes"]))}/s'
+            tx_rate = f'{format_size(int(rate["tx-bytes"]))}/s'
+        else:
+            rx_rate = tx_rate = '-'
         delay_in_ms = md.get(0.0, 'link', 'delay') * 1000.0
         sq = md.get(0, 'modem', 'signal-quality')
         rat = md.get('n/a', 'modem', 'access-tech')
@@ -73,11 +125,28 @@ class RealtimeWebSocket(tornado.websocket.WebSocketHandler):
         wwan0 = {
             'rx': f'{rx}',
             'tx': f'{tx}',
+            'rx_rate': rx_rate,
+            'tx_rate': tx_rate,
             'latency': str(delay_in_ms),
             'signal': str(sq),
             'rat': rat
         }
 
+        # Additional modems, primary modem is reported as wwan0
+        modems = []
+        primary = md.get(None, 'modems', 'primary')
+        for imei in md.get((), 'modems', 'imeis'):
+            if imei != primary:
+                section = f'modem/{imei}'
+                sq = md.get(0, section, 'signal-quality')
+                rat = md.get('n/a', section, 'access-tech')
+                rat2 = md.get('', section, 'access-tech2')
+                modems.append({
+                    'imei': imei,
+                    'signal': str(sq),
+                    'rat': f'{rat} {rat2}'.strip()
+                })
+
         default = {'fix': '-', 'lon': 0.0, 'lat': 0.0, 'speed': 0.0, 'pdop': 99.99}
         pos = md.get(default, 'gnss-pos')
 
@@ -86,6 +155,7 @@ class RealtimeWebSocket(tornado.websocket.WebSocketHandler):
             'time': RealtimeWebSocket.counter,
             'pos': pos,
             'wwan0': wwan0,
+            'modems': modems,
         }
         [client.write_message(info) for client in RealtimeWebSocket.connections]
 
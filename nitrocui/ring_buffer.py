@@ -0,0 +1,65 @@
+from array import array
+
+
+class RingBuffer():
+    """
+    Fixed size ring buffer for numeric values
+
+    - Storage is a preallocated array, no per-sample objects
+    - O(1) append, oldest values are overwritten when full
+    """
+    def __init__(self, size: int, typecode: str = 'd'):
+        super().__init__()
+
+        assert size >= 1
+        self._buf = array(typecode, [0]) * size
+        self._size = size
+        self._pos = 0       # Index of next write
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def append(self, value) -> None:
+        self._buf[self._pos] = value
+        self._pos = (self._pos + 1) % self._size
+        if self._count < self._size:
+            self._count += 1
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._count = 0
+
+    def last(self, n: int = 1):
+        """
+        Get newest n values, oldest first
+
+        :param n: Number of values, limited to number of stored values.
+        :return: Array with values.
+        """
+        n = min(n, self._count)
+        start = self._pos - n
+        if start >= 0:
+            return self._buf[start:self._pos]
+        else:
+            return self._buf[start:] + self._buf[:self._pos]
+
+    def values(self):
+        """
+        Get all stored values, oldest first
+        """
+        return self.last(self._count)
+
+    def __getitem__(self, index: int):
+        """
+        Get value by age, 0 is the oldest, -1 the newest value
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('ring buffer index out of range')
+        return self._buf[(self._pos - self._count + index) % self._size]
@@ -0,0 +1,132 @@
+"""
+Deadline scheduler for periodic jobs
+
+Jobs are kept in a heap ordered by their next run time (monotonic clock).
+Each job is executed in a thread pool, so a slow job doesn't delay the
+others. A job that is still running when it is due again is not started
+twice, the missed run is counted as overrun instead.
+"""
+import heapq
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+
+logger = logging.getLogger('nitroc-ui')
+
+
+class Job():
+    def __init__(self, name, fn, period, jitter):
+        super().__init__()
+
+        assert period > 0.0
+        assert jitter >= 0.0
+
+        self.name = name
+        self.fn = fn
+        self.period = period
+        self.jitter = jitter
+
+        self.base = 0.0     # Nominal start of current period
+        self.future: Future | None = None
+        self.runs = 0
+        self.overruns = 0
+        self.errors = 0
+        self.duration = 0.0
+        self.max_duration = 0.0
+
+
+class Scheduler():
+    def __init__(self, clock=time.monotonic, executor=None):
+        """
+        :param clock: Time source in seconds, must be monotonic.
+        :param executor: Executor to run the jobs. By default a thread pool
+                         with one thread per job is created on first use.
+        """
+        super().__init__()
+
+        self._clock = clock
+        self._executor = executor
+        self._jobs = dict()
+        self._heap = list()
+        self._seq = 0
+
+    def add(self, name: str, fn, period: float, delay: float = 0.0, jitter: float = 0.0) -> None:
+        """
+        Add a periodic job
+
+        :param name: Unique name of the job.
+        :param fn: Function to call, without arguments.
+        :param period: Period in seconds.
+        :param delay: Time until first run in seconds.
+        :param jitter: Max. random delay in seconds added to each run.
+        """
+        assert name not in self._jobs
+        job = Job(name, fn, period, jitter)
+        job.base = self._clock() + delay
+        self._jobs[name] = job
+        self._push(job, job.base)
+
+    def run_pending(self) -> float:
+        """
+        Start all jobs that are due
+
+        :return: Time in seconds until the next job is due.
+        """
+        now = self._clock()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, job = heapq.heappop(self._heap)
+
+            if job.future is not None and not job.future.done():
+                job.overruns += 1
+                logger.info(f'job {job.name} overrun, still busy from previous run')
+            else:
+                job.future = self._get_executor().submit(self._run, job)
+
+            # Keep nominal schedule, restart it if we fell behind by more than one period
+            job.base += job.period
+            if job.base <= now:
+                job.base = now + job.period
+            self._push(job, job.base + random.uniform(0.0, job.jitter))
+
+        if self._heap:
+            return max(0.0, self._heap[0][0] - self._clock())
+        return 1.0
+
+    def run(self) -> None:
+        """
+        Run scheduler forever in calling thread
+        """
+        while True:
+            timeout = self.run_pending()
+            time.sleep(timeout)
+
+    def stats(self) -> dict:
+        return {job.name: {'runs': job.runs,
+                           'overruns': job.overruns,
+                           'errors': job.errors,
+                           'duration': round(job.duration, 3),
+                           'max-duration': round(job.max_duration, 3)}
+                for job in self._jobs.values()}
+
+    def _push(self, job: Job, when: float) -> None:
+        # Sequence number makes entries with equal time comparable
+        heapq.heappush(self._heap, (when, self._seq, job))
+        self._seq += 1
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max(1, len(self._jobs)), thread_name_prefix='job')
+        return self._executor
+
+    def _run(self, job: Job) -> None:
+        start = self._clock()
+        try:
+            job.fn()
+        except Exception as e:
+            job.errors += 1
+            logger.warning(f'job {job.name} failed: {e}')
+        finally:
+            job.runs += 1
+            job.duration = self._clock() - start
+            job.max_duration = max(job.max_duration, job.duration)
@@ -48,13 +48,13 @@ logger.info(f'running server from {module_path}')
 
 
 class ModemResetHandler(tornado.web.RequestHandler):
-    def get(self):
+    async def get(self):
         imei = self.get_query_argument('imei')
         if imei:
             logger.warning(f'resetting modem with IMEI {imei}')
-            m = MM.modem(imei)
-            if m:
-                m.reset()
+            # Don't block the IOLoop while ModemManager is busy
+            found = await tornado.ioloop.IOLoop.current().run_in_executor(MM.executor, MM.reset, imei)
+            if found:
                 self.write('Modem reset successfully')
             else:
                 self.write('No modem found')
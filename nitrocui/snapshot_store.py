@@ -0,0 +1,280 @@
+"""
+Copy-on-write snapshot store for the data model
+
+Every publish creates a new frozen section and a new top level snapshot.
+Snapshots are never modified once created, so readers can keep and walk
+them without holding a lock while writers continue to publish.
+
+Consumers can subscribe to changes of a section. Change events are
+delivered to a thread queue or handed to an event loop (e.g. Tornado IOLoop),
+in generation order.
+"""
+import collections
+import logging
+import queue
+import threading
+
+
+logger = logging.getLogger('nitroc-ui')
+
+
+class FrozenDict(dict):
+    """
+    Read-only dictionary
+
+    Derived from dict so that it stays JSON serializable and behaves like
+    the plain dictionaries the readers already expect.
+    """
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('snapshot data is read-only')
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value):
+    """
+    Return an immutable deep copy of value
+
+    dicts become FrozenDicts, lists become tuples. Scalars and already
+    frozen values are returned as is.
+    """
+    if isinstance(value, FrozenDict):
+        return value
+    elif isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    else:
+        return value
+
+
+class Snapshot():
+    """
+    Consistent view of all sections at one generation
+    """
+    __slots__ = ('generation', 'sections')
+
+    def __init__(self, generation: int, sections: FrozenDict):
+        self.generation = generation
+        self.sections = sections
+
+
+class ChangeEvent():
+    """
+    Change of one section
+
+    new is None if the section was removed.
+    """
+    __slots__ = ('origin', 'generation', 'old', 'new')
+
+    def __init__(self, origin, generation: int, old, new):
+        self.origin = origin
+        self.generation = generation
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return f'ChangeEvent({self.origin}, {self.generation})'
+
+
+class Subscription():
+    """
+    Interest in changes of one section, optionally limited to some keys
+    """
+    def __init__(self, origin, keys=None):
+        super().__init__()
+
+        self.origin = origin
+        self.keys = tuple(keys) if keys is not None else None
+
+    def matches(self, old, new) -> bool:
+        if self.keys is None or not isinstance(old, dict) or not isinstance(new, dict):
+            return old != new
+
+        for key in self.keys:
+            if old.get(key) != new.get(key):
+                return True
+        return False
+
+    def deliver(self, event: ChangeEvent) -> None:
+        raise NotImplementedError
+
+
+class QueueSubscription(Subscription):
+    """
+    Delivers change events into a thread queue
+
+    Several subscriptions can share one queue, so that a thread can wait
+    for changes of multiple sections. Events are dropped if the queue is
+    full, consumers are expected to read the current model state anyway.
+    """
+    MAX_QUEUE_SIZE = 100
+
+    def __init__(self, origin, keys=None, events: queue.Queue | None = None):
+        super().__init__(origin, keys)
+
+        self.queue = events if events is not None else queue.Queue(self.MAX_QUEUE_SIZE)
+
+    def deliver(self, event: ChangeEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            logger.debug(f'event queue full, dropping {event}')
+
+    def wait(self, timeout: float | None = None) -> ChangeEvent | None:
+        """
+        Wait for the next change event
+
+        :param timeout: Max. time to wait in seconds, None to wait forever.
+        :return: The event or None on timeout.
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class LoopSubscription(Subscription):
+    """
+    Delivers change events to a callback running in an event loop
+
+    loop must provide add_callback(), like the Tornado IOLoop does. The
+    callback is executed in the loop thread, never in the publisher thread.
+    """
+    def __init__(self, origin, loop, callback, keys=None):
+        super().__init__(origin, keys)
+
+        self.loop = loop
+        self.callback = callback
+
+    def deliver(self, event: ChangeEvent) -> None:
+        self.loop.add_callback(self.callback, event)
+
+
+class SnapshotStore():
+    """
+    Versioned store of frozen sections
+
+    - Writers are serialized by an internal lock
+    - Readers get the current snapshot in O(1) without locking
+    """
+    def __init__(self):
+        super().__init__()
+
+        self._lock = threading.Lock()
+        self._snapshot = Snapshot(0, FrozenDict())
+        self._subscriptions = tuple()
+
+        # Changes not delivered yet, appended under _lock in generation order
+        self._pending = collections.deque()
+        self._notify_lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._snapshot.generation
+
+    def snapshot(self) -> Snapshot:
+        # Reading the reference is atomic, the object behind it never changes
+        return self._snapshot
+
+    def section(self, origin):
+        return self._snapshot.sections.get(origin)
+
+    def publish(self, origin, value) -> Snapshot:
+        """
+        Replace a section with a frozen copy of value
+
+        Returns the new snapshot.
+        """
+        frozen = freeze(value)
+        with self._lock:
+            old = self._snapshot.sections.get(origin)
+            sections = dict(self._snapshot.sections)
+            sections[origin] = frozen
+            snapshot = self._commit(sections)
+            self._pending.append((origin, snapshot.generation, old, frozen))
+
+        self._notify()
+        return snapshot
+
+    def update(self, origin, changes: dict, removed=()) -> Snapshot:
+        """
+        Merge changed keys into a section, keeping the other keys
+
+        :param changes: Keys to add or replace.
+        :param removed: Keys to delete.
+        :return: The new snapshot.
+        """
+        frozen_changes = {k: freeze(v) for k, v in changes.items()}
+        with self._lock:
+            old = self._snapshot.sections.get(origin)
+            merged = dict(old) if old is not None else dict()
+            merged.update(frozen_changes)
+            for key in removed:
+                merged.pop(key, None)
+            frozen = FrozenDict(merged)
+            sections = dict(self._snapshot.sections)
+            sections[origin] = frozen
+            snapshot = self._commit(sections)
+            self._pending.append((origin, snapshot.generation, old, frozen))
+
+        self._notify()
+        return snapshot
+
+    def remove(self, origin) -> Snapshot:
+        with self._lock:
+            if origin not in self._snapshot.sections:
+                return self._snapshot
+
+            old = self._snapshot.sections[origin]
+            sections = dict(self._snapshot.sections)
+            del sections[origin]
+            snapshot = self._commit(sections)
+            self._pending.append((origin, snapshot.generation, old, None))
+
+        self._notify()
+        return snapshot
+
+    def subscribe(self, subscription: Subscription) -> Subscription:
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not subscription)
+
+    def _commit(self, sections: dict) -> Snapshot:
+        snapshot = Snapshot(self._snapshot.generation + 1, FrozenDict(sections))
+        self._snapshot = snapshot
+        return snapshot
+
+    def _notify(self) -> None:
+        # Deliver outside of write lock, subscribers must never block the publisher.
+        # Whichever publisher gets the notify lock delivers all pending changes,
+        # so events of concurrent publishers can't overtake each other.
+        with self._notify_lock:
+            while self._pending:
+                origin, generation, old, new = self._pending.popleft()
+                event = None
+                for sub in self._subscriptions:
+                    if sub.origin == origin and sub.matches(old, new):
+                        if event is None:
+                            event = ChangeEvent(origin, generation, old, new)
+                        sub.deliver(event)
@@ -0,0 +1,132 @@
+"""
+Cached access to sysfs attributes
+
+Each attribute is opened once and re-read with pread at offset 0, which
+makes sysfs regenerate the value. This avoids an open/close pair per read.
+Values are parsed directly from the bytes read. If the underlying device
+went away (ENODEV, e.g. interface re-created) the attribute is reopened
+transparently.
+"""
+import errno
+import os
+import threading
+
+
+class SysfsAttr():
+    """
+    One sysfs attribute, kept open
+    """
+    # Max. size of a value, sysfs attributes are limited to a page
+    SIZE = 256
+
+    # Errors after which the file is reopened
+    REOPEN_ERRORS = (errno.ENODEV, errno.EBADF, errno.ESTALE)
+
+    def __init__(self, path: str, writable: bool = False):
+        super().__init__()
+
+        self.path = path
+        self.writable = writable
+        self.fd = None
+        self._lock = threading.Lock()
+
+    def read(self) -> bytes | None:
+        """
+        Read raw value
+
+        :return: Content of attribute or None if it doesn't exist.
+        """
+        with self._lock:
+            for _ in range(2):
+                try:
+                    if self.fd is None:
+                        self._open()
+                    return os.pread(self.fd, SysfsAttr.SIZE, 0)
+                except FileNotFoundError:
+                    return None
+                except OSError as e:
+                    self._close()
+                    if e.errno not in SysfsAttr.REOPEN_ERRORS:
+                        return None
+            return None
+
+    def read_int(self) -> int | None:
+        raw = self.read()
+        try:
+            return int(raw) if raw is not None else None
+        except ValueError:
+            return None
+
+    def read_float(self, scale: float = 1.0) -> float | None:
+        """
+        Read numeric value
+
+        :param scale: Divider to convert raw value, e.g. 1000.0 for milli-units.
+        """
+        raw = self.read()
+        try:
+            return float(raw) / scale if raw is not None else None
+        except ValueError:
+            return None
+
+    def read_str(self) -> str | None:
+        raw = self.read()
+        return raw.decode().strip() if raw is not None else None
+
+    def write(self, value: str | bytes) -> bool:
+        """
+        Write value to attribute
+
+        :return: True if written.
+        """
+        assert self.writable
+        if isinstance(value, str):
+            value = value.encode()
+
+        with self._lock:
+            for _ in range(2):
+                try:
+                    if self.fd is None:
+                        self._open()
+                    os.pwrite(self.fd, value, 0)
+                    return True
+                except FileNotFoundError:
+                    return False
+                except OSError as e:
+                    self._close()
+                    if e.errno not in SysfsAttr.REOPEN_ERRORS:
+                        return False
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _open(self) -> None:
+        self.fd = os.open(self.path, os.O_RDWR if self.writable else os.O_RDONLY)
+
+    def _close(self) -> None:
+        if self.fd is not None:
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+            self.fd = None
+
+
+_cache: dict[str, SysfsAttr] = dict()
+_cache_lock = threading.Lock()
+
+
+def attr(path: str, writable: bool = False) -> SysfsAttr:
+    """
+    Get shared attribute instance for path, created on first use
+    """
+    with _cache_lock:
+        a = _cache.get(path)
+        if a is None or (writable and not a.writable):
+            if a is not None:
+                a.close()
+            a = SysfsAttr(path, writable)
+            _cache[path] = a
+        return a
@@ -1,9 +1,20 @@
-import subprocess
+import os
+import time
+
+from . import sysfs
 
 
 class SysInfoBase():
+    # eMMC health information, see JEDEC eMMC 5.0 EXT_CSD
+    EMMC_DEVICE = '/sys/block/mmcblk0/device'
+
+    # Wear changes over weeks, read it rarely
+    EMMC_INFO_TTL = 6 * 3600.0
+
     def __init__(self):
-        pass
+        self.emmc_device = SysInfoBase.EMMC_DEVICE
+        self._emmc_info = None
+        self._emmc_info_time = None
 
     def poll(self):
         pass
@@ -30,82 +41,67 @@ class SysInfoBase():
         # TODO: Not yet available
         return "unknown"
 
-    def meminfo(self) -> tuple[int, int]:
-        try:
-            with open('/proc/meminfo') as f:
-                res = f.readlines()
-                for line in res:
-                    if 'MemTotal' in line:
-                        total = int(line.split()[1].strip())
-                    elif 'MemFree' in line:
-                        free = int(line.split()[1].strip())
-            return total, free
-        except FileNotFoundError:
-            return (0, 0)
-
-    def part_size(self, partition):
-        cp = subprocess.run(['/usr/bin/df', '-h', partition], stdout=subprocess.PIPE)
-        res = cp.stdout.decode().strip()
-        for line in res.splitlines():
-            if partition in line:
-                res = line
-        return res
-
-    def emmc_wear(self) -> tuple[float, float]:
+    def part_size(self, partition) -> tuple[int, int, int]:
         """
-        Check for following output in mmc command
-        eMMC Life Time Estimation A [EXT_CSD_DEVICE_LIFE_TIME_EST_TYP_A]: 0x01
+        Get usage of file system
+
+        :return: Total, used and free bytes. Free is the space available to
+                 normal users, like 'df' reports it.
         """
         try:
-            cp = subprocess.run(['/usr/bin/mmc', 'extcsd', 'read', '/dev/mmcblk0'], stdout=subprocess.PIPE)
-            res = cp.stdout.decode().strip()
-        except FileNotFoundError:
-            res = ""
-
-        res_a = 0.0
-        res_b = 0.0
-        for line in res.splitlines():
-            if 'Life Time Estimation' in line:
-                if 'TYP_A' in line:
-                    res_a = int(line[-2:], 16) * 10.0
-                if 'TYP_B' in line:
-                    res_b = int(line[-2:], 16) * 10.0
-
-        return res_a, res_b
-
-    def load(self) -> list[str]:
-        with open('/proc/loadavg') as f:
-            res = f.readline()
-            info = res.split()
-            return info[0:3]
+            st = os.statvfs(partition)
+        except OSError:
+            return (0, 0, 0)
 
-    def cpufreq(self, core) -> int:
-        with open(f'/sys/bus/cpu/devices/cpu{core}/cpufreq/scaling_cur_freq') as f:
-            res = f.readline()
-            return int(res)
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        free = st.f_bavail * st.f_frsize
+        return total, used, free
 
-    def date(self) -> str:
-        cp = subprocess.run(['/usr/bin/date'], stdout=subprocess.PIPE)
-        res = cp.stdout.decode().strip()
-        return res
+    def emmc_info(self) -> dict | None:
+        """
+        Get raw eMMC health values
 
-    def uptime(self) -> str:
-        cp = subprocess.run(['/usr/bin/uptime'], stdout=subprocess.PIPE)
-        res = cp.stdout.decode().strip()
-        start = res.find("up")
-        end = res.find(",  load")
-        return res[start:end]
+        - life-a: Wear of SLC area, 1 = 0..10 %, 2 = 10..20 % ... 11 = exceeded
+        - life-b: Wear of MLC area, same encoding
+        - pre-eol: Reserved blocks, 1 = normal, 2 = warning, 3 = urgent
+
+        :return: Dictionary with values, None if not available.
+        """
+        now = time.monotonic()
+        if self._emmc_info_time is not None and now - self._emmc_info_time < self.EMMC_INFO_TTL:
+            return self._emmc_info
 
-    def ifinfo(self, name):
+        info = None
+        life_time = sysfs.attr(f'{self.emmc_device}/life_time').read_str()
+        pre_eol = sysfs.attr(f'{self.emmc_device}/pre_eol_info').read_str()
         try:
-            rxpath = f'/sys/class/net/{name}/statistics/rx_bytes'
-            with open(rxpath) as f:
-                rxbytes = f.readline().strip()
+            if life_time and pre_eol:
+                life_a, life_b = (int(v, 16) for v in life_time.split())
+                info = {
+                    'life-a': life_a,
+                    'life-b': life_b,
+                    'pre-eol': int(pre_eol, 16),
+                }
+        except ValueError:
+            pass
+
+        self._emmc_info = info
+        self._emmc_info_time = now
+        return info
 
-            txpath = f'/sys/class/net/{name}/statistics/tx_bytes'
-            with open(txpath) as f:
-                txbytes = f.readline().strip()
-        except FileNotFoundError:
-            rxbytes, txbytes = None, None
+    def emmc_wear(self) -> tuple[float, float]:
+        """
+        Get wear of SLC and MLC area in percent
+        """
+        info = self.emmc_info()
+        if info is None:
+            return 0.0, 0.0
+        return info['life-a'] * 10.0, info['life-b'] * 10.0
 
-        return rxbytes, txbytes
+    def cpufreq(self, core) -> int | None:
+        return sysfs.attr(f'/sys/bus/cpu/devices/cpu{core}/cpufreq/scaling_cur_freq').read_int()
+
+    def date(self) -> str:
+        # Same format as 'date' tool
+        return time.strftime('%a %b %e %H:%M:%S %Z %Y')
@@ -1,6 +1,14 @@
+import logging
+import threading
+from time import sleep
+
 from .sysinfo_base import SysInfoBase
 from .i2c import I2C
 from .pac1921 import PAC1921
+from .device_registry import DeviceRegistry
+
+
+logger = logging.getLogger('nitroc-ui')
 
 
 class SysInfoPower(SysInfoBase):
@@ -15,10 +23,11 @@ class SysInfoPower(SysInfoBase):
         self.i2c_bus = dict()
         self.sensors = dict()
         self.powers = dict()
+        self.lock = threading.Lock()    # Serializes bus access, sampler may run in own thread
 
+        # NMCF slot buses may be missing, they are opened when the sensor is probed
         for bus in [0, 4, 5, 6, 7, 8]:
             self.i2c_bus[bus] = I2C(bus)
-            self.i2c_bus[bus].open()
 
         self.sensors['mb'] = PAC1921(self.i2c_bus[0], 0x4C, 0.005)
         self.sensors['nmcf1'] = PAC1921(self.i2c_bus[4], 0x4C, 0.020)
@@ -27,48 +36,116 @@ class SysInfoPower(SysInfoBase):
         self.sensors['nmcf4'] = PAC1921(self.i2c_bus[7], 0x4C, 0.020)
         self.sensors['eth'] = PAC1921(self.i2c_bus[8], 0x4C, 0.005)
 
-        for _, sensor in self.sensors.items():
+        # Probe sensors, missing ones are probed again later
+        self.registry = DeviceRegistry()
+        self.keys = dict()
+        for name, sensor in self.sensors.items():
+            key = (sensor.i2c.bus, sensor.addr)
+            self.keys[name] = key
+            if self.registry.add(key, SysInfoPower._prober(sensor)):
+                logger.info(f'Detected power sensor {name}')
+
+    @staticmethod
+    def _prober(sensor: PAC1921):
+        def probe():
+            if sensor.i2c.fd is None:
+                sensor.i2c.open()
             try:
-                # sensor.id()
                 sensor.start()
-            except:
-                pass
+            except OSError:
+                # Module may be unplugged, its old fd never works again
+                sensor.i2c.close()
+                raise
+        return probe
 
     def poll(self):
-        for name in ['mb', 'eth', 'nmcf1', 'nmcf2', 'nmcf3', 'nmcf4']:
-            self.powers[name] = self._get_pwr(name)
+        # Replace all values at once, readers may run in another thread
+        self.powers = self.measure()
+
+    def measure(self) -> dict[str, float | None]:
+        """
+        Measure power of all sensors
+
+        :return: Dictionary sensor name -> power in W, None if failed
+        """
+        with self.lock:
+            powers = self.sample('power')
 
         # Mainboard sensor also includes NMCF slots, subtract these values to get mainboard alone
         pwr_slots = 0.0
         for slot in range(1, 5):
             name = f'nmcf{slot}'
-            if name in self.powers and self.powers[name] is not None:
-                pwr_slots += self.powers[name]
+            if name in powers and powers[name] is not None:
+                pwr_slots += powers[name]
+
+        if powers['mb'] is not None:
+            powers['mb'] -= pwr_slots
 
-        self.powers['mb'] -= pwr_slots
+        return powers
 
     def pwr_mb(self):
-        # return self._get_pwr('mb')
-        return self.powers['mb']
+        return self.powers.get('mb')
 
     def pwr_eth(self):
-        return self.powers['eth']
+        return self.powers.get('eth')
 
     def pwr_nmcf1(self):
-        return self.powers['nmcf1']
+        return self.powers.get('nmcf1')
 
     def pwr_nmcf2(self):
-        return self.powers['nmcf2']
+        return self.powers.get('nmcf2')
 
     def pwr_nmcf3(self):
-        return self.powers['nmcf3']
+        return self.powers.get('nmcf3')
 
     def pwr_nmcf4(self):
-        return self.powers['nmcf4']
-
-    def _get_pwr(self, name) -> float | None:
-        try:
-            pwr = self.sensors[name].power()
-            return pwr
-        except OSError:
-            return None
+        return self.powers.get('nmcf4')
+
+    def stats(self) -> dict:
+        return self.registry.stats()
+
+    def sample(self, kind: str) -> dict[str, float | None]:
+        """
+        Sample all sensors in one batch
+
+        Selects the measurement type on all sensors, waits once for the
+        integration if any sensor had to be reconfigured, then reads all
+        results. Sensors that fail or are not present report None.
+
+        :param kind: 'voltage', 'current' or 'power'
+        :return: Dictionary sensor name -> value
+        """
+        self.registry.reprobe()
+
+        values = dict()
+        settle = False
+        for name, sensor in self.sensors.items():
+            if not self.registry.present(self.keys[name]):
+                values[name] = None
+                continue
+            try:
+                settle |= sensor.select(kind)
+            except OSError:
+                self._error(name)
+                values[name] = None
+
+        if settle:
+            sleep(PAC1921.SETTLE_TIME)
+
+        for name, sensor in self.sensors.items():
+            if name not in values:
+                try:
+                    values[name] = sensor.result(kind)
+                    self.registry.ok(self.keys[name])
+                except OSError:
+                    self._error(name)
+                    values[name] = None
+
+        return values
+
+    def _error(self, name: str) -> None:
+        key = self.keys[name]
+        self.registry.error(key)
+        if not self.registry.present(key):
+            # One sensor per bus, reopened by the next probe
+            self.sensors[name].i2c.close()
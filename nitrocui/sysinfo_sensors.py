@@ -1,16 +1,129 @@
+import json
+import logging
 import re
 import subprocess
+from fnmatch import fnmatchcase
 from os import path
 
+from .hwmon import Hwmon
 from .sysinfo_base import SysInfoBase
 
+logger = logging.getLogger('nitroc-ui')
+
+
+# Feature line of 'sensors' output, e.g. "temp1:        +45.2°C  (high = +85.0°C)"
+FEATURE_LINE = re.compile(r'^([^:\s][^:]*):\s+([-+]?\d+(?:\.\d+)?)', re.MULTILINE)
+
+
+def parse_sensors_text(text: str) -> dict[str, dict[str, float]]:
+    """
+    Parse output of 'sensors' in one pass
+
+    :param text: Output of 'sensors' tool.
+    :return: Index chip name -> feature label -> value.
+    """
+    index = dict()
+    for block in text.split('\n\n'):
+        block = block.strip()
+        if not block:
+            continue
+
+        chip, _, body = block.partition('\n')
+        features = dict()
+        for label, value in FEATURE_LINE.findall(body):
+            if label != 'Adapter':
+                features.setdefault(label, float(value))
+        index[chip.strip()] = features
+
+    return index
+
+
+def parse_sensors_json(text: str) -> dict[str, dict[str, float]]:
+    """
+    Parse output of 'sensors -j'
+
+    :param text: JSON output of 'sensors -j'.
+    :return: Index chip name -> feature label -> value.
+    """
+    index = dict()
+    for chip, entries in json.loads(text).items():
+        features = dict()
+        for label, subfeatures in entries.items():
+            if isinstance(subfeatures, dict):
+                for name, value in subfeatures.items():
+                    if name.endswith('_input'):
+                        features[label] = float(value)
+                        break
+        index[chip] = features
+
+    return index
+
+
+def lookup(index: dict[str, dict[str, float]], chip: str, feature: str) -> float | None:
+    """
+    Get value from sensors index
+
+    :param chip: Chip name, may contain shell style wildcards.
+    :param feature: Feature label.
+    :return: Value of first matching chip or None if not found.
+    """
+    if chip in index:
+        return index[chip].get(feature)
+
+    for name, features in index.items():
+        if fnmatchcase(name, chip) and feature in features:
+            return features[feature]
+    return None
+
+
+def average_all(values: list[float | None]) -> float | None:
+    """
+    Average over a fixed set of values
+
+    :return: Mean value, None if any value is missing, so that the result
+             doesn't change when a single sensor drops out.
+    """
+    if not values or any(v is None for v in values):
+        return None
+    return sum(values) / len(values)
+
 
 class SysInfoSensors(SysInfoBase):
     """
-    System Info implementation using 'sensors' tool to retrieve values
+    System Info implementation for hwmon sensors
+
+    Reads the hwmon sysfs files directly if available, otherwise uses the
+    'sensors' tool to retrieve values
     """
     BIN = '/usr/bin/sensors'
 
+    # Value name -> (chip name as shown by 'sensors', feature)
+    # Chip names may contain shell style wildcards
+    SENSORS = {
+        'temp_mb1': ('tmp1075-i2c-0-48', 'temp1'),
+        'temp_mb2': ('tmp1075-i2c-0-49', 'temp1'),
+        'temp_eth': ('tmp1075-i2c-8-48', 'temp1'),
+        'temp_nmcf1': ('tmp1075-i2c-4-48', 'temp1'),
+        'temp_nmcf2': ('tmp1075-i2c-5-48', 'temp1'),
+        'temp_nmcf3': ('tmp1075-i2c-6-48', 'temp1'),
+        'temp_nmcf4': ('tmp1075-i2c-7-48', 'temp1'),
+
+        # 2.5 GB PHYs
+        'temp_phy1': ('f212a600.mdio_mii:01-mdio-1', 'temp1'),
+        'temp_phy2': ('f212a600.mdio_mii:09-mdio-9', 'temp1'),
+        'temp_phy3': ('f212a600.mdio_mii:11-mdio-b', 'temp1'),
+
+        # pci-40100, pci-20100 seem to denote location oin PCI system.
+        # could use this pattern to bind values to a NMCF slot. Would need a reg-ex like lookup
+        'temp_nvm_sdd': ('nvme-pci-40100', 'Composite'),
+
+        # 'temp_wle3000_1': ('ath11k_hwmon-pci-20100', 'temp1'),
+        'temp_wle3000': ('ath11k_hwmon-pci-*', 'temp1'),  # Find WLE3000 in any slot
+    }
+
+    # PHYs of 1GB ETH Switch, temperature is averaged
+    ETH_SWITCH_PHY_IDS = [3, 4, 5, 6, 7]
+
     @staticmethod
     def sensors_present() -> bool:
         return path.exists(SysInfoSensors.BIN)
@@ -19,59 +132,51 @@ class SysInfoSensors(SysInfoBase):
         # TODO: Check Ethernet board variant?
         super().__init__()
 
-        self.temp_mb1 = None
-        self.temp_mb2 = None
-        self.temp_eth = None
-        self.temp_nmcf1 = None
-        self.temp_nmcf2 = None
-        self.temp_nmcf3 = None
-        self.temp_nmcf4 = None
-        self.temp_phy1 = None
-        self.temp_phy2 = None
-        self.temp_phy3 = None
-        self.temp_eth_switch = None
-        self.temp_nvm_sdd = None
-        self.temp_nvm_sdd = None
-        self.temp_wle3000 = None
+        self.json_output = True     # Try 'sensors -j' first
+        self.values = dict()
 
-    def poll(self) -> None:
-        try:
-            cp = subprocess.run([SysInfoSensors.BIN], stdout=subprocess.PIPE)
-            res = cp.stdout.decode().strip()
-            self.sensor_res = res
-        except FileNotFoundError:
-            self.sensor_res = ""
+        # Prefer hwmon sysfs, fall back to 'sensors' tool if no hwmon chips are found
+        self.inputs = None
+        self.sensors = dict(self._sensor_list())
+        self.missing = dict()   # name -> (chip, feature) of inputs not opened (yet)
+        self.hwmon = Hwmon()
+        if self.hwmon.chips:
+            self.inputs = dict()
+            self._open_inputs(self.sensors)
+            logger.info(f'using hwmon for {len(self.inputs)} sensors')
+        else:
+            logger.info('no hwmon chips found, using sensors tool')
+            if not SysInfoSensors.sensors_present():
+                logger.warning('System sensors not present, is the "sensors" tool available?')
 
-        self.temp_mb1 = self._extract('tmp1075-i2c-0-48', 'temp1')
-        self.temp_mb2 = self._extract('tmp1075-i2c-0-49', 'temp1')
-        self.temp_eth = self._extract('tmp1075-i2c-8-48', 'temp1')
-        self.temp_nmcf1 = self._extract('tmp1075-i2c-4-48', 'temp1')
-        self.temp_nmcf2 = self._extract('tmp1075-i2c-5-48', 'temp1')
-        self.temp_nmcf3 = self._extract('tmp1075-i2c-6-48', 'temp1')
-        self.temp_nmcf4 = self._extract('tmp1075-i2c-7-48', 'temp1')
+    def poll(self) -> None:
+        values = dict()
+        if self.inputs is not None:
+            # Pick up chips of drivers loaded later or re-probed devices
+            if self.missing and self.hwmon.rescan():
+                self._open_inputs(self.missing)
 
-        # 2.5 GB PHYs
-        self.temp_phy1 = self._extract('f212a600.mdio_mii:01-mdio-1', 'temp1')
-        self.temp_phy2 = self._extract('f212a600.mdio_mii:09-mdio-9', 'temp1')
-        self.temp_phy3 = self._extract('f212a600.mdio_mii:11-mdio-b', 'temp1')
+            for name, inp in list(self.inputs.items()):
+                if (value := inp.read()) is not None:
+                    # Same resolution as 'sensors' tool
+                    value = round(value, 1)
+                elif inp.gone:
+                    # Open again after next scan, e.g. when device is re-probed
+                    inp.close()
+                    del self.inputs[name]
+                    self.missing[name] = self.sensors[name]
+                values[name] = value
+        else:
+            index = self._sensors_index()
+            for name, (chip, feature) in self.sensors.items():
+                values[name] = lookup(index, chip, feature)
 
         # Averaged temperature of 1GB ETH Switch
-        phy_temps = 0
-        phy_ids = [3, 4, 5, 6, 7]
-        for phy_num in phy_ids:
-            phy_temp = self._extract(f'cp0configspacef2000000mdio12a200switch16mdio0{phy_num}-mdio-{phy_num}', 'temp1')
-            if phy_temp:
-                phy_temps += phy_temp
-
-        self.temp_eth_switch = phy_temps / len(phy_ids)
+        phy_temps = [values.get(f'temp_switch_phy{phy_num}') for phy_num in self.ETH_SWITCH_PHY_IDS]
+        values['temp_eth_switch'] = average_all(phy_temps)
 
-        # pci-40100, pci-20100 seem to denote location oin PCI system.
-        # could use this pattern to bind values to a NMCF slot. Would need a reg-ex like lookup
-        self.temp_nvm_sdd = self._extract('nvme-pci-40100', 'Composite')
-
-        # self.temp_wle3000_1 = self._extract('ath11k_hwmon-pci-20100', 'temp1')
-        self.temp_wle3000 = self._extract('ath11k_hwmon-pci.*', 'temp1')  # Find WLE3000 in any slot
-        # print(f"wle3000 {self.temp_wle3000}")
+        # Replace all values at once, readers may run in another thread
+        self.values = values
 
     # def input_voltage(self) -> float:
     #     return self.volt_in
@@ -80,50 +185,78 @@ class SysInfoSensors(SysInfoBase):
     #     return self.volt_rtc
 
     def temperature_mb1_pcb(self) -> float | None:
-        return self.temp_mb1
+        return self.values.get('temp_mb1')
 
     def temperature_mb2_pcb(self) -> float | None:
-        return self.temp_mb2
+        return self.values.get('temp_mb2')
 
     def temperature_eth_pcb(self) -> float | None:
-        return self.temp_eth
+        return self.values.get('temp_eth')
 
     def temperature_nmcf1_pcb(self) -> float | None:
-        return self.temp_nmcf1
+        return self.values.get('temp_nmcf1')
 
     def temperature_nmcf2_pcb(self) -> float | None:
-        return self.temp_nmcf2
+        return self.values.get('temp_nmcf2')
 
     def temperature_nmcf3_pcb(self) -> float | None:
-        return self.temp_nmcf3
+        return self.values.get('temp_nmcf3')
 
     def temperature_nmcf4_pcb(self) -> float | None:
-        return self.temp_nmcf4
+        return self.values.get('temp_nmcf4')
 
     def temperature_phy1(self) -> float | None:
-        return self.temp_phy1
+        return self.values.get('temp_phy1')
 
     def temperature_phy2(self) -> float | None:
-        return self.temp_phy2
+        return self.values.get('temp_phy2')
 
     def temperature_phy3(self) -> float | None:
-        return self.temp_phy3
+        return self.values.get('temp_phy3')
 
     def temperature_eth_switch(self) -> float | None:
-        return self.temp_eth_switch
+        """
+        Average temperature of all switch PHYs, None if any PHY can't be read
+        """
+        return self.values.get('temp_eth_switch')
 
     def temperature_nvm_ssd(self) -> float | None:
-        return self.temp_nvm_sdd
+        return self.values.get('temp_nvm_sdd')
 
     def temperature_wifi_wle3000(self) -> float | None:
-        return self.temp_wle3000
-
-    def _extract(self, sensor: str, token: str) -> float | None:
-        regex = rf"{sensor}\nAdapter.*\n{token}:\s*([-+]?\d+.\d+)"
-        matches = re.finditer(regex, self.sensor_res, re.MULTILINE)
-        for matchNum, match in enumerate(matches, start=1):
-            # print ("Match {matchNum} was found at {start}-{end}: {match}".format(matchNum = matchNum, start = match.start(), end = match.end(), match = match.group()))
-            if len(match.groups()) == 1:
-                # print ("Group {groupNum} found at {start}-{end}: {group}".format(groupNum = groupNum, start = match.start(groupNum), end = match.end(groupNum), group = match.group(groupNum)))
-                return float(match.group(1))
-        return None
+        return self.values.get('temp_wle3000')
+
+    def _open_inputs(self, sensors: dict[str, tuple[str, str]]) -> None:
+        missing = dict()
+        for name, (chip, feature) in sensors.items():
+            if inp := self.hwmon.open(chip, feature):
+                self.inputs[name] = inp
+            else:
+                missing[name] = (chip, feature)
+        if self.missing and len(missing) < len(self.missing):
+            logger.info(f'found hwmon sensors {[name for name in self.missing if name not in missing]}')
+        self.missing = missing
+
+    def _sensor_list(self):
+        yield from self.SENSORS.items()
+        for phy_num in self.ETH_SWITCH_PHY_IDS:
+            chip = f'cp0configspacef2000000mdio12a200switch16mdio0{phy_num}-mdio-{phy_num}'
+            yield f'temp_switch_phy{phy_num}', (chip, 'temp1')
+
+    def _sensors_index(self) -> dict[str, dict[str, float]]:
+        try:
+            if self.json_output:
+                cp = subprocess.run([SysInfoSensors.BIN, '-j'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+                if cp.returncode == 0:
+                    try:
+                        return parse_sensors_json(cp.stdout.decode())
+                    except ValueError as e:
+                        logger.info(f'cannot parse sensors json output: {e}')
+
+                logger.info('sensors tool without json support, using text output')
+                self.json_output = False
+
+            cp = subprocess.run([SysInfoSensors.BIN], stdout=subprocess.PIPE)
+            return parse_sensors_text(cp.stdout.decode())
+        except FileNotFoundError:
+            return dict()
@@ -1,6 +1,7 @@
 from os import path
 
 from .sysinfo_base import SysInfoBase
+from . import sysfs
 
 
 class SysInfoSysFs(SysInfoBase):
@@ -24,25 +25,18 @@ class SysInfoSysFs(SysInfoBase):
         self.lm75_path = '/sys/bus/i2c/drivers/lm75/1-0048/hwmon/hwmon1'
 
     def temperature(self):
-        with open(f'{self.da9063_path}/temp1_input') as f:
-            temp_in_milli_c = f.readline().strip()
-            return round(float(temp_in_milli_c) / 1000.0, 1)
+        temp = sysfs.attr(f'{self.da9063_path}/temp1_input').read_float(1000.0)
+        return round(temp, 1) if temp is not None else None
 
     def input_voltage(self):
-        with open(f'{self.da9063_path}/in1_input') as f:
-            adc_millivolts = f.readline().strip()
-            return round(float(adc_millivolts) / 1000.0 * 15.0, 1)
+        adc_volts = sysfs.attr(f'{self.da9063_path}/in1_input').read_float(1000.0)
+        return round(adc_volts * 15.0, 1) if adc_volts is not None else None
 
     def rtc_voltage(self):
-        with open(f'{self.da9063_path}/in4_input') as f:
-            adc_millivolts = f.readline().strip()
-            return round(float(adc_millivolts) / 1000.0, 3)
+        adc_volts = sysfs.attr(f'{self.da9063_path}/in4_input').read_float(1000.0)
+        return round(adc_volts, 3) if adc_volts is not None else None
 
     def temperature_lm75(self):
         # TODO: Test
-        try:
-            with open(f'{self.lm75_path}/temp_input') as f:
-                temp_in_milli_c = f.readline().strip()
-                return round(float(temp_in_milli_c) / 1000.0, 1)
-        except FileNotFoundError:
-            pass
+        temp = sysfs.attr(f'{self.lm75_path}/temp_input').read_float(1000.0)
+        return round(temp, 1) if temp is not None else None
@@ -1,13 +1,100 @@
 import logging
+import time
 
 from .sysinfo_base import SysInfoBase
 from .i2c import I2C
 from .mcp9600 import MCP9600
+from .device_registry import DeviceRegistry
 
 
 logger = logging.getLogger('nitroc-ui')
 
 
+class TCSensorState():
+    def __init__(self, sensor: MCP9600, key):
+        super().__init__()
+
+        self.sensor = sensor
+        self.key = key          # (bus, address) in device registry
+        self.value = None
+        self.errors = 0
+        self.last_good = None   # Monotonic time of last good reading
+
+
+class TCScanner():
+    """
+    Reads all thermocouple sensors of one bus
+
+    The sensors convert continuously, so the hot junction registers of all
+    present sensors are read in one bulk transfer. Sensors that fail
+    repeatedly are marked failed in the device registry, which re-probes
+    (and re-initializes) them on an exponentially growing schedule. So a
+    flaky probe doesn't slow down the other sensors.
+    """
+    # Last good value is reported this long in seconds when reads fail
+    MAX_AGE = 5.0
+
+    def __init__(self, i2c, sensors: list[MCP9600], registry: DeviceRegistry, clock=time.monotonic):
+        super().__init__()
+
+        self.i2c = i2c
+        self.registry = registry
+        self.clock = clock
+        self.states = [TCSensorState(s, (i2c.bus, s.ADDR)) for s in sensors]
+
+    def scan(self) -> list[float | None]:
+        """
+        Read all sensors
+
+        :return: Temperature in Celsius per sensor, None if not available.
+        """
+        self.registry.reprobe()
+
+        now = self.clock()
+        active = [st for st in self.states if self.registry.present(st.key)]
+        if active:
+            results = self._read([st.sensor.temperature_request() for st in active])
+            for st, data in zip(active, results):
+                if data is not None:
+                    st.value = st.sensor.temp_c(data)
+                    st.last_good = now
+                    self.registry.ok(st.key)
+                else:
+                    st.errors += 1
+                    self.registry.error(st.key)
+
+            # Bus is reopened by the next read or probe
+            if not any(self.registry.present(st.key) for st in active):
+                self.i2c.close()
+
+        temps = []
+        for st in self.states:
+            if st.last_good is not None and now - st.last_good <= self.MAX_AGE:
+                temps.append(st.value)
+            else:
+                temps.append(None)
+        return temps
+
+    def _read(self, requests: list[tuple[int, int, int]]) -> list[bytes | None]:
+        # Bus may have been closed by a failed probe of another sensor
+        if self.i2c.fd is None:
+            try:
+                self.i2c.open()
+            except OSError:
+                return [None] * len(requests)
+        return self.i2c.read_regs(requests)
+
+    def stats(self) -> list[dict]:
+        now = self.clock()
+        return [{
+            'addr': st.sensor.ADDR,
+            'state': self.registry.state(st.key),
+            'errors': st.errors,
+            'age': now - st.last_good if st.last_good is not None else None,
+            'retry': self.registry.retry_in(st.key),
+        } for st in self.states]
+
+
 class SysInfoTC(SysInfoBase):
     """
     System Info implementation using MCP9600 via I2C
@@ -20,12 +107,12 @@ class SysInfoTC(SysInfoBase):
 
         self.i2c_bus = dict()
         self.sensors = []
-        self.present = 0    # Bitmask with detected sensors
+        self.temps = []
 
         # New IO Env module. 8 thermal sensors ;-)
+        # The bus only exists with the module, it is opened when the first sensor is probed
         for bus in [10]:
             self.i2c_bus[bus] = I2C(bus)
-            self.i2c_bus[bus].open()
 
         self.sensors.append(MCP9600(self.i2c_bus[10], address = 0x60, tctype = 'T', tcfilter=4))
         self.sensors.append(MCP9600(self.i2c_bus[10], address = 0x61, tctype = 'T', tcfilter=4))
@@ -36,24 +123,38 @@ class SysInfoTC(SysInfoBase):
         self.sensors.append(MCP9600(self.i2c_bus[10], address = 0x66, tctype = 'T', tcfilter=4))
         self.sensors.append(MCP9600(self.i2c_bus[10], address = 0x67, tctype = 'T', tcfilter=4))
 
-        # Probe sensors
-        pos = 0
-        for s in self.sensors:
-            try:
-                # Try sensor, remember in <present> variable
-                # print(f"trying pos {pos}")
-                s.init()
-                self.present |= (1 << pos)
+        # Probe sensors, missing ones are probed again later
+        self.registry = DeviceRegistry()
+        for pos, s in enumerate(self.sensors):
+            if self.registry.add((10, s.ADDR), SysInfoTC._prober(s)):
                 logger.info(f'Detected thermopcouple {pos} at 0x{s.ADDR:02x}')
+
+        self.scanner = TCScanner(self.i2c_bus[10], self.sensors, self.registry)
+
+    @staticmethod
+    def _prober(sensor: MCP9600):
+        def probe():
+            bus = sensor.i2c_device
+            if bus.fd is None:
+                bus.open()
+            try:
+                # Start continuous conversion with configured filter
+                sensor.init(MCP9600.NORMAL)
             except OSError:
-                # Silently ignore for the moment
-                pass
-            pos += 1
+                # Module may be unplugged, its old fd never works again
+                bus.close()
+                raise
+        return probe
+
+    def poll(self):
+        # Replace all values at once, readers may run in another thread
+        self.temps = self.scanner.scan()
+
+    def stats(self) -> list[dict]:
+        return self.scanner.stats()
 
     def temp_tc(self, which):
         # print("checking TC")
-        if self.present & (1 << which):
-            temp = self.sensors[which].temperature()
-        else:
-            temp = None
-        return temp
+        if which < len(self.temps):
+            return self.temps[which]
+        return None
@@ -1,6 +1,7 @@
 from os import path
 
 from .sysinfo_base import SysInfoBase
+from . import sysfs
 
 
 class SysInfoThermal(SysInfoBase):
@@ -40,9 +41,7 @@ class SysInfoThermal(SysInfoBase):
 
     def _read_temp(self, path: str) -> float:
         """Helper method to read temperature from a given path."""
-        try:
-            with open(f'{path}/temp') as f:
-                temp_in_milli_c = f.readline().strip()
-                return round(float(temp_in_milli_c) / 1000.0, 1)
-        except FileNotFoundError:
+        temp = sysfs.attr(f'{path}temp').read_float(1000.0)
+        if temp is None:
             return 0.0
+        return round(temp, 1)
@@ -21,6 +21,8 @@ from io import BytesIO
 
 import pycurl
 
+from .power_sampler import PowerSampler
+from .tools import format_uptime
 from .transmit_queue import TransmitQueue
 from ._version import __version__ as ui_version
 
@@ -79,6 +81,10 @@ class Things(threading.Thread):
         self.attributes_period = Things.ATTRIBUTES_UPLOAD_PERIOD
         self.telemetry_period = Things.TELEMETRY_UPLOAD_PERIOD
 
+        # Connectivity and enable/disable changes wake up the thread
+        self._events = model.subscribe('network', keys=['inet-conn'])
+        model.subscribe('cloud', events=self._events.queue)
+
     def setup(self):
         self.daemon = True
         if self.has_server:
@@ -116,9 +122,11 @@ class Things(threading.Thread):
         return res
 
     def run(self):
+        next_tick = time.monotonic()
         while True:
             if self.active:
                 next_state = self.state
+                now = time.monotonic()
 
                 if self.state == 'init':
                     if self._have_bearer():
@@ -128,6 +136,7 @@ class Things(threading.Thread):
                         self.counter = 0
                         self.attributes_period = Things.ATTRIBUTES_UPLOAD_PERIOD
                         self.telemetry_period = Things.TELEMETRY_UPLOAD_PERIOD
+                        next_tick = now
                         next_state = 'connected'
 
                 elif self.state == 'connected':
@@ -136,34 +145,46 @@ class Things(threading.Thread):
 
                         self._req_listener.disable()
                         next_state = 'init'
-                    else:
-                        # Upload any pending attributes
-                        # Assumes infrequent updates, but low latency wanted
-                        if self.counter % self.attributes_period == Things.ATTRIBUTES_UPLOAD_PHASE:
-                            res = self._upload_attributes()
-                            if res:
-                                self.attributes_period = Things.ATTRIBUTES_UPLOAD_PERIOD
-                            else:
-                                # Upload error, try again in 30 seconds
-                                self.attributes_period = 30 
-
-                        # Upload pending telemetry as batch every some seconds
-                        if self.counter % self.telemetry_period == Things.TELEMETRY_UPLOAD_PHASE:
-                            res = self._upload_telemetry()
-                            if res:
-                                self.telemetry_period = Things.TELEMETRY_UPLOAD_PERIOD
-                            else:
-                                # Upload error, throttle regular interval by x 4
-                                self.telemetry_period = Things.TELEMETRY_UPLOAD_PERIOD * 4
+                    elif now >= next_tick:
+                        self._upload()
+                        self.counter += 1
+                        next_tick += 1.0
+                        if next_tick < now:
+                            next_tick = now + 1.0
 
                 # state change
                 if self.state != next_state:
                     logger.info(f'changed state from {self.state} to {next_state}')
                     self.state = next_state
+                    continue
 
-                self.counter += 1
+            # Only the upload schedule needs a periodic wakeup, connectivity and
+            # enable changes are signalled by the model
+            if self.active and self.state == 'connected':
+                timeout = max(0.0, next_tick - time.monotonic())
+            else:
+                timeout = None
+            self._events.wait(timeout)
+
+    def _upload(self):
+        # Upload any pending attributes
+        # Assumes infrequent updates, but low latency wanted
+        if self.counter % self.attributes_period == Things.ATTRIBUTES_UPLOAD_PHASE:
+            res = self._upload_attributes()
+            if res:
+                self.attributes_period = Things.ATTRIBUTES_UPLOAD_PERIOD
+            else:
+                # Upload error, try again in 30 seconds
+                self.attributes_period = 30
 
-            time.sleep(1.0)
+        # Upload pending telemetry as batch every some seconds
+        if self.counter % self.telemetry_period == Things.TELEMETRY_UPLOAD_PHASE:
+            res = self._upload_telemetry()
+            if res:
+                self.telemetry_period = Things.TELEMETRY_UPLOAD_PERIOD
+            else:
+                # Upload error, throttle regular interval by x 4
+                self.telemetry_period = Things.TELEMETRY_UPLOAD_PERIOD * 4
 
     def _have_bearer(self) -> bool:
         info = self.model.get_section('network')
@@ -323,6 +344,14 @@ class ThingsDataCollector(threading.Thread):
         self.rat_last = None
         self.rat2_last = None
 
+        # GNSS positions are handled when they arrive, the enable state
+        # (reported as 'cloud') wakes up the thread when it is idle
+        self._events = model.subscribe('gnss-pos')
+        model.subscribe('cloud', events=self._events.queue)
+
+        # Power aggregates are published once per window, upload each of them
+        model.subscribe('sys-power', events=self._events.queue)
+
         self.daemon = True
         self.start()
 
@@ -336,33 +365,57 @@ class ThingsDataCollector(threading.Thread):
         logger.info("starting cloud data collector thread")
 
         cnt = 0
+        next_tick = time.monotonic()
         while True:
             if self.active:
-                md = self.model.get_all()
+                timeout = max(0.0, next_tick - time.monotonic())
+            else:
+                # Nothing to do until enabled
+                timeout = None
+            event = self._events.wait(timeout)
 
-                # Attributes
-                if cnt % self.ATTRIBUTE_CHECKING_PERIOD == 0:
-                    self._attributes(md)
+            if not self.active:
+                continue
 
-                # Less important live information
-                if cnt % 10 == 0:
-                    self._info(md)
+            md = self.model.get_all()
 
-                # Traffic information every two minutes
-                if cnt % 120 == 0:
-                    self._traffic(md)
+            # Report GNSS position as soon as it changes
+            if event is not None and event.origin == 'gnss-pos':
+                self._gnss(md, False)
+            elif event is not None and event.origin == 'sys-power':
+                self._power(event.new)
 
-                # Force GNSS update once a minute, even if not moving
-                force_update = (cnt % 60) == 0
-                self._gnss(md, force_update)
+            now = time.monotonic()
+            if now < next_tick:
+                continue
 
-                # OBD2 information every second, force update even when no change
-                # force_update = (cnt % 60) == 0
-                # self._obd2(md, force_update)
+            next_tick += 1.0
+            if next_tick < now:
+                # Restart schedule after being disabled
+                next_tick = now + 1.0
 
-                cnt += 1
+            # Attributes
+            if cnt % self.ATTRIBUTE_CHECKING_PERIOD == 0:
+                self._attributes(md)
 
-            time.sleep(1.0)
+            # Less important live information
+            if cnt % 10 == 0:
+                self._info(md)
+
+            # Traffic and disc information every two minutes
+            if cnt % 120 == 0:
+                self._traffic(md)
+                self._disc(md)
+
+            # Force GNSS update once a minute, even if not moving
+            if cnt % 60 == 0:
+                self._gnss(md, True)
+
+            # OBD2 information every second, force update even when no change
+            # force_update = (cnt % 60) == 0
+            # self._obd2(md, force_update)
+
+            cnt += 1
 
     def _attributes(self, md):
         if 'sys-version' not in md:
@@ -373,7 +426,9 @@ class ThingsDataCollector(threading.Thread):
         serial = md.get('n/a', 'sys-version', 'serial')
         hw_ver = md.get('n/a', 'sys-version', 'hw')
         # bootloader_ver = md['sys-version']['bl']
-        uptime = md.get('n/a', 'sys-datetime', 'uptime')
+        # Same string as the 'uptime' tool printed before, existing dashboards expect it
+        uptime = md.get(None, 'sys-datetime', 'uptime')
+        uptime = f'up {format_uptime(uptime)}' if uptime is not None else 'n/a'
         attrs = {
             "serial": serial,
             "os-version": os_version,
@@ -396,24 +451,42 @@ class ThingsDataCollector(threading.Thread):
         #     info = md['ubxlib']
         #     attrs['ubxlib-version'] = info['version']
 
-        if 'modem' in md:
-            info = md['modem']
-
+        for prefix, info in self._modems(md):
             if 'revision' in info:
-                attrs['wwan-version'] = info['revision']
+                attrs[f'{prefix}wwan-version'] = info['revision']
 
             if 'imei' in info:
                 imei = info['imei']
-                attrs['wwan-imei'] = imei
+                attrs[f'{prefix}wwan-imei'] = imei
 
             if 'sim-id' in info:
                 imsi = info['sim-imsi']
-                attrs['sim-imsi'] = imsi
+                attrs[f'{prefix}sim-imsi'] = imsi
                 iccid = info['sim-iccid']
-                attrs['sim-iccid'] = iccid
+                attrs[f'{prefix}sim-iccid'] = iccid
 
         self._attributes_queue.add(attrs)
 
+    @staticmethod
+    def _modems(md) -> list[tuple[str, dict]]:
+        """
+        Get modem sections with key prefix
+
+        The primary modem uses the plain keys, additional modems are
+        prefixed with 'modem2-', 'modem3-', ...
+        """
+        res = []
+        if 'modem' in md:
+            res.append(('', md['modem']))
+
+        primary = md.get(None, 'modems', 'primary')
+        index = 2
+        for imei in md.get((), 'modems', 'imeis'):
+            if imei != primary and f'modem/{imei}' in md:
+                res.append((f'modem{index}-', md[f'modem/{imei}']))
+                index += 1
+        return res
+
     def _info(self, md):
         telemetry = dict()
         if 'sys-misc' in md:
@@ -424,6 +497,14 @@ class ThingsDataCollector(threading.Thread):
 
             telemetry['voltage-in'] = info['v_in']
             telemetry['mem-free'] = info['mem'][1]
+            if info['mem_available'] is not None:
+                telemetry['mem-available'] = info['mem_available']
+
+            # First entry is overall utilization, followed by cores
+            if info['cpu_util']:
+                telemetry['cpu-util'] = info['cpu_util'][0]
+                for i, util in enumerate(info['cpu_util'][1:], start=1):
+                    telemetry[f'cpu{i}-util'] = util
 
             telemetry['temp-pcb-main1'] = info['temp_mb']  # TODO: rename to temp-pcb-mb-dcdc?
             telemetry['temp-pcb-main2'] = info['temp_mb2']  # TODO: rename to temp-pcb-mb-peri? 
@@ -471,57 +552,96 @@ class ThingsDataCollector(threading.Thread):
             if (delay := info.get('delay')) is not None:
                 telemetry['wwan-delay'] = f'{delay * 1000.0:.0f}'
 
-        if 'modem' in md:
-            info = md['modem']
+            # Statistics of last minute, first target
+            targets = info.get('targets') or {}
+            if (stats := next(iter(targets.values()), {}).get('1min')) is not None:
+                telemetry['wwan-loss'] = stats['loss']
+                if stats['avg'] is not None:
+                    telemetry['wwan-delay-avg'] = f'{stats["avg"] * 1000.0:.0f}'
+                    telemetry['wwan-delay-max'] = f'{stats["max"] * 1000.0:.0f}'
+                    telemetry['wwan-jitter'] = f'{stats["jitter"] * 1000.0:.0f}'
 
+        for prefix, info in self._modems(md):
             if 'access-tech' in info:
                 rat = info['access-tech']
                 # print(f'rat: {rat}')
                 if rat:  # and rat != self.rat_last:
-                    self.rat_last = rat
+                    if not prefix:
+                        self.rat_last = rat
                     # print(ThingsDataCollector.rat_to_number(rat))
-                    telemetry['rat'] = ThingsDataCollector.rat_to_number(rat)
+                    telemetry[f'{prefix}rat'] = ThingsDataCollector.rat_to_number(rat)
 
             if 'access-tech2' in info:
                 rat = info['access-tech2']
                 # print(f'rat2: {rat}')
                 if rat:  # and rat != self.rat2_last:
-                    self.rat2_last = rat
+                    if not prefix:
+                        self.rat2_last = rat
                     # print(ThingsDataCollector.rat_to_number(rat))
-                    telemetry['rat2'] = ThingsDataCollector.rat_to_number(rat)
+                    telemetry[f'{prefix}rat2'] = ThingsDataCollector.rat_to_number(rat)
 
             if 'signal-quality' in info:
                 sq = info['signal-quality']
-                telemetry['siqnal-qlt'] = sq
+                telemetry[f'{prefix}siqnal-qlt'] = sq
 
             if (sq5g := info.get('signal-5g')) is not None:
-                telemetry['siq-5g-rsrp'] = sq5g['rsrp']
-                telemetry['siq-5g-rsrq'] = sq5g['rsrq']
-                telemetry['siq-5g-snr'] = sq5g['snr']
+                telemetry[f'{prefix}siq-5g-rsrp'] = sq5g['rsrp']
+                telemetry[f'{prefix}siq-5g-rsrq'] = sq5g['rsrq']
+                telemetry[f'{prefix}siq-5g-snr'] = sq5g['snr']
 
             if (sqlte := info.get('signal-lte')) is not None:
-                telemetry['siq-lte-rsrp'] = sqlte['rsrp']
-                telemetry['siq-lte-rsrq'] = sqlte['rsrq']
-                telemetry['siq-lte-snr'] = sqlte['snr']
+                telemetry[f'{prefix}siq-lte-rsrp'] = sqlte['rsrp']
+                telemetry[f'{prefix}siq-lte-rsrq'] = sqlte['rsrq']
+                telemetry[f'{prefix}siq-lte-snr'] = sqlte['snr']
 
             if 'bearer-id' in info:
                 id = info['bearer-id']
-                telemetry['bearer-id'] = id
+                telemetry[f'{prefix}bearer-id'] = id
                 if 'bearer-uptime' in info:
                     uptime = info['bearer-uptime']
-                    telemetry['bearer-uptime'] = uptime
-
-        if 'net-wwan0' in md:
-            info = md['net-wwan0']
-            (rx, tx) = info['bytes']
-            telemetry['wwan0-rx'] = f'{rx}'
-            telemetry['wwan0-tx'] = f'{tx}'
-
-        if 'net-wlan0' in md:
-            info = md['net-wlan0']
-            (rx, tx) = info['bytes']
-            telemetry['wlan0-rx'] = f'{rx}'
-            telemetry['wlan0-tx'] = f'{tx}'
+                    telemetry[f'{prefix}bearer-uptime'] = uptime
+
+        for name in ('wwan0', 'wlan0'):
+            if f'net-{name}' in md:
+                info = md[f'net-{name}']
+                (rx, tx) = info['bytes']
+                if rx is not None and tx is not None:
+                    telemetry[f'{name}-rx'] = f'{rx}'
+                    telemetry[f'{name}-tx'] = f'{tx}'
+
+                # Average rates in bytes/s over the last minute
+                if rate := (info.get('rate') or {}).get('1min'):
+                    telemetry[f'{name}-rx-rate'] = round(rate['rx-bytes'])
+                    telemetry[f'{name}-tx-rate'] = round(rate['tx-bytes'])
+
+        if len(telemetry) > 0:
+            self._data_queue.add(telemetry)
+
+    def _disc(self, md):
+        telemetry = dict()
+        if 'sys-disc' in md:
+            info = md['sys-disc']
+            total, used, free = info['part_sysroot']
+            if total:
+                telemetry['disc-root-total'] = total
+                telemetry['disc-root-used'] = used
+                telemetry['disc-root-free'] = free
+
+        if len(telemetry) > 0:
+            self._data_queue.add(telemetry)
+
+    def _power(self, info):
+        if not info:
+            return
+
+        telemetry = dict()
+        for name in PowerSampler.CHANNELS:
+            agg = info.get(name)
+            if agg and agg['mean'] is not None:
+                telemetry[f'pwr-{name}-min'] = agg['min']
+                telemetry[f'pwr-{name}-max'] = agg['max']
+                telemetry[f'pwr-{name}-mean'] = agg['mean']
+                telemetry[f'energy-{name}'] = agg['energy']
 
         if len(telemetry) > 0:
             self._data_queue.add(telemetry)
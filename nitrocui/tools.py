@@ -8,6 +8,28 @@ def secs_to_hhmm(secs):
     return h, m
 
 
+def format_uptime(secs: float) -> str:
+    """
+    Convert an uptime in seconds to a string like 'uptime' shows it.
+
+    :param secs: The time in seconds.
+    :return: A formatted string, e.g. '3 days, 4:05' or '12 min'.
+    """
+    days = int(secs // 86400)
+    h, m = divmod(int(secs % 86400) // 60, 60)
+
+    if h == 0:
+        res = f'{m} min'
+    else:
+        res = f'{h}:{m:02d}'
+
+    if days == 1:
+        res = f'1 day, {res}'
+    elif days > 1:
+        res = f'{days} days, {res}'
+    return res
+
+
 def is_valid_ipv4(address):
     try:
         ipaddress.IPv4Address(address)
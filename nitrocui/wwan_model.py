@@ -2,8 +2,7 @@ import logging
 import threading
 import time
 
-from ping3 import ping
-
+from .latency_prober import LatencyProber
 from .tools import is_valid_ipv4
 
 logger = logging.getLogger('nitroc-ui')
@@ -31,60 +30,90 @@ class Wwan(object):
 
 
 class GsmWorker(threading.Thread):
+    # Ping link every 5 seconds, first ping 2 seconds after bearer is up
+    PING_PERIOD = 5.0
+    PING_DELAY = 2.0
+
     def __init__(self, model):
         super().__init__()
 
         self.model = model
         self.state = 'init'
-        self.counter = 0
+        self.prober = None
+
+        # Wake up as soon as bearer changes, instead of polling model
+        self._events = self.model.subscribe('modem', keys=['bearer-ip'])
 
     def setup(self):
         self.daemon = True
         self.name = 'wwan-worker'
+
+        targets, period = self._ping_config()
+        try:
+            self.prober = LatencyProber(self.model, targets, period)
+            self.prober.start()
+        except OSError as e:
+            logger.warning('cannot open ICMP socket, latency probing disabled')
+            logger.info(e)
+
         self.start()
 
     def run(self):
         logger.info("running wwan thread")
         self.state = 'init'
-        self.counter = 0
-        link_data = dict()
+        start_probing = 0.0
 
         while True:
+            timeout = None
             if self.state == 'init':
                 if self._have_bearer():
                     logger.info('bearer found')
 
+                    start_probing = time.monotonic() + self.PING_DELAY
+                    self.state = 'connecting'
+                    continue
+
+            elif self.state == 'connecting':
+                if not self._have_bearer():
+                    self.state = 'init'
+                    continue
+                elif (timeout := start_probing - time.monotonic()) <= 0.0:
+                    # Prober publishes 'link' from now on
+                    if self.prober:
+                        self.prober.enable(True)
                     self.state = 'connected'
+                    timeout = None
 
             elif self.state == 'connected':
                 if not self._have_bearer():
                     logger.warning('lost IP connection')
 
-                    link_data['delay'] = 0.0
-                    self.model.publish('link', link_data)
+                    # Prober publishes 'link' with 0.0 delay when disabled
+                    if self.prober:
+                        self.prober.enable(False)
+                    else:
+                        self.model.publish('link', {'delay': 0.0})
 
                     self.state = 'init'
-                else:
-                    if self.counter % 5 == 2:
-                        try:
-                            delay = ping(PING_HOST, timeout=1)
-                            if delay:
-                                link_data['delay'] = round(float(delay), 3)
-                            else:
-                                link_data['delay'] = 0.0
-
-                            self.model.publish('link', link_data)
-
-                        except OSError as e:
-                            logger.warning('Captured ping error')
-                            logger.warning(e)
-
-                            link_data['delay'] = 0.0
-                            self.model.publish('link', link_data)
-                            # self.state = 'init'
-
-            self.counter += 1
-            time.sleep(1.0)
+                    continue
+
+            # Sleep until probing is due or bearer state changes
+            self._events.wait(timeout)
+
+    def _ping_config(self) -> tuple[list[str], float]:
+        config = self.model.config
+        targets = config.get('WWAN', 'PingTargets', fallback=PING_HOST)
+        targets = [t.strip() for t in targets.split(',') if t.strip()] or [PING_HOST]
+        try:
+            period = config.getfloat('WWAN', 'PingPeriod', fallback=self.PING_PERIOD)
+        except ValueError as e:
+            logger.warning('invalid ping period, using default')
+            logger.info(e)
+            period = self.PING_PERIOD
+        if period <= LatencyProber.TIMEOUT:
+            logger.warning(f'ping period must be larger than {LatencyProber.TIMEOUT} s, using default')
+            period = self.PING_PERIOD
+        return targets, period
 
     def _have_bearer(self) -> bool:
         if (mi := self.model.get_section('modem')):
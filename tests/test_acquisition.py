@@ -0,0 +1,123 @@
+import threading
+import time
+
+from nitrocui.acquisition import AcquisitionEngine
+
+
+class FakeSource:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.polls = 0
+
+    def poll(self):
+        self.polls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise OSError('bus error')
+
+
+class BlockingSource:
+    def __init__(self):
+        self.release = threading.Event()
+        self.polls = 0
+
+    def poll(self):
+        self.polls += 1
+        self.release.wait()
+
+
+class SequenceSource:
+    """
+    Stores the number of the run, the first run blocks until released
+    """
+    def __init__(self):
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.runs = 0
+        self.active = 0
+        self.max_active = 0
+        self.value = None
+
+    def poll(self):
+        with self.lock:
+            self.runs += 1
+            run = self.runs
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        if run == 1:
+            self.release.wait()
+        self.value = run
+        with self.lock:
+            self.active -= 1
+
+
+class TestAcquisitionEngine:
+    def test_all_fresh(self):
+        engine = AcquisitionEngine()
+        engine.add('a', FakeSource(), 1.0)
+        engine.add('b', FakeSource(), 1.0)
+        assert engine.poll() == []
+        engine.shutdown()
+
+    def test_parallel(self):
+        engine = AcquisitionEngine(max_workers=3)
+        for name in ['a', 'b', 'c']:
+            engine.add(name, FakeSource(0.1), 1.0)
+
+        start = time.monotonic()
+        assert engine.poll() == []
+        assert time.monotonic() - start < 0.25
+        engine.shutdown()
+
+    def test_error_is_stale(self):
+        engine = AcquisitionEngine()
+        engine.add('a', FakeSource(), 1.0)
+        engine.add('b', FakeSource(fail=True), 1.0)
+        assert engine.poll() == ['b']
+        assert engine.stats()['b']['errors'] == 1
+        engine.shutdown()
+
+    def test_deadline(self):
+        engine = AcquisitionEngine()
+        slow = BlockingSource()
+        fast = FakeSource()
+        engine.add('slow', slow, 0.05)
+        engine.add('fast', fast, 1.0)
+
+        assert engine.poll() == ['slow']
+        assert engine.stats()['slow']['overruns'] == 1
+
+        # Slow source is not restarted while still busy
+        assert engine.poll() == ['slow']
+        assert slow.polls == 1
+        assert fast.polls == 2
+        assert engine.stats()['slow']['skipped'] == 1
+
+        # Once finished it is polled again
+        slow.release.set()
+        time.sleep(0.05)
+        assert engine.poll() == []
+        assert slow.polls == 2
+        engine.shutdown()
+
+    def test_overrun_result(self):
+        engine = AcquisitionEngine()
+        src = SequenceSource()
+        engine.add('seq', src, 0.05)
+
+        assert engine.poll() == ['seq']
+        assert src.value is None
+
+        # Late run completes, its values are the newest ones
+        src.release.set()
+        time.sleep(0.05)
+        assert src.value == 1
+
+        # Next run replaces them, the late run never overlaps or overwrites it
+        assert engine.poll() == []
+        assert src.value == 2
+        time.sleep(0.05)
+        assert src.value == 2
+        assert src.max_active == 1
+        engine.shutdown()
@@ -0,0 +1,51 @@
+from nitrocui.counter_history import CounterHistory
+
+
+def make(rates, size=3600):
+    """ History with one sample per second and given rx rates """
+    h = CounterHistory(['rx', 'tx'], size)
+    rx = 0
+    h.add(0.0, (0, 0))
+    for t, rate in enumerate(rates, start=1):
+        rx += rate
+        h.add(float(t), (rx, t * 10))
+    return h
+
+
+class TestCounterHistory:
+    def test_empty(self):
+        h = CounterHistory(['rx', 'tx'])
+        assert h.rates(60.0) is None
+        h.add(0.0, (0, 0))
+        assert h.rates(60.0) is None
+        assert h.percentiles('rx', 60.0) is None
+
+    def test_rates(self):
+        h = make([100] * 60 + [1000] * 5)
+        assert h.rates(5.0) == {'rx': 1000.0, 'tx': 10.0}
+        assert h.rates(65.0)['rx'] == (60 * 100 + 5 * 1000) / 65.0
+
+        # Less history than window, uses available samples
+        assert h.rates(900.0)['rx'] == h.rates(65.0)['rx']
+
+    def test_wrap(self):
+        h = make([100] * 20 + [200] * 10, size=10)
+        assert len(h) == 10
+        assert h.rates(900.0)['rx'] == 200.0
+
+    def test_counter_reset(self):
+        h = make([100] * 10)
+        h.add(11.0, (5, 5))
+        assert len(h) == 1
+        assert h.rates(60.0) is None
+
+    def test_percentiles(self):
+        h = make(list(range(1, 101)))
+        assert h.percentiles('rx', 900.0) == [50.0, 95.0]
+        assert h.percentiles('rx', 10.0, (0.0, 100.0)) == [91.0, 100.0]
+
+    def test_large_counters(self):
+        h = CounterHistory(['rx'])
+        h.add(0.0, (2**63,))
+        h.add(1.0, (2**63 + 1000,))
+        assert h.rates(5.0) == {'rx': 1000.0}
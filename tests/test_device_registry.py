@@ -0,0 +1,81 @@
+from nitrocui.device_registry import DeviceRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDevice:
+    def __init__(self, present):
+        self.present = present
+        self.probes = 0
+
+    def probe(self):
+        self.probes += 1
+        if not self.present:
+            raise OSError('no ack')
+
+
+class TestDeviceRegistry:
+    def test_present(self):
+        reg = DeviceRegistry(FakeClock())
+        assert reg.add((0, 0x4C), FakeDevice(True).probe) is True
+        assert reg.present((0, 0x4C))
+        assert reg.state((0, 0x4C)) == DeviceRegistry.PRESENT
+
+    def test_absent_reprobe(self):
+        clock = FakeClock()
+        reg = DeviceRegistry(clock)
+        dev = FakeDevice(False)
+        assert reg.add((4, 0x4C), dev.probe) is False
+        assert reg.state((4, 0x4C)) == DeviceRegistry.ABSENT
+
+        # Not probed again before due
+        assert reg.reprobe() == []
+        assert dev.probes == 1
+
+        # Plugged in later
+        dev.present = True
+        clock.now += DeviceRegistry.PROBE_MIN
+        assert reg.reprobe() == [(4, 0x4C)]
+        assert reg.present((4, 0x4C))
+
+    def test_exponential_schedule(self):
+        clock = FakeClock()
+        reg = DeviceRegistry(clock)
+        dev = FakeDevice(False)
+        reg.add((4, 0x4C), dev.probe)
+
+        retries = []
+        for _ in range(10):
+            retries.append(reg.retry_in((4, 0x4C)))
+            clock.now += retries[-1]
+            reg.reprobe()
+
+        assert retries[:4] == [5.0, 10.0, 20.0, 40.0]
+        assert max(retries) == DeviceRegistry.PROBE_MAX
+
+    def test_failed(self):
+        clock = FakeClock()
+        reg = DeviceRegistry(clock)
+        dev = FakeDevice(True)
+        key = (0, 0x4C)
+        reg.add(key, dev.probe)
+
+        # Single errors are tolerated
+        reg.error(key)
+        reg.ok(key)
+        for _ in range(DeviceRegistry.ERROR_LIMIT - 1):
+            reg.error(key)
+        assert reg.present(key)
+
+        reg.error(key)
+        assert reg.state(key) == DeviceRegistry.FAILED
+
+        clock.now += DeviceRegistry.PROBE_MIN
+        assert reg.reprobe() == [key]
+        assert dev.probes == 2
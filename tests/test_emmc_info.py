@@ -0,0 +1,34 @@
+from nitrocui.sysinfo_base import SysInfoBase
+
+
+def make_device(tmp_path, life_time, pre_eol):
+    dev = tmp_path / 'device'
+    dev.mkdir(exist_ok=True)
+    (dev / 'life_time').write_text(f'{life_time}\n')
+    (dev / 'pre_eol_info').write_text(f'{pre_eol}\n')
+    return str(dev)
+
+
+class TestEmmcInfo:
+    def test_values(self, tmp_path):
+        si = SysInfoBase()
+        si.emmc_device = make_device(tmp_path, '0x01 0x02', '0x01')
+        assert si.emmc_info() == {'life-a': 1, 'life-b': 2, 'pre-eol': 1}
+        assert si.emmc_wear() == (10.0, 20.0)
+
+    def test_cached(self, tmp_path):
+        si = SysInfoBase()
+        si.emmc_device = make_device(tmp_path, '0x01 0x02', '0x01')
+        si.emmc_info()
+        make_device(tmp_path, '0x03 0x03', '0x02')
+        assert si.emmc_info()['life-a'] == 1
+
+        # Re-read after TTL
+        si.EMMC_INFO_TTL = 0.0
+        assert si.emmc_info() == {'life-a': 3, 'life-b': 3, 'pre-eol': 2}
+
+    def test_missing(self, tmp_path):
+        si = SysInfoBase()
+        si.emmc_device = str(tmp_path / 'none')
+        assert si.emmc_info() is None
+        assert si.emmc_wear() == (0.0, 0.0)
@@ -0,0 +1,24 @@
+from nitrocui.tools import format_uptime, format_size
+
+
+class TestFormatUptime:
+    def test_minutes(self):
+        assert format_uptime(0) == '0 min'
+        assert format_uptime(59) == '0 min'
+        assert format_uptime(12 * 60 + 5) == '12 min'
+
+    def test_hours(self):
+        assert format_uptime(3600) == '1:00'
+        assert format_uptime(4 * 3600 + 5 * 60) == '4:05'
+
+    def test_days(self):
+        assert format_uptime(86400 + 60) == '1 day, 1 min'
+        assert format_uptime(3 * 86400 + 4 * 3600 + 5 * 60) == '3 days, 4:05'
+
+
+class TestFormatSize:
+    def test_units(self):
+        assert format_size(512) == '512 Bytes'
+        assert format_size(2048) == '2.00 KB'
+        assert format_size(3 * 1024 * 1024) == '3.00 MB'
+        assert format_size(5 * 1024 ** 3) == '5.00 GB'
@@ -0,0 +1,119 @@
+import errno
+import os
+
+from nitrocui.hwmon import Hwmon
+
+
+def make_chip(root, index, name, subsystem=None, device=None, files=None):
+    """ Create a fake hwmon folder like the kernel does """
+    folder = root / 'class' / f'hwmon{index}'
+    folder.mkdir(parents=True)
+    (folder / 'name').write_text(f'{name}\n')
+
+    if subsystem:
+        bus = root / 'bus' / subsystem
+        bus.mkdir(parents=True, exist_ok=True)
+        dev = root / 'devices' / device
+        dev.mkdir(parents=True)
+        os.symlink(bus, dev / 'subsystem')
+        os.symlink(dev, folder / 'device')
+
+    for fname, content in (files or {}).items():
+        (folder / fname).write_text(f'{content}\n')
+
+    return folder
+
+
+class TestChipNames:
+    def test_i2c(self, tmp_path):
+        folder = make_chip(tmp_path, 0, 'tmp1075', 'i2c', '0-0048')
+        assert Hwmon.chip_name(str(folder)) == 'tmp1075-i2c-0-48'
+
+    def test_pci(self, tmp_path):
+        folder = make_chip(tmp_path, 0, 'nvme', 'pci', '0004:01:00.0')
+        assert Hwmon.chip_name(str(folder)) == 'nvme-pci-40100'
+
+    def test_mdio(self, tmp_path):
+        folder = make_chip(tmp_path, 0, 'f212a600.mdio_mii:11', 'mdio_bus', 'f212a600.mdio-mii:11')
+        assert Hwmon.chip_name(str(folder)) == 'f212a600.mdio_mii:11-mdio-b'
+
+    def test_virtual(self, tmp_path):
+        folder = make_chip(tmp_path, 0, 'cpu_thermal')
+        assert Hwmon.chip_name(str(folder)) == 'cpu_thermal-virtual-0'
+
+
+class TestHwmon:
+    def test_read(self, tmp_path):
+        make_chip(tmp_path, 0, 'tmp1075', 'i2c', '0-0048', {'temp1_input': 45125})
+        make_chip(tmp_path, 1, 'tmp1075', 'i2c', '4-0048', {'temp1_input': 38000})
+
+        hwmon = Hwmon(str(tmp_path / 'class'))
+        assert set(hwmon.chips) == {'tmp1075-i2c-0-48', 'tmp1075-i2c-4-48'}
+
+        inp = hwmon.open('tmp1075-i2c-4-48', 'temp1')
+        assert inp.read() == 38.0
+
+        # File is re-read on each call
+        (tmp_path / 'class' / 'hwmon1' / 'temp1_input').write_text('39500\n')
+        assert inp.read() == 39.5
+        inp.close()
+
+    def test_label(self, tmp_path):
+        files = {'temp1_input': 41850, 'temp1_label': 'Composite', 'temp2_input': 50000, 'temp2_label': 'Sensor 1'}
+        make_chip(tmp_path, 0, 'nvme', 'pci', '0004:01:00.0', files)
+
+        hwmon = Hwmon(str(tmp_path / 'class'))
+        inp = hwmon.open('nvme-pci-40100', 'Composite')
+        assert inp.read() == 41.85
+        inp = hwmon.open('nvme-pci-40100', 'Sensor 1')
+        assert inp.read() == 50.0
+
+    def test_wildcard(self, tmp_path):
+        make_chip(tmp_path, 0, 'ath11k_hwmon', 'pci', '0002:01:00.0', {'temp1_input': 52000})
+
+        hwmon = Hwmon(str(tmp_path / 'class'))
+        inp = hwmon.open('ath11k_hwmon-pci-*', 'temp1')
+        assert inp.read() == 52.0
+
+    def test_missing(self, tmp_path):
+        make_chip(tmp_path, 0, 'tmp1075', 'i2c', '0-0048', {'temp1_input': 45125})
+
+        hwmon = Hwmon(str(tmp_path / 'class'))
+        assert hwmon.open('tmp1075-i2c-9-48', 'temp1') is None
+        assert hwmon.open('tmp1075-i2c-0-48', 'temp2') is None
+
+    def test_rescan_on_miss(self, tmp_path):
+        now = [0.0]
+        make_chip(tmp_path, 0, 'tmp1075', 'i2c', '0-0048', {'temp1_input': 45125})
+        hwmon = Hwmon(str(tmp_path / 'class'), rescan_period=60.0, clock=lambda: now[0])
+
+        # Driver loaded later
+        make_chip(tmp_path, 1, 'nvme', 'pci', '0004:01:00.0', {'temp1_input': 41850})
+        now[0] = 30.0
+        assert hwmon.open('nvme-pci-40100', 'temp1') is None
+
+        now[0] = 60.0
+        inp = hwmon.open('nvme-pci-40100', 'temp1')
+        assert inp.read() == 41.85
+        assert not hwmon.rescan()
+        inp.close()
+
+    def test_read_errors(self, tmp_path, monkeypatch):
+        make_chip(tmp_path, 0, 'tmp1075', 'i2c', '0-0048', {'temp1_input': 45125})
+        inp = Hwmon(str(tmp_path / 'class')).open('tmp1075-i2c-0-48', 'temp1')
+
+        def fail(code):
+            def pread(fd, n, offset):
+                raise OSError(code, os.strerror(code))
+            monkeypatch.setattr(os, 'pread', pread)
+
+        # Transient bus error keeps the input
+        fail(errno.EIO)
+        assert inp.read() is None
+        assert not inp.gone
+
+        fail(errno.ENODEV)
+        assert inp.read() is None
+        assert inp.gone
+        monkeypatch.undo()
+        inp.close()
@@ -0,0 +1,76 @@
+import errno
+
+import pytest
+
+from nitrocui import i2c as i2c_module
+from nitrocui.i2c import I2C, I2CMsg, I2C_M_RD, IOCTL_I2C_RDWR
+
+
+class FakeBus:
+    """ Emulates I2C_RDWR of a bus with 8 bit register devices """
+    def __init__(self, devices):
+        self.devices = devices      # addr -> {reg: bytes}
+        self.calls = 0
+
+    def ioctl(self, fd, request, data):
+        assert request == IOCTL_I2C_RDWR
+        self.calls += 1
+        reg = None
+        for i in range(data.nmsgs):
+            msg = data.msgs[i]
+            if msg.addr not in self.devices:
+                raise OSError(errno.ENXIO, 'no ack')
+            if msg.flags & I2C_M_RD:
+                value = self.devices[msg.addr][reg]
+                for n in range(msg.len):
+                    msg.buf[n] = value[n]
+            else:
+                reg = msg.buf[0]
+                if msg.len > 1:
+                    self.devices[msg.addr][reg] = bytes(msg.buf[n] for n in range(1, msg.len))
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    bus = FakeBus({0x60: {0x00: b'\x01\x90'}, 0x61: {0x00: b'\x02\x00'}})
+    monkeypatch.setattr(i2c_module.fcntl, 'ioctl', bus.ioctl)
+    i2c = I2C(10)
+    i2c.fd = 99
+    return bus, i2c
+
+
+class TestI2CMsg:
+    def test_write(self):
+        msg = I2CMsg.write(0x4C, [0x02, 0xC3])
+        assert msg.addr == 0x4C
+        assert msg.flags == 0
+        assert msg.len == 2
+        assert bytes(msg) == b'\x02\xc3'
+
+    def test_read(self):
+        msg = I2CMsg.read(0x67, 2)
+        assert msg.flags == I2C_M_RD
+        assert bytes(msg) == b'\x00\x00'
+
+
+class TestI2C:
+    def test_read_reg(self, bus):
+        bus, i2c = bus
+        assert i2c.read_reg(0x60, 0x00, 2) == b'\x01\x90'
+        assert bus.calls == 1
+
+    def test_write_reg(self, bus):
+        bus, i2c = bus
+        i2c.write_reg(0x60, 0x05, 0x34)
+        assert bus.devices[0x60][0x05] == b'\x34'
+
+    def test_read_regs_batch(self, bus):
+        bus, i2c = bus
+        res = i2c.read_regs([(0x60, 0x00, 2), (0x61, 0x00, 2)])
+        assert res == [b'\x01\x90', b'\x02\x00']
+        assert bus.calls == 1
+
+    def test_read_regs_failed_device(self, bus):
+        bus, i2c = bus
+        res = i2c.read_regs([(0x60, 0x00, 2), (0x62, 0x00, 2), (0x61, 0x00, 2)])
+        assert res == [b'\x01\x90', None, b'\x02\x00']
@@ -0,0 +1,168 @@
+import math
+import select
+import time
+
+import pytest
+
+from nitrocui.latency_prober import (LatencyProber, LatencyHistory, checksum, build_echo_request,
+                                     parse_echo_reply, summarize, ICMP_HDR, ICMP_ECHO_REPLY,
+                                     ICMP_ECHO_REQUEST)
+
+
+class FakeModel:
+    def __init__(self):
+        self.sections = dict()
+
+    def publish(self, origin, data):
+        self.sections[origin] = data
+
+
+def echo_reply(ident, seq):
+    return ICMP_HDR.pack(ICMP_ECHO_REPLY, 0, 0, ident, seq) + b'data'
+
+
+class TestPackets:
+    def test_checksum(self):
+        # Example of RFC 1071
+        data = bytes([0x00, 0x01, 0xf2, 0x03, 0xf4, 0xf5, 0xf6, 0xf7])
+        assert checksum(data) == ~0xddf2 & 0xffff
+
+    def test_checksum_odd_length(self):
+        assert checksum(b'\x01') == ~0x0100 & 0xffff
+
+    def test_request(self):
+        packet = build_echo_request(0x1234, 7, b'abc')
+        msg_type, code, _, ident, seq = ICMP_HDR.unpack_from(packet, 0)
+        assert (msg_type, code, ident, seq) == (ICMP_ECHO_REQUEST, 0, 0x1234, 7)
+        assert packet.endswith(b'abc')
+        # Checksum over packet including checksum is zero
+        assert checksum(packet) == 0
+
+    def test_reply(self):
+        assert parse_echo_reply(echo_reply(5, 9), raw=False) == (5, 9)
+
+    def test_reply_raw(self):
+        ip_header = bytes([0x45]) + b'\0' * 19
+        assert parse_echo_reply(ip_header + echo_reply(5, 9), raw=True) == (5, 9)
+
+    def test_not_a_reply(self):
+        assert parse_echo_reply(build_echo_request(5, 9), raw=False) is None
+        assert parse_echo_reply(b'\0\0', raw=False) is None
+        assert parse_echo_reply(b'\x45', raw=True) is None
+
+
+class TestStatistics:
+    def test_summarize(self):
+        res = summarize([0.010, 0.030, math.nan, 0.020])
+        assert res['min'] == 0.010
+        assert res['max'] == 0.030
+        assert res['avg'] == 0.020
+        assert res['jitter'] == pytest.approx(0.015)
+        assert res['loss'] == 25.0
+        assert res['count'] == 4
+
+    def test_summarize_empty(self):
+        assert summarize([]) is None
+
+    def test_summarize_all_lost(self):
+        res = summarize([math.nan, math.nan])
+        assert res['avg'] is None
+        assert res['jitter'] is None
+        assert res['loss'] == 100.0
+
+    def test_summarize_single(self):
+        res = summarize([0.05])
+        assert res['jitter'] == 0.0
+        assert res['loss'] == 0.0
+
+    def test_window(self):
+        h = LatencyHistory(10)
+        for i in range(8):
+            h.add(i * 5.0, 0.01 * i if i != 3 else None)
+
+        rtts = list(h.window(10.0))
+        assert rtts == pytest.approx([0.06, 0.07])
+
+        rtts = list(h.window(100.0))
+        assert len(rtts) == 8
+        assert math.isnan(rtts[3])
+
+    def test_window_size_limit(self):
+        h = LatencyHistory(3)
+        for i in range(5):
+            h.add(float(i), 0.01)
+        assert len(h.window(100.0)) == 3
+
+    def test_clear(self):
+        h = LatencyHistory(3)
+        h.add(0.0, 0.01)
+        h.clear()
+        assert len(h) == 0
+        assert len(h.window(10.0)) == 0
+
+
+class TestProber:
+    def test_loopback(self):
+        try:
+            prober = LatencyProber(FakeModel(), ['127.0.0.1'], period=2.0)
+        except OSError:
+            pytest.skip('ICMP sockets not available')
+
+        now = time.monotonic()
+        prober._send_probes(now)
+        deadline = now + 1.0
+        while prober.pending and time.monotonic() < deadline:
+            select.select([prober.sock], [], [], 0.1)
+            prober._receive()
+        prober._expire(time.monotonic())
+
+        link = prober.model.sections['link']
+        target = link['targets']['127.0.0.1']
+        assert target['rtt'] is not None
+        assert link['delay'] < 1.0
+        assert target['1min']['count'] == 1
+        assert target['1min']['loss'] == 0.0
+        prober.sock.close()
+
+    def test_timeout(self):
+        try:
+            prober = LatencyProber(FakeModel(), ['127.0.0.1'], timeout=0.5)
+        except OSError:
+            pytest.skip('ICMP sockets not available')
+
+        prober.addrs['127.0.0.1'] = '127.0.0.1'
+        prober.pending[1] = ('127.0.0.1', 10.0)
+        prober._expire(10.4)
+        assert prober.pending
+        prober._expire(10.5)
+        assert not prober.pending
+
+        link = prober.model.sections['link']
+        assert link['delay'] == 0.0
+        assert link['targets']['127.0.0.1']['1min']['loss'] == 100.0
+        prober.sock.close()
+
+    def test_reset_on_disable(self):
+        try:
+            prober = LatencyProber(FakeModel(), ['127.0.0.1'])
+        except OSError:
+            pytest.skip('ICMP sockets not available')
+
+        assert prober._check_reset()
+        prober.addrs['127.0.0.1'] = '127.0.0.1'
+        prober._record('127.0.0.1', 10.0, 0.02)
+        prober.pending[2] = ('127.0.0.1', 15.0)
+        assert prober.model.sections['link']['delay'] == 0.02
+
+        # Bearer lost and back before the loop noticed
+        prober.enable(True)
+        prober.enable(False)
+        prober.enable(True)
+        assert prober._check_reset()
+        assert not prober._check_reset()
+
+        assert prober.model.sections['link'] == {'delay': 0.0}
+        assert not prober.pending
+        assert not prober.addrs
+        assert len(prober.history['127.0.0.1']) == 0
+        prober.sock.close()
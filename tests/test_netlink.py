@@ -0,0 +1,70 @@
+import socket
+import struct
+
+import pytest
+
+from nitrocui.netlink import (LinkMonitor, build_getlink, parse_messages, parse_link,
+                              NLMSG_HDR, IFINFOMSG, RTM_GETLINK, RTM_NEWLINK, NLMSG_DONE,
+                              NLM_F_DUMP, IFLA_IFNAME, IFLA_OPERSTATE, IFLA_STATS64, IFF_UP, IFF_LOWER_UP)
+
+
+def rtattr(attr_type, value):
+    length = 4 + len(value)
+    pad = b'\0' * (((length + 3) & ~3) - length)
+    return struct.pack('=HH', length, attr_type) + value + pad
+
+
+def newlink(name, operstate=6, counters=(10, 20, 1000, 2000), flags=IFF_UP | IFF_LOWER_UP, seq=1):
+    stats = struct.pack('=4Q', *counters) + b'\0' * (8 * 20)
+    payload = (IFINFOMSG.pack(socket.AF_UNSPEC, 0, 3, flags, 0) +
+               rtattr(IFLA_IFNAME, name.encode() + b'\0') +
+               rtattr(IFLA_OPERSTATE, bytes([operstate])) +
+               rtattr(IFLA_STATS64, stats))
+    return NLMSG_HDR.pack(NLMSG_HDR.size + len(payload), RTM_NEWLINK, 2, seq, 0) + payload
+
+
+class FakeModel:
+    def __init__(self):
+        self.sections = dict()
+
+    def publish(self, origin, data):
+        self.sections[origin] = data
+
+
+class TestMessages:
+    def test_getlink(self):
+        msgs = parse_messages(build_getlink(7))
+        assert len(msgs) == 1
+        msg_type, flags, seq, payload = msgs[0]
+        assert msg_type == RTM_GETLINK
+        assert flags & NLM_F_DUMP == NLM_F_DUMP
+        assert seq == 7
+        assert len(payload) == IFINFOMSG.size
+
+    def test_parse_link(self):
+        data = newlink('wwan0') + NLMSG_HDR.pack(NLMSG_HDR.size + 4, NLMSG_DONE, 2, 1, 0) + b'\0' * 4
+        msgs = parse_messages(data)
+        assert [m[0] for m in msgs] == [RTM_NEWLINK, NLMSG_DONE]
+
+        link = parse_link(msgs[0][3])
+        assert link['name'] == 'wwan0'
+        assert link['index'] == 3
+        assert link['operstate'] == 'up'
+        assert link['counters'] == (1000, 2000, 10, 20)
+
+    def test_truncated(self):
+        data = newlink('wwan0')
+        assert parse_messages(data[:-8]) == []
+
+
+class TestLinkMonitor:
+    def test_dump_loopback(self):
+        try:
+            monitor = LinkMonitor(FakeModel(), {'lo': 'net-lo', 'nonexisting0': 'net-none'})
+        except OSError:
+            pytest.skip('netlink not available')
+
+        monitor._dump(100.0)
+        assert monitor.model.sections['net-lo']['up'] is True
+        assert monitor.model.sections['net-lo']['bytes'][0] is not None
+        assert monitor.model.sections['net-none']['state'] == 'notpresent'
@@ -0,0 +1,133 @@
+from nitrocui.device_registry import DeviceRegistry
+from nitrocui.pac1921 import PAC1921
+from nitrocui.sysinfo_power import SysInfoPower
+
+
+class FakeI2C:
+    """ Records register accesses of one PAC1921 """
+    def __init__(self):
+        self.regs = dict()
+        self.writes = list()
+        self.addr = None
+
+    def write_reg(self, addr, reg, value):
+        self.addr = addr
+        self.writes.append((reg, value))
+        self.regs[reg] = value
+
+    def read_reg(self, addr, reg, length):
+        self.addr = addr
+        value = self.regs.get(reg, 0)
+        return bytes([value >> 8, value & 0xFF])
+
+
+class ModuleI2C:
+    """ Bus of a pluggable module, the fd gets invalid when unplugged """
+    def __init__(self):
+        self.plugged = False
+        self.fd = None
+        self.valid_fd = None
+        self.opened = 0
+
+    def open(self):
+        if not self.plugged:
+            raise FileNotFoundError('no such device')
+        self.opened += 1
+        self.fd = self.valid_fd = self.opened
+
+    def close(self):
+        self.fd = None
+
+    def unplug(self):
+        self.plugged = False
+        self.valid_fd = None
+
+
+class ModuleSensor:
+    def __init__(self, i2c):
+        self.i2c = i2c
+
+    def start(self):
+        if self.i2c.fd != self.i2c.valid_fd:
+            raise OSError('no such device')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProber:
+    def test_replug(self):
+        clock = FakeClock()
+        registry = DeviceRegistry(clock)
+        i2c = ModuleI2C()
+        key = (4, 0x4C)
+
+        def reprobe():
+            clock.now += DeviceRegistry.PROBE_MAX
+            registry.reprobe()
+            return registry.present(key)
+
+        assert not registry.add(key, SysInfoPower._prober(ModuleSensor(i2c)))
+
+        i2c.plugged = True
+        assert reprobe()
+
+        i2c.unplug()
+        registry.failed(key)
+        assert not reprobe()
+        assert i2c.fd is None
+
+        # Plugged in again, bus is reopened
+        i2c.plugged = True
+        assert reprobe()
+        assert i2c.opened == 2
+
+
+class TestPAC1921:
+    def test_select_once(self):
+        i2c = FakeI2C()
+        pac = PAC1921(i2c, 0x4C, 0.005)
+        assert pac.select('power') is True
+        num_writes = len(i2c.writes)
+        assert pac.select('power') is False
+        assert len(i2c.writes) == num_writes
+
+        # Changing type reconfigures chip
+        assert pac.select('voltage') is True
+        assert len(i2c.writes) > num_writes
+
+    def test_free_run_mode(self):
+        i2c = FakeI2C()
+        pac = PAC1921(i2c, 0x4C, 0.005)
+        pac.select('power')
+        assert i2c.regs[0x02] >> 6 == 0b11
+        assert i2c.regs[0x01] >> 4 == 0b0010    # 4 samples
+
+    def test_samples(self):
+        i2c = FakeI2C()
+        pac = PAC1921(i2c, 0x4C, 0.005, samples=1)
+        pac.select('power')
+        assert i2c.regs[0x01] >> 4 == 0b0000
+
+    def test_result(self):
+        i2c = FakeI2C()
+        pac = PAC1921(i2c, 0x4C, 0.020)
+        pac.select('voltage')
+        i2c.regs[0x10] = 512 << 6
+        assert pac.result('voltage') == 16.0
+
+        pac.select('power')
+        i2c.regs[0x1D] = 1023 << 6
+        assert round(pac.result('power'), 2) == round(1023 * 32 * 5.0 / 1024, 2)
+
+    def test_start_resets_shadow(self):
+        i2c = FakeI2C()
+        pac = PAC1921(i2c, 0x4C, 0.005)
+        pac.select('power')
+        pac.start()
+        assert pac.select('power') is True
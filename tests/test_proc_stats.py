@@ -0,0 +1,109 @@
+import os
+
+from nitrocui.proc_stats import (ProcFile, ProcStats, parse_meminfo, parse_loadavg, parse_uptime,
+                                 parse_stat, cpu_util, parse_net_dev)
+
+
+MEMINFO = b"""MemTotal:        3974152 kB
+MemFree:         2912456 kB
+MemAvailable:    3391228 kB
+Buffers:           40200 kB
+Cached:           540988 kB
+"""
+
+STAT_1 = b"""cpu  100 0 100 800 0 0 0 0 0 0
+cpu0 50 0 50 400 0 0 0 0 0 0
+cpu1 50 0 50 400 0 0 0 0 0 0
+intr 1234 0 0
+ctxt 5678
+"""
+
+STAT_2 = b"""cpu  200 0 100 900 0 0 0 0 0 0
+cpu0 150 0 50 400 0 0 0 0 0 0
+cpu1 50 0 50 500 0 0 0 0 0 0
+intr 1300 0 0
+"""
+
+NET_DEV = b"""Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:  123456     789    0    0    0     0          0         0   123456     789    0    0    0     0       0          0
+ wwan0: 9876543210  12345    0    0    0     0          0         0  1234567    2345    0    0    0     0       0          0
+"""
+
+
+class TestParsers:
+    def test_meminfo(self):
+        assert parse_meminfo(MEMINFO) == {'MemTotal': 3974152, 'MemFree': 2912456, 'MemAvailable': 3391228}
+
+    def test_loadavg(self):
+        assert parse_loadavg(b'0.52 0.58 0.59 2/187 4321\n') == (0.52, 0.58, 0.59)
+
+    def test_uptime(self):
+        assert parse_uptime(b'1433.76 5512.02\n') == 1433.76
+
+    def test_stat(self):
+        times = parse_stat(STAT_1)
+        assert times == [(200, 1000), (100, 500), (100, 500)]
+
+    def test_cpu_util(self):
+        util = cpu_util(parse_stat(STAT_1), parse_stat(STAT_2))
+        assert util == [50.0, 100.0, 0.0]
+
+    def test_net_dev(self):
+        net = parse_net_dev(NET_DEV)
+        assert net['lo'] == (123456, 789, 123456, 789)
+        assert net['wwan0'] == (9876543210, 12345, 1234567, 2345)
+
+
+class TestProcStats:
+    def test_poll(self, tmp_path):
+        (tmp_path / 'net').mkdir()
+        (tmp_path / 'meminfo').write_bytes(MEMINFO)
+        (tmp_path / 'loadavg').write_bytes(b'0.52 0.58 0.59 2/187 4321\n')
+        (tmp_path / 'stat').write_bytes(STAT_1)
+        (tmp_path / 'uptime').write_bytes(b'1433.76 5512.02\n')
+        (tmp_path / 'net' / 'dev').write_bytes(NET_DEV)
+
+        ps = ProcStats(str(tmp_path))
+        ps.poll()
+        assert ps.meminfo() == (3974152, 2912456)
+        assert ps.mem_available() == 3391228
+        assert ps.load() == (0.52, 0.58, 0.59)
+        assert ps.uptime() == 1433.76
+        assert ps.net_bytes('wwan0') == (9876543210, 1234567)
+        assert ps.net_bytes('wlan0') == (None, None)
+        assert ps.cpu_util() == []
+
+        (tmp_path / 'stat').write_bytes(STAT_2)
+        ps.poll()
+        assert ps.cpu_util() == [50.0, 100.0, 0.0]
+
+    def test_small_buffer(self, tmp_path):
+        (tmp_path / 'meminfo').write_bytes(MEMINFO)
+        ps = ProcStats(str(tmp_path))
+        ps.files['meminfo'].buf = bytearray(16)
+        ps.poll()
+        assert ps.mem_available() == 3391228
+
+    def test_short_reads(self, monkeypatch):
+        # seq_files return partial data before the end of file
+        def fake_preadv(fd, buffers, offset):
+            chunk = NET_DEV[offset:offset + min(50, len(buffers[0]))]
+            buffers[0][:len(chunk)] = chunk
+            return len(chunk)
+
+        monkeypatch.setattr(os, 'open', lambda path, flags: 99)
+        monkeypatch.setattr(os, 'preadv', fake_preadv)
+
+        f = ProcFile('/proc/net/dev', 64)
+        data = f.read()
+        assert data == NET_DEV
+        assert isinstance(data, bytes)
+        assert parse_net_dev(data)['wwan0'][0] == 9876543210
+
+    def test_real_proc(self):
+        ps = ProcStats()
+        ps.poll()
+        total, _ = ps.meminfo()
+        assert total > 0
+        assert ps.uptime() > 0.0
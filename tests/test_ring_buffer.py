@@ -0,0 +1,75 @@
+import math
+
+import pytest
+
+from nitrocui.ring_buffer import RingBuffer
+from nitrocui.power_sampler import aggregate
+
+
+class TestRingBuffer:
+    def test_fill(self):
+        rb = RingBuffer(4)
+        assert len(rb) == 0
+        assert list(rb.values()) == []
+
+        for v in (1.0, 2.0, 3.0):
+            rb.append(v)
+        assert len(rb) == 3
+        assert list(rb.values()) == [1.0, 2.0, 3.0]
+
+    def test_wrap(self):
+        rb = RingBuffer(3)
+        for v in range(1, 6):
+            rb.append(v)
+        assert len(rb) == 3
+        assert list(rb.values()) == [3.0, 4.0, 5.0]
+        assert list(rb.last(2)) == [4.0, 5.0]
+        assert rb[0] == 3.0
+        assert rb[-1] == 5.0
+
+    def test_index_error(self):
+        rb = RingBuffer(3)
+        rb.append(1.0)
+        with pytest.raises(IndexError):
+            rb[1]
+
+    def test_clear(self):
+        rb = RingBuffer(3)
+        rb.append(1.0)
+        rb.clear()
+        assert len(rb) == 0
+        rb.append(2.0)
+        assert list(rb.values()) == [2.0]
+
+    def test_typecode(self):
+        rb = RingBuffer(2, 'Q')
+        rb.append(2**40)
+        assert rb[0] == 2**40
+
+
+class TestAggregate:
+    def _fill(self, powers, dt):
+        p = RingBuffer(len(powers))
+        d = RingBuffer(len(powers))
+        for v in powers:
+            p.append(v)
+            d.append(dt)
+        return p, d
+
+    def test_values(self):
+        p, d = self._fill([2.0, 4.0, 6.0], 0.1)
+        agg = aggregate(p, d)
+        assert agg['min'] == 2.0
+        assert agg['max'] == 6.0
+        assert agg['mean'] == 4.0
+        assert agg['energy'] == pytest.approx(1.2 / 3600.0)
+
+    def test_missing_samples(self):
+        p, d = self._fill([2.0, math.nan, 4.0], 0.1)
+        agg = aggregate(p, d)
+        assert agg['mean'] == 3.0
+        assert agg['max'] == 4.0
+
+    def test_empty(self):
+        p, d = self._fill([math.nan], 0.1)
+        assert aggregate(p, d)['mean'] is None
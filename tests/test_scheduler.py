@@ -0,0 +1,108 @@
+from concurrent.futures import Future
+
+from nitrocui.scheduler import Scheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class InlineExecutor:
+    """ Runs jobs immediately, optionally leaving them 'busy' """
+    def __init__(self):
+        self.busy = set()
+
+    def submit(self, fn, job):
+        f = Future()
+        if job.name in self.busy:
+            return f    # Never completes
+        fn(job)
+        f.set_result(None)
+        return f
+
+
+class TestScheduler:
+    def _make(self):
+        clock = FakeClock()
+        executor = InlineExecutor()
+        sched = Scheduler(clock=clock, executor=executor)
+        return clock, executor, sched
+
+    def test_periods(self):
+        clock, _, sched = self._make()
+        runs = {'a': 0, 'b': 0}
+        sched.add('a', lambda: runs.__setitem__('a', runs['a'] + 1), 1.0)
+        sched.add('b', lambda: runs.__setitem__('b', runs['b'] + 1), 4.0)
+
+        for _ in range(8):
+            sched.run_pending()
+            clock.now += 1.0
+
+        assert runs == {'a': 8, 'b': 2}
+
+    def test_timeout_until_next(self):
+        clock, _, sched = self._make()
+        sched.add('a', lambda: None, 4.0)
+        assert sched.run_pending() == 4.0
+        clock.now += 1.5
+        assert sched.run_pending() == 2.5
+
+    def test_delay(self):
+        clock, _, sched = self._make()
+        runs = []
+        sched.add('a', lambda: runs.append(clock.now), 10.0, delay=2.0)
+        sched.run_pending()
+        assert runs == []
+        clock.now += 2.0
+        sched.run_pending()
+        assert runs == [102.0]
+
+    def test_overrun(self):
+        clock, executor, sched = self._make()
+        runs = []
+        sched.add('slow', lambda: runs.append('slow'), 1.0)
+        sched.add('fast', lambda: runs.append('fast'), 1.0)
+
+        executor.busy.add('slow')
+        for _ in range(3):
+            sched.run_pending()
+            clock.now += 1.0
+
+        stats = sched.stats()
+        assert stats['slow']['overruns'] == 2
+        assert stats['fast']['overruns'] == 0
+        assert runs.count('fast') == 3
+
+    def test_catch_up(self):
+        clock, _, sched = self._make()
+        runs = []
+        sched.add('a', lambda: runs.append(clock.now), 1.0)
+        sched.run_pending()
+
+        # Stalled for a long time, run only once and restart schedule
+        clock.now += 10.5
+        sched.run_pending()
+        assert len(runs) == 2
+        assert sched.run_pending() == 1.0
+
+    def test_jitter(self):
+        clock, _, sched = self._make()
+        sched.add('a', lambda: None, 1.0, jitter=0.5)
+        sched.run_pending()
+        timeout = sched.run_pending()
+        assert 1.0 <= timeout <= 1.5
+
+    def test_error(self):
+        clock, _, sched = self._make()
+
+        def fail():
+            raise OSError('boom')
+
+        sched.add('a', fail, 1.0)
+        sched.run_pending()
+        assert sched.stats()['a']['errors'] == 1
+        assert sched.stats()['a']['runs'] == 1
@@ -0,0 +1,84 @@
+from nitrocui.sysinfo_sensors import parse_sensors_text, parse_sensors_json, lookup, average_all
+
+
+SENSORS_TEXT = """tmp1075-i2c-0-48
+Adapter: mv64xxx_i2c adapter
+temp1:        +45.2°C  (low  = +75.0°C, high = +80.0°C)
+
+f212a600.mdio_mii:11-mdio-b
+Adapter: MDIO adapter
+temp1:        +52.0°C  (crit = +100.0°C)
+
+nvme-pci-40100
+Adapter: PCI adapter
+Composite:    +41.9°C  (low  = -273.1°C, high = +84.8°C)
+                       (crit = +84.8°C)
+Sensor 1:     +43.9°C  (low  = -273.1°C, high = +65261.8°C)
+
+ath11k_hwmon-pci-20100
+Adapter: PCI adapter
+temp1:        -12.5°C
+"""
+
+SENSORS_JSON = """{
+   "tmp1075-i2c-0-48":{
+      "Adapter": "mv64xxx_i2c adapter",
+      "temp1":{
+         "temp1_input": 45.188,
+         "temp1_max": 80.000
+      }
+   },
+   "nvme-pci-40100":{
+      "Adapter": "PCI adapter",
+      "Composite":{
+         "temp1_input": 41.850,
+         "temp1_max": 84.850
+      }
+   }
+}
+"""
+
+
+class TestParseText:
+    def test_index(self):
+        index = parse_sensors_text(SENSORS_TEXT)
+        assert set(index) == {'tmp1075-i2c-0-48', 'f212a600.mdio_mii:11-mdio-b',
+                              'nvme-pci-40100', 'ath11k_hwmon-pci-20100'}
+        assert index['tmp1075-i2c-0-48'] == {'temp1': 45.2}
+        assert index['nvme-pci-40100'] == {'Composite': 41.9, 'Sensor 1': 43.9}
+        assert index['ath11k_hwmon-pci-20100']['temp1'] == -12.5
+
+    def test_empty(self):
+        assert parse_sensors_text('') == {}
+
+
+class TestParseJson:
+    def test_index(self):
+        index = parse_sensors_json(SENSORS_JSON)
+        assert index['tmp1075-i2c-0-48'] == {'temp1': 45.188}
+        assert index['nvme-pci-40100'] == {'Composite': 41.85}
+
+
+class TestLookup:
+    def test_exact(self):
+        index = parse_sensors_text(SENSORS_TEXT)
+        assert lookup(index, 'tmp1075-i2c-0-48', 'temp1') == 45.2
+        assert lookup(index, 'nvme-pci-40100', 'Composite') == 41.9
+
+    def test_wildcard(self):
+        index = parse_sensors_text(SENSORS_TEXT)
+        assert lookup(index, 'ath11k_hwmon-pci-*', 'temp1') == -12.5
+
+    def test_missing(self):
+        index = parse_sensors_text(SENSORS_TEXT)
+        assert lookup(index, 'tmp1075-i2c-4-48', 'temp1') is None
+        assert lookup(index, 'tmp1075-i2c-0-48', 'temp2') is None
+
+
+class TestAverage:
+    def test_all_present(self):
+        assert average_all([40.0, 42.0, 44.0]) == 42.0
+
+    def test_missing(self):
+        assert average_all([40.0, None, 44.0]) is None
+        assert average_all([]) is None
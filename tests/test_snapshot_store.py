@@ -0,0 +1,211 @@
+import json
+import threading
+
+import pytest
+
+from nitrocui.snapshot_store import SnapshotStore, FrozenDict, freeze
+from nitrocui.snapshot_store import QueueSubscription, LoopSubscription, Subscription
+
+
+class TestFreeze:
+    def test_nested(self):
+        data = {'a': 1, 'b': {'c': [1, 2]}}
+        frozen = freeze(data)
+        assert isinstance(frozen, FrozenDict)
+        assert isinstance(frozen['b'], FrozenDict)
+        assert frozen['b']['c'] == (1, 2)
+        assert frozen == {'a': 1, 'b': {'c': (1, 2)}}
+
+    def test_readonly(self):
+        frozen = freeze({'a': 1})
+        with pytest.raises(TypeError):
+            frozen['a'] = 2
+        with pytest.raises(TypeError):
+            frozen.update({'b': 2})
+        with pytest.raises(TypeError):
+            del frozen['a']
+
+    def test_json(self):
+        frozen = freeze({'a': 1, 'b': [1, 2]})
+        assert json.loads(json.dumps(frozen)) == {'a': 1, 'b': [1, 2]}
+
+    def test_source_decoupled(self):
+        data = {'a': 1}
+        frozen = freeze(data)
+        data['a'] = 2
+        assert frozen['a'] == 1
+
+
+class TestSnapshotStore:
+    def test_empty(self):
+        store = SnapshotStore()
+        assert store.generation == 0
+        assert len(store.snapshot().sections) == 0
+
+    def test_publish_generation(self):
+        store = SnapshotStore()
+        store.publish('a', {'x': 1})
+        assert store.generation == 1
+        store.publish('b', {'y': 2})
+        assert store.generation == 2
+        assert store.section('a') == {'x': 1}
+        assert store.section('b') == {'y': 2}
+
+    def test_snapshot_is_stable(self):
+        store = SnapshotStore()
+        store.publish('a', {'x': 1})
+        snap = store.snapshot()
+
+        store.publish('a', {'x': 2})
+        store.publish('b', {'y': 3})
+
+        assert snap.generation == 1
+        assert snap.sections['a']['x'] == 1
+        assert 'b' not in snap.sections
+        assert store.section('a')['x'] == 2
+
+    def test_unchanged_sections_shared(self):
+        store = SnapshotStore()
+        store.publish('a', {'x': 1})
+        a = store.section('a')
+        store.publish('b', {'y': 2})
+        assert store.section('a') is a
+
+    def test_remove(self):
+        store = SnapshotStore()
+        store.publish('a', {'x': 1})
+        store.remove('a')
+        assert store.section('a') is None
+        assert store.generation == 2
+
+        # Removing unknown section doesn't create a new generation
+        store.remove('a')
+        assert store.generation == 2
+
+    def test_update(self):
+        store = SnapshotStore()
+        store.publish('a', {'x': 1, 'y': {'z': 1}, 'w': 0})
+        y = store.section('a')['y']
+        store.update('a', {'x': 2, 'v': [1, 2]}, removed=['w'])
+
+        a = store.section('a')
+        assert a == {'x': 2, 'y': {'z': 1}, 'v': (1, 2)}
+        assert isinstance(a, FrozenDict)
+        assert a['y'] is y
+        assert store.generation == 2
+
+    def test_update_new_section(self):
+        store = SnapshotStore()
+        store.update('a', {'x': 1})
+        assert store.section('a') == {'x': 1}
+
+
+class FakeLoop:
+    def __init__(self):
+        self.calls = []
+
+    def add_callback(self, callback, *args):
+        self.calls.append((callback, args))
+
+
+class TestSubscriptions:
+    def test_queue_delivery(self):
+        store = SnapshotStore()
+        sub = store.subscribe(QueueSubscription('a'))
+        store.publish('a', {'x': 1})
+        store.publish('b', {'y': 1})
+
+        event = sub.wait(0)
+        assert event.origin == 'a'
+        assert event.old is None
+        assert event.new == {'x': 1}
+        assert sub.wait(0) is None
+
+    def test_no_event_without_change(self):
+        store = SnapshotStore()
+        sub = store.subscribe(QueueSubscription('a'))
+        store.publish('a', {'x': 1})
+        store.publish('a', {'x': 1})
+        assert sub.wait(0) is not None
+        assert sub.wait(0) is None
+
+    def test_key_filter(self):
+        store = SnapshotStore()
+        sub = store.subscribe(QueueSubscription('a', keys=['x']))
+        store.publish('a', {'x': 1, 'y': 1})
+        assert sub.wait(0) is not None
+
+        store.publish('a', {'x': 1, 'y': 2})
+        assert sub.wait(0) is None
+
+        store.publish('a', {'x': 2, 'y': 2})
+        event = sub.wait(0)
+        assert event.old['x'] == 1
+        assert event.new['x'] == 2
+
+    def test_update_event(self):
+        store = SnapshotStore()
+        store.publish('a', {'x': 1, 'y': 1})
+        sub = store.subscribe(QueueSubscription('a', keys=['y']))
+        store.update('a', {'x': 2})
+        assert sub.wait(0) is None
+
+        store.update('a', {'y': 2})
+        event = sub.wait(0)
+        assert event.old == {'x': 2, 'y': 1}
+        assert event.new == {'x': 2, 'y': 2}
+
+    def test_remove_event(self):
+        store = SnapshotStore()
+        store.publish('a', {'x': 1})
+        sub = store.subscribe(QueueSubscription('a', keys=['x']))
+        store.remove('a')
+        event = sub.wait(0)
+        assert event.new is None
+
+    def test_shared_queue(self):
+        store = SnapshotStore()
+        sub = store.subscribe(QueueSubscription('a'))
+        store.subscribe(QueueSubscription('b', events=sub.queue))
+        store.publish('a', 1)
+        store.publish('b', 2)
+        assert sub.wait(0).origin == 'a'
+        assert sub.wait(0).origin == 'b'
+
+    def test_unsubscribe(self):
+        store = SnapshotStore()
+        sub = store.subscribe(QueueSubscription('a'))
+        store.unsubscribe(sub)
+        store.publish('a', 1)
+        assert sub.wait(0) is None
+
+    def test_loop_delivery(self):
+        store = SnapshotStore()
+        loop = FakeLoop()
+        store.subscribe(LoopSubscription('a', loop, print))
+        store.publish('a', {'x': 1})
+        assert len(loop.calls) == 1
+        callback, args = loop.calls[0]
+        assert callback is print
+        assert args[0].new == {'x': 1}
+
+    def test_generation_order(self):
+        store = SnapshotStore()
+        received = []
+
+        class Trigger(Subscription):
+            """ Publishes from another thread while the first event is delivered """
+            def deliver(self, event):
+                if event.new == 1:
+                    t = threading.Thread(target=store.publish, args=('a', 2))
+                    t.start()
+                    t.join(0.2)
+
+        class Recorder(Subscription):
+            def deliver(self, event):
+                received.append(event.generation)
+
+        store.subscribe(Trigger('a'))
+        store.subscribe(Recorder('a'))
+        store.publish('a', 1)
+        assert received == [1, 2]
@@ -0,0 +1,82 @@
+import errno
+import os
+
+from nitrocui import sysfs
+from nitrocui.sysfs import SysfsAttr
+
+
+class TestSysfsAttr:
+    def test_read(self, tmp_path):
+        path = tmp_path / 'temp'
+        path.write_text('45125\n')
+        a = SysfsAttr(str(path))
+        assert a.read_int() == 45125
+        assert a.read_float(1000.0) == 45.125
+
+        # Same file descriptor re-read
+        fd = a.fd
+        path.write_text('46000\n')
+        assert a.read_int() == 46000
+        assert a.fd == fd
+        a.close()
+
+    def test_str(self, tmp_path):
+        path = tmp_path / 'type'
+        path.write_text('ap-cpu0-thermal\n')
+        assert SysfsAttr(str(path)).read_str() == 'ap-cpu0-thermal'
+
+    def test_missing(self, tmp_path):
+        a = SysfsAttr(str(tmp_path / 'missing'))
+        assert a.read() is None
+        assert a.read_int() is None
+        assert a.read_float() is None
+
+    def test_invalid(self, tmp_path):
+        path = tmp_path / 'value'
+        path.write_text('n/a\n')
+        assert SysfsAttr(str(path)).read_int() is None
+
+    def test_write(self, tmp_path):
+        path = tmp_path / 'brightness'
+        path.write_text('0\n')
+        a = SysfsAttr(str(path), writable=True)
+        assert a.write('100') is True
+        assert path.read_text().startswith('100')
+
+    def test_reopen(self, tmp_path, monkeypatch):
+        path = tmp_path / 'rx_bytes'
+        path.write_text('1000\n')
+        a = SysfsAttr(str(path))
+        assert a.read_int() == 1000
+
+        # Device went away and came back
+        pread = os.pread
+        calls = []
+
+        def failing_pread(fd, n, offset):
+            if not calls:
+                calls.append(fd)
+                raise OSError(errno.ENODEV, 'No such device')
+            return pread(fd, n, offset)
+
+        monkeypatch.setattr(os, 'pread', failing_pread)
+        path.write_text('2000\n')
+        assert a.read_int() == 2000
+        assert len(calls) == 1
+
+
+class TestCache:
+    def test_shared(self, tmp_path):
+        path = str(tmp_path / 'attr')
+        assert sysfs.attr(path) is sysfs.attr(path)
+
+    def test_upgrade_writable(self, tmp_path):
+        path = str(tmp_path / 'attr2')
+        a = sysfs.attr(path)
+        assert not a.writable
+
+        # Read-only instance is replaced
+        b = sysfs.attr(path, writable=True)
+        assert b is not a
+        assert b.writable
+        assert sysfs.attr(path) is b
@@ -0,0 +1,154 @@
+from nitrocui.mcp9600 import MCP9600
+from nitrocui.device_registry import DeviceRegistry
+from nitrocui.sysinfo_tc import SysInfoTC, TCScanner
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeBus:
+    """ Hot junction registers of MCP9600 sensors, failing addresses return None """
+    def __init__(self, temps):
+        self.bus = 10
+        self.fd = 3
+        self.temps = temps      # addr -> temperature in Celsius
+        self.failing = set()
+        self.requests = []
+
+    def open(self):
+        self.fd = 3
+
+    def close(self):
+        self.fd = None
+
+    def read_regs(self, requests):
+        self.requests.append(requests)
+        res = []
+        for addr, reg, length in requests:
+            assert reg == 0x00 and length == 2
+            if addr in self.failing:
+                res.append(None)
+            else:
+                res.append(int(self.temps[addr] * 16).to_bytes(2, 'big', signed=True))
+        return res
+
+
+class ModuleBus:
+    """ Bus of a pluggable module, the fd gets invalid when unplugged """
+    def __init__(self):
+        self.plugged = False
+        self.fd = None
+        self.valid_fd = None
+        self.opened = 0
+
+    def open(self):
+        if not self.plugged:
+            raise FileNotFoundError('no such device')
+        self.opened += 1
+        self.fd = self.valid_fd = self.opened
+
+    def close(self):
+        self.fd = None
+
+    def unplug(self):
+        self.plugged = False
+        self.valid_fd = None
+
+
+class ModuleSensor:
+    def __init__(self, bus):
+        self.i2c_device = bus
+
+    def init(self, mode):
+        if self.i2c_device.fd != self.i2c_device.valid_fd:
+            raise OSError('no such device')
+
+
+class TestTCScanner:
+    def _make(self):
+        bus = FakeBus({0x60: 21.5, 0x61: -3.25})
+        sensors = [MCP9600(bus, address=0x60, tctype='T'), MCP9600(bus, address=0x61, tctype='T')]
+        clock = FakeClock()
+        registry = DeviceRegistry(clock)
+        for s in sensors:
+            registry.add((10, s.ADDR), lambda: None)
+        return bus, clock, TCScanner(bus, sensors, registry, clock)
+
+    def test_bulk_read(self):
+        bus, _, scanner = self._make()
+        assert scanner.scan() == [21.5, -3.25]
+        assert len(bus.requests) == 1
+
+    def test_last_good_value(self):
+        bus, clock, scanner = self._make()
+        scanner.scan()
+        bus.failing.add(0x61)
+        clock.now += 1.0
+        assert scanner.scan() == [21.5, -3.25]
+
+        clock.now += TCScanner.MAX_AGE
+        assert scanner.scan() == [21.5, None]
+
+    def test_failed_sensor_skipped(self):
+        bus, clock, scanner = self._make()
+        bus.failing.add(0x61)
+        for _ in range(DeviceRegistry.ERROR_LIMIT):
+            scanner.scan()
+            clock.now += 1.0
+
+        # Failing sensor no longer read
+        scanner.scan()
+        assert [r[0] for r in bus.requests[-1]] == [0x60]
+        assert scanner.stats()[1]['state'] == DeviceRegistry.FAILED
+        assert scanner.stats()[1]['errors'] == DeviceRegistry.ERROR_LIMIT
+
+        # Probed again after some time, recovers
+        bus.failing.clear()
+        clock.now += DeviceRegistry.PROBE_MIN
+        assert scanner.scan() == [21.5, -3.25]
+        assert len(bus.requests[-1]) == 2
+
+    def test_bus_closed_when_all_failed(self):
+        bus, clock, scanner = self._make()
+        bus.failing.update({0x60, 0x61})
+        for _ in range(DeviceRegistry.ERROR_LIMIT):
+            scanner.scan()
+            clock.now += 1.0
+        assert bus.fd is None
+
+        # Reopened for the sensors that are probed successfully again
+        bus.failing.clear()
+        clock.now += DeviceRegistry.PROBE_MIN
+        assert scanner.scan() == [21.5, -3.25]
+        assert bus.fd is not None
+
+    def test_replug(self):
+        clock = FakeClock()
+        registry = DeviceRegistry(clock)
+        bus = ModuleBus()
+        key = (10, 0x60)
+
+        def reprobe():
+            clock.now += DeviceRegistry.PROBE_MAX
+            registry.reprobe()
+            return registry.present(key)
+
+        assert not registry.add(key, SysInfoTC._prober(ModuleSensor(bus)))
+
+        bus.plugged = True
+        assert reprobe()
+
+        bus.unplug()
+        registry.failed(key)
+        assert not reprobe()
+        assert bus.fd is None
+
+        # Plugged in again, bus is reopened
+        bus.plugged = True
+        assert reprobe()
+        assert bus.opened == 2
@@ -0,0 +1,100 @@
+import threading
+
+import pytest
+
+pytest.importorskip('pycurl')
+pytest.importorskip('requests')
+
+from nitrocui.snapshot_store import SnapshotStore, QueueSubscription  # noqa: E402
+from nitrocui.things import ThingsDataCollector  # noqa: E402
+
+
+class FakeModelData:
+    def __init__(self, data):
+        self._data = data
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def get(self, default, *keys):
+        res = self._data
+        try:
+            for key in keys:
+                res = res[key]
+        except KeyError:
+            return default
+        return res
+
+
+class FakeModel:
+    def __init__(self):
+        self.store = SnapshotStore()
+
+    def subscribe(self, origin, keys=None, events=None):
+        return self.store.subscribe(QueueSubscription(origin, keys, events))
+
+    def publish(self, origin, value):
+        self.store.publish(origin, value)
+
+    def get_all(self):
+        return FakeModelData(self.store.snapshot().sections)
+
+
+class FakeQueue:
+    def __init__(self):
+        self.items = []
+        self.event = threading.Event()
+
+    def add(self, data):
+        self.items.append(data)
+        self.event.set()
+
+    def merged(self):
+        res = dict()
+        for item in self.items:
+            res.update(item)
+        return res
+
+
+class TestCollector:
+    def test_tick(self):
+        model = FakeModel()
+        model.publish('traffic-wwan0', {'day_rx': 1, 'day_tx': 2, 'month_rx': 3, 'month_tx': 4})
+        model.publish('net-wwan0', {'bytes': (100, 200), 'rate': None})
+        model.publish('sys-disc', {'part_sysroot': (1000, 400, 600)})
+
+        data, attributes = FakeQueue(), FakeQueue()
+        collector = ThingsDataCollector(model, data, attributes)
+        collector.enable()
+
+        # Wakes up the collector, first tick runs immediately
+        model.publish('cloud', {'enabled': True})
+        assert data.event.wait(2.0)
+
+        # Power windows are uploaded as they arrive
+        data.event.clear()
+        model.publish('sys-power', {'mb': {'min': 1.0, 'max': 2.0, 'mean': 1.5, 'energy': 0.01}})
+        assert data.event.wait(2.0)
+
+        telemetry = data.merged()
+        assert telemetry['wwan0-rx-day'] == '1'
+        assert telemetry['wwan0-tx-month'] == '4'
+        assert telemetry['wwan0-rx'] == '100'
+        assert telemetry['disc-root-used'] == 400
+        assert telemetry['pwr-mb-mean'] == 1.5
+        assert collector.is_alive()
+
+    def test_uptime_attribute(self):
+        model = FakeModel()
+        model.publish('sys-version', {'serial': 'ABC', 'hw': '0.1.0', 'sys': 'os'})
+        model.publish('sys-datetime', {'uptime': 273900.5})
+
+        data, attributes = FakeQueue(), FakeQueue()
+        collector = ThingsDataCollector(model, data, attributes)
+        collector._attributes(model.get_all())
+
+        # String like the 'uptime' tool prints it, dashboards expect it
+        assert attributes.merged()['uptime'] == 'up 3 days, 4:05'